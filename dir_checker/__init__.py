@@ -1 +1,23 @@
 # Pre-commit hooks for directory structure checking
+
+from dir_checker.main import (
+    CompiledConfig,
+    RepositoryValidator,
+    StructureConfig,
+    ValidationError,
+    compile_config,
+    load_config,
+)
+from dir_checker.api import ValidationResult, check, check_many
+
+__all__ = [
+    "CompiledConfig",
+    "RepositoryValidator",
+    "StructureConfig",
+    "ValidationError",
+    "ValidationResult",
+    "check",
+    "check_many",
+    "compile_config",
+    "load_config",
+]
@@ -0,0 +1,99 @@
+"""
+Library API for dir-checker.
+
+Validates a repository given its root path and a (compiled) configuration and
+returns a structured result. Nothing is printed and nothing is read relative
+to the current working directory, so calls are safe to run concurrently and
+from long-lived processes:
+
+    from dir_checker import check, compile_config, load_config
+
+    compiled = compile_config(load_config("dir-checker-config.yaml", quiet=True))
+    result = check("/path/to/repo", compiled)
+    for finding in result.errors:
+        print(finding.rule, finding.path, finding.message)
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from dir_checker.main import (
+    CompiledConfig,
+    RepositoryValidator,
+    StructureConfig,
+    ValidationError,
+)
+
+ConfigLike = Union[StructureConfig, CompiledConfig]
+
+
+@dataclass
+class ValidationResult:
+    """Findings and statistics of one validation run."""
+
+    root: Path
+    findings: List[ValidationError] = field(default_factory=list)
+    stats: Dict[str, int] = field(default_factory=dict)
+    exit_code: int = 0
+
+    def __iter__(self) -> Iterator[ValidationError]:
+        return iter(self.findings)
+
+    def __len__(self) -> int:
+        return len(self.findings)
+
+    @property
+    def passed(self) -> bool:
+        """Whether the run would pass the hook."""
+        return self.exit_code == 0
+
+    def by_level(self, level: str) -> List[ValidationError]:
+        """Return the findings of one level (ERROR, WARNING, OPTIONAL_WARNING or INFO)."""
+        return [finding for finding in self.findings if finding.level == level]
+
+    @property
+    def errors(self) -> List[ValidationError]:
+        return self.by_level("ERROR")
+
+    @property
+    def warnings(self) -> List[ValidationError]:
+        return self.by_level("WARNING") + self.by_level("OPTIONAL_WARNING")
+
+
+def _compiled(config: ConfigLike) -> CompiledConfig:
+    return config if isinstance(config, CompiledConfig) else CompiledConfig(config)
+
+
+def check(root: Union[str, "os.PathLike[str]"], config: ConfigLike, strict: bool = False,
+          use_baseline: bool = True) -> ValidationResult:
+    """
+    Validate the repository at root.
+
+    root_dir, .gitignore and the baseline file are resolved relative to root.
+    Pass a CompiledConfig (see compile_config) to share compiled matchers
+    between calls; a plain StructureConfig is compiled for this call only.
+    """
+    compiled = _compiled(config)
+    validator = RepositoryValidator(compiled.config, strict=strict, base_dir=Path(root),
+                                    compiled=compiled, quiet=True)
+    validator.validate_directory_structure()
+    if use_baseline:
+        validator.apply_baseline()
+    return ValidationResult(
+        root=Path(root),
+        findings=validator.errors,
+        stats=dict(validator.stats),
+        exit_code=validator.exit_code(),
+    )
+
+
+def check_many(roots: Iterable[Union[str, "os.PathLike[str]"]], config: ConfigLike,
+               strict: bool = False, use_baseline: bool = True,
+               max_workers: Optional[int] = None) -> List[ValidationResult]:
+    """Validate several repositories concurrently with one compiled config, in input order."""
+    compiled = _compiled(config)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda root: check(root, compiled, strict, use_baseline), roots))
@@ -0,0 +1,128 @@
+"""
+Baseline (suppression) file support for dir-checker.
+
+A baseline records the findings that already exist in a repository so that
+only new violations fail the hook. Each finding is reduced to one or more
+(rule, path) keys, e.g. ("missing-mandatory-files:README.md", "src/a/b/c"),
+and stored by a short hash for O(1) lookups. Paths are relative to the
+repository (the validator's base_dir), so a baseline written from the
+command line also matches findings of the library API, which are absolute.
+
+The file is plain text, one entry per line, sorted by path and rule so that
+concurrent edits merge cleanly:
+
+    # dir-checker baseline v1
+    <hash>\t<rule>\t<path>
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dir_checker.main import ValidationError
+
+BASELINE_HEADER = "# dir-checker baseline v1"
+
+# Levels that can be baselined (INFO messages are never failures)
+BASELINE_LEVELS = {"ERROR", "WARNING", "OPTIONAL_WARNING"}
+
+
+def hash_key(rule: str, path: str) -> str:
+    """Return the short, stable hash of a (rule, path) key."""
+    return hashlib.blake2b(f"{rule}\0{path}".encode("utf-8"), digest_size=8).hexdigest()
+
+
+def relative_path(path: str, base_dir: Optional[Path]) -> str:
+    """Return a '/'-separated finding path relative to base_dir (unchanged if it is outside)."""
+    if base_dir is None:
+        return path
+    prefix = os.fspath(base_dir).replace(os.sep, "/").rstrip("/") + "/"
+    return path[len(prefix):] if path.startswith(prefix) else path
+
+
+def finding_keys(finding: ValidationError, base_dir: Optional[Path] = None) -> List[Tuple[str, str]]:
+    """Return the (rule, path) keys of a finding, one per subject, with the path relative to base_dir."""
+    rule = finding.rule or finding.message
+    path = relative_path(finding.path_str, base_dir)
+    if not finding.subjects:
+        return [(rule, path)]
+    return [(f"{rule}:{subject}", path) for subject in finding.subjects]
+
+
+class Baseline:
+    """A set of known violations keyed by hashed (rule, path)."""
+
+    def __init__(self, entries: Dict[str, Tuple[str, str]] = None, base_dir: Optional[Path] = None):
+        self.entries: Dict[str, Tuple[str, str]] = entries or {}
+        # Directory the paths of findings are made relative to
+        self.base_dir = base_dir
+        self.matched: set = set()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @classmethod
+    def from_findings(cls, findings: Iterable[ValidationError], base_dir: Optional[Path] = None) -> "Baseline":
+        """Build a baseline from the findings of a run (paths relative to base_dir)."""
+        entries: Dict[str, Tuple[str, str]] = {}
+        for finding in findings:
+            if finding.level not in BASELINE_LEVELS:
+                continue
+            for rule, path in finding_keys(finding, base_dir):
+                entries[hash_key(rule, path)] = (rule, path)
+        return cls(entries, base_dir)
+
+    @classmethod
+    def load(cls, baseline_path: Path, base_dir: Optional[Path] = None) -> "Baseline":
+        """Load a baseline file whose paths are relative to base_dir."""
+        entries: Dict[str, Tuple[str, str]] = {}
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if not line or line.startswith("#"):
+                    continue
+                key, rule, path = line.split("\t", 2)
+                entries[key] = (rule, path)
+        return cls(entries, base_dir)
+
+    def save(self, baseline_path: Path) -> None:
+        """Write the baseline atomically, sorted by path then rule."""
+        lines = [BASELINE_HEADER]
+        for key, (rule, path) in sorted(self.entries.items(), key=lambda item: (item[1][1], item[1][0])):
+            lines.append(f"{key}\t{rule}\t{path}")
+
+        directory = os.path.dirname(os.path.abspath(baseline_path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".baseline-", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            os.replace(tmp_path, baseline_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def is_known(self, finding: ValidationError) -> bool:
+        """Check whether every key of a finding is in the baseline, marking them as seen."""
+        keys = [hash_key(rule, path) for rule, path in finding_keys(finding, self.base_dir)]
+        self.matched.update(key for key in keys if key in self.entries)
+        return all(key in self.entries for key in keys)
+
+    def filter(self, findings: Iterable[ValidationError]) -> Tuple[List[ValidationError], int]:
+        """Return (findings not covered by the baseline, number of suppressed findings)."""
+        remaining: List[ValidationError] = []
+        suppressed = 0
+        for finding in findings:
+            if finding.level in BASELINE_LEVELS and self.is_known(finding):
+                suppressed += 1
+            else:
+                remaining.append(finding)
+        return remaining, suppressed
+
+    def stale(self) -> List[Tuple[str, str]]:
+        """Return the (rule, path) entries no finding matched since loading."""
+        return sorted(
+            (entry for key, entry in self.entries.items() if key not in self.matched),
+            key=lambda entry: (entry[1], entry[0]),
+        )
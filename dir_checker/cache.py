@@ -0,0 +1,419 @@
+"""
+Shared validation cache for dir-checker (``--cache-dir``).
+
+CI runners validating many repositories can share one cache directory.
+Validation results are stored per unit subtree (the directories one level
+above components, e.g. ``module/service``) under a key made of the repository
+id, a hash of the effective configuration and the unit's git tree id. A unit
+whose tree id is unchanged and that has no uncommitted or untracked changes is
+restored from the cache instead of being walked; all other units are
+revalidated and stored. Parsed configuration files are cached by content too.
+
+Storage goes through the small CacheBackend interface; LocalDirectoryCache
+keeps entries as files in a directory that any number of processes may use
+at once: entries are written to a temporary file and renamed into place,
+every entry carries a checksum, and the total size is bounded by evicting the
+least recently used entries.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+from operator import itemgetter
+from pathlib import Path
+from typing import AbstractSet, Any, Dict, List, Optional, Set, Tuple
+
+from dir_checker.main import RepositoryValidator, StructureConfig, ValidationError, load_config_data
+from dir_checker.sparse import run_git
+
+# Bump when the stored format or the meaning of findings changes
+CACHE_VERSION = "1"
+
+# Settings that only affect how results are printed or recorded
+OUTPUT_FIELDS = {"log_level", "verbose", "color", "max_findings_per_section", "group_messages",
+                 "metrics_file", "baseline_file", "index_file"}
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Units with a directory modified after the start of a run are not stored:
+# they may have changed between git status and the walk, and the results
+# would not match the unit's tree id. Filesystems take mtimes from a coarse
+# clock, up to a tick behind time.time_ns(), or truncate them to whole
+# seconds (two on FAT), so mtimes are compared with that much slack.
+CLOCK_SLACK_NS = 20_000_000
+WHOLE_SECONDS_SLACK_NS = 2_000_000_000
+
+
+def modified_since(mtime_ns: int, started_ns: int) -> bool:
+    """Whether a directory with this mtime may have changed at or after started_ns."""
+    # An mtime without nanoseconds most likely comes from a filesystem with second granularity
+    slack = WHOLE_SECONDS_SLACK_NS if mtime_ns % 1_000_000_000 == 0 else CLOCK_SLACK_NS
+    return mtime_ns + slack >= started_ns
+
+
+def digest(*chunks: bytes) -> str:
+    """Return the hex key of a sequence of byte strings."""
+    hasher = hashlib.blake2b(digest_size=20)
+    for chunk in chunks:
+        hasher.update(len(chunk).to_bytes(8, "little"))
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class CacheBackend(ABC):
+    """Storage for cache entries: opaque bytes under hex string keys."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the entry stored under key, or None."""
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        """Store an entry (replacing any entry with the same key)."""
+
+    def prune(self) -> None:
+        """Enforce the backend's size bound."""
+
+
+class LocalDirectoryCache(CacheBackend):
+    """
+    Cache entries stored as files in a (possibly shared) directory.
+
+    Each entry is a checksum followed by the data; corrupt or truncated entries
+    are dropped on read. Reads refresh an entry's mtime, which prune() uses to
+    evict the least recently used entries once the directory exceeds max_bytes.
+    """
+
+    CHECKSUM_SIZE = 16
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self.entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except OSError:
+            return None
+        checksum, data = raw[:self.CHECKSUM_SIZE], raw[self.CHECKSUM_SIZE:]
+        if hashlib.blake2b(data, digest_size=self.CHECKSUM_SIZE).digest() != checksum:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self.entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(hashlib.blake2b(data, digest_size=self.CHECKSUM_SIZE).digest())
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """Return (mtime, size, path) of every entry."""
+        entries = []
+        try:
+            shards = list(os.scandir(self.directory))
+        except OSError:
+            return entries
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+            try:
+                with os.scandir(shard.path) as iterator:
+                    for entry in iterator:
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue  # Evicted by another process
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except OSError:
+                continue
+        return entries
+
+    def prune(self) -> None:
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        # Evict down to 90% so that the next runs do not have to prune again
+        target = self.max_bytes * 9 // 10 if total > self.max_bytes else None
+        abandoned = time.time() - 3600
+        for mtime, size, path in sorted(entries):
+            if os.path.basename(path).startswith(".tmp-"):
+                if mtime >= abandoned:
+                    continue  # Another process is writing it
+            elif target is None or total <= target:
+                continue
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+
+
+def config_fingerprint(config: StructureConfig, base_dir: Path, exclude: AbstractSet[str] = OUTPUT_FIELDS) -> str:
+    """Return a hash of everything in the configuration that affects findings (except the exclude keys)."""
+    data = {key: value for key, value in asdict(config).items() if key not in exclude}
+    encoded = json.dumps(data, sort_keys=True, default=sorted).encode()
+    try:
+        gitignore = (base_dir / ".gitignore").read_bytes() if config.respect_gitignore else b""
+    except OSError:
+        gitignore = b""
+    return digest(CACHE_VERSION.encode(), encoded, gitignore)
+
+
+def default_repo_id(base_dir: Path) -> str:
+    """Identify a repository by its origin URL, or by its path when it has none."""
+    origin = run_git(["config", "--get", "remote.origin.url"], base_dir)
+    if origin and origin.strip():
+        return origin.strip()
+    return str(base_dir.resolve())
+
+
+class ValidationCache:
+    """Maps unit subtrees of a repository to cache keys and stored results."""
+
+    def __init__(self, backend: CacheBackend, repo_id: Optional[str] = None):
+        self.backend = backend
+        self.repo_id = repo_id
+        self.hits = 0
+        self.misses = 0
+
+    def load_config_data(self, config_path: Path) -> Dict[str, Any]:
+        """Parse a configuration file, reusing the parsed data of identical files."""
+        raw = config_path.read_bytes()
+        key = digest(b"config", CACHE_VERSION.encode(), config_path.suffix.lower().encode(), raw)
+        cached = self.backend.get(key)
+        if cached is not None:
+            return json.loads(cached)
+        config_data = load_config_data(config_path)
+        if config_data:
+            self.backend.put(key, json.dumps(config_data).encode())
+        return config_data
+
+    def unit_keys(self, validator: RepositoryValidator, unit_depth: int) -> Optional[Dict[tuple, str]]:
+        """
+        Return {unit parts: cache key} for the units that can be restored.
+
+        Units with uncommitted or untracked changes get no key. Returns None
+        when the repository's git state cannot be read.
+        """
+        base_dir = validator.base_dir
+        config = validator.config
+        root = Path(config.root_dir).as_posix().strip("/")
+        root_parts = tuple(part for part in root.split("/") if part and part != ".")
+        pathspec = root or "."
+
+        show_prefix = run_git(["rev-parse", "--show-prefix"], base_dir)
+        listing = run_git(["ls-tree", "-d", "-r", "-z", "HEAD", "--", pathspec], base_dir)
+        status = run_git(["status", "--porcelain", "-z", "--untracked-files=all", "--", pathspec], base_dir)
+        if show_prefix is None or listing is None or status is None:
+            return None
+        prefix = tuple(part for part in show_prefix.strip().split("/") if part)
+
+        dirty: Set[tuple] = set()
+        records = iter(status.split("\0"))
+        for record in records:
+            if len(record) < 4:
+                continue
+            paths = [record[3:]]
+            if record[0] in "RC":
+                paths.append(next(records, ""))  # Rename source
+            for path in paths:
+                parts = tuple(path.rstrip("/").split("/"))
+                if parts[:len(prefix)] == prefix:
+                    parts = parts[len(prefix):]
+                dirty.add(parts[len(root_parts):len(root_parts) + unit_depth])
+
+        repo_id = self.repo_id or default_repo_id(base_dir)
+        fingerprint = config_fingerprint(config, base_dir)
+        keys = {}
+        for record in listing.split("\0"):
+            if "\t" not in record:
+                continue
+            meta, path = record.split("\t", 1)
+            parts = tuple(path.split("/"))
+            if parts[:len(root_parts)] != root_parts or len(parts) != len(root_parts) + unit_depth:
+                continue
+            unit = parts[len(root_parts):]
+            if unit in dirty:
+                continue
+            tree_id = meta.split()[2]
+            keys[unit] = digest(b"unit", repo_id.encode(), fingerprint.encode(),
+                                "/".join(unit).encode(), tree_id.encode(),
+                                self.override_chain(validator, unit))
+        return keys
+
+    @staticmethod
+    def override_chain(validator: RepositoryValidator, unit: tuple) -> bytes:
+        """Return the contents of the override files above a unit (they are not in its tree)."""
+        override_file = validator.config.override_file
+        if not override_file:
+            return b""
+        chunks = []
+        for depth in range(len(unit)):
+            try:
+                chunks.append(validator.root_path.joinpath(*unit[:depth], override_file).read_bytes())
+            except OSError:
+                chunks.append(b"")
+        return b"\0".join(chunks)
+
+    def restore(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored result of a unit, or None."""
+        data = self.backend.get(key)
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    def store(self, key: str, findings: List[ValidationError], stats: Dict[str, int],
+              children: List[str], root_path: Path) -> None:
+        """Store the findings, statistics and child directory names of a unit."""
+        root = os.fspath(root_path)
+        payload = {
+            "children": sorted(children),
+            "findings": [
+                [f.level, f.message, os.path.relpath(f.path_str, root), f.rule, list(f.subjects)]
+                for f in findings
+            ],
+            "stats": stats,
+        }
+        self.backend.put(key, json.dumps(payload, separators=(",", ":")).encode())
+
+
+class CachedValidator(RepositoryValidator):
+    """A validator that restores unchanged unit subtrees from a ValidationCache."""
+
+    def __init__(self, *args, cache: Optional[ValidationCache] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = cache
+
+    def unit_depth(self) -> int:
+        """Depth of the cached subtrees: the directories holding components."""
+        return max(1, self.config.max_depth - 1)
+
+    def validate_directory_structure(self) -> None:
+        config = self.config
+        keys = None
+        started_ns = time.time_ns()
+        # Symlink targets and sparse checkouts are not described by tree ids
+        if (self.cache is not None and self.root_path.is_dir() and config.max_depth
+                and config.sparse_mode == "off" and not config.follow_symlinks):
+            keys = self.cache.unit_keys(self, self.unit_depth())
+        if keys is None:
+            super().validate_directory_structure()
+            return
+
+        self.log(f"Validating directory structure in: {self.root_path}")
+        cache = self.cache
+        restored: Dict[tuple, Dict[str, Any]] = {}
+        for unit, key in keys.items():
+            result = cache.restore(key)
+            # Git does not track empty directories: a new empty component
+            # leaves the tree id unchanged, so compare the unit's children
+            if result is not None and result.get("children") == self.child_directories(unit):
+                restored[unit] = result
+        cache.hits += len(restored)
+        cache.misses += len(keys) - len(restored)
+
+        root = os.fspath(self.root_path)
+        restored_paths = {os.path.join(root, *unit) for unit in restored}
+
+        def skip_entry(path_str: str, name: str, is_dir: bool) -> bool:
+            return path_str in restored_paths or self.should_skip_entry(path_str, name, is_dir)
+
+        # Walk everything that was not restored, collecting results per storable unit
+        depth = self.unit_depth()
+        pending = {unit: ([], dict.fromkeys(self.stats, 0), []) for unit in keys if unit not in restored}
+        racy: Set[tuple] = set()
+        # Findings of directories outside pending units, merged with the units' in walk order
+        sections: List[Tuple[tuple, List[ValidationError]]] = []
+        first_error = len(self.errors)
+        directories = list(self.iter_directories(self.root_path, skip_entry=skip_entry))
+        self.batch_level_values(parts for _, parts in directories)
+        for path, parts in directories:
+            record = pending.get(parts[:depth]) if len(parts) >= depth else None
+            if record is None:
+                errors_before = len(self.errors)
+                self.validate_directory(path, parts)
+                sections.append((parts, self.errors[errors_before:]))
+                continue
+            if len(parts) == depth + 1:
+                record[2].append(parts[-1])
+            try:
+                if modified_since(os.lstat(os.fspath(path)).st_mtime_ns, started_ns):
+                    racy.add(parts[:depth])
+            except OSError:
+                racy.add(parts[:depth])
+            errors_before = len(self.errors)
+            stats_before = dict(self.stats)
+            self.validate_directory(path, parts)
+            record[0].extend(self.errors[errors_before:])
+            for name, value in self.stats.items():
+                record[1][name] += value - stats_before[name]
+
+        for unit, (findings, stats, children) in pending.items():
+            if unit in racy:
+                continue
+            try:
+                cache.store(keys[unit], findings, stats, children, self.root_path)
+            except OSError as e:
+                self.log(f"Failed to write validation cache: {e}", "WARNING")
+                break
+
+        sections.extend((unit, findings) for unit, (findings, _, _) in pending.items())
+        for unit, result in restored.items():
+            sections.append((unit, [
+                ValidationError(level, message, self.root_path / path, rule, tuple(subjects))
+                for level, message, path, rule, subjects in result["findings"]
+            ]))
+            for name, value in result["stats"].items():
+                self.stats[name] = self.stats.get(name, 0) + value
+        # The walk lists directories depth first in name order, i.e. in the order of their parts
+        del self.errors[first_error:]
+        for _, findings in sorted(sections, key=itemgetter(0)):
+            self.errors.extend(findings)
+        self.log(f"Validation cache: {len(restored)} unit(s) restored, {len(pending)} revalidated")
+
+    def child_directories(self, unit: tuple) -> Optional[List[str]]:
+        """Return the sorted names of the non-skipped directories directly below a unit."""
+        try:
+            with os.scandir(self.root_path.joinpath(*unit)) as iterator:
+                return sorted(
+                    entry.name for entry in iterator
+                    if entry.is_dir() and not self.should_skip_entry(entry.path, entry.name, True)
+                )
+        except OSError:
+            return None
+    
+    def counters(self) -> Dict[str, int]:
+        counters = super().counters()
+        if self.cache is not None:
+            counters["result_cache_hits"] = self.cache.hits
+            counters["result_cache_misses"] = self.cache.misses
+        return counters
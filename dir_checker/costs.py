@@ -0,0 +1,144 @@
+"""
+Rule-level cost attribution for dir-checker (``--rule-costs``).
+
+RuleCostValidator is a RepositoryValidator that times every check it runs and
+attributes the time to a rule id:
+
+    depth             directories below max_depth
+    skip-dirs         skip_dirs lookup of every walked entry
+    gitignore         .gitignore matching of every walked entry (also per pattern)
+    value:<level>     valid_values match of one level (the batched match of
+                      the distinct values before the walk, then one lookup
+                      per component)
+    mandatory-files   mandatory file lookups of a component
+    optional-files    optional file lookups of a component
+
+For every rule it records the cumulative time, the number of invocations and
+how often the rule fired (reported a violation or skipped an entry). The plain
+RepositoryValidator carries none of this bookkeeping.
+"""
+
+import time
+from pathlib import Path
+from typing import AbstractSet, Callable, Dict, List, Tuple, Union
+
+from dir_checker.main import LevelMatcher, RepositoryValidator, StructureConfig, gitignore_pattern_matches
+from dir_checker.tree import TreeNode
+
+
+class CostCounter:
+    """Cumulative time, invocations and fired count of one rule or pattern."""
+
+    __slots__ = ("seconds", "calls", "fired")
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.calls = 0
+        self.fired = 0
+
+    def add(self, seconds: float, fired: bool) -> None:
+        self.seconds += seconds
+        self.calls += 1
+        self.fired += fired
+
+
+class RuleCostValidator(RepositoryValidator):
+    """A validator that attributes the time spent in checks to rule ids."""
+
+    def __init__(self, *args, **kwargs):
+        self.rule_costs: Dict[str, CostCounter] = {}
+        self.pattern_costs: Dict[str, CostCounter] = {}
+        super().__init__(*args, **kwargs)
+
+    def cost(self, rule: str) -> CostCounter:
+        counter = self.rule_costs.get(rule)
+        if counter is None:
+            counter = self.rule_costs[rule] = CostCounter()
+        return counter
+
+    def should_skip_entry(self, path_str: str, name: str, is_dir: bool) -> bool:
+        started = time.perf_counter()
+        skipped = name in self.compiled.skip_dirs
+        self.cost("skip-dirs").add(time.perf_counter() - started, skipped)
+        if skipped:
+            return True
+        return self.is_gitignored(path_str, name, lambda: is_dir)
+
+    def is_gitignored(self, path_str: str, name: str, is_dir: Callable[[], bool]) -> bool:
+        if not (self.config.respect_gitignore and self.gitignore_patterns):
+            return False
+
+        rule_started = time.perf_counter()
+        path_str = self.relative_to_base(path_str)
+        matched = False
+        for pattern in self.gitignore_patterns:
+            counter = self.pattern_costs.get(pattern)
+            if counter is None:
+                counter = self.pattern_costs[pattern] = CostCounter()
+            started = time.perf_counter()
+            matched = gitignore_pattern_matches(pattern, path_str, name, is_dir)
+            counter.add(time.perf_counter() - started, matched)
+            if matched:
+                break
+        self.cost("gitignore").add(time.perf_counter() - rule_started, matched)
+        return matched
+
+    def check_depth_limit(self, path: Union[Path, TreeNode], depth: int, config: StructureConfig) -> bool:
+        started = time.perf_counter()
+        violation = super().check_depth_limit(path, depth, config)
+        self.cost("depth").add(time.perf_counter() - started, violation)
+        return violation
+
+    def validate_level_value(self, level_name: str, value: str, config=None) -> bool:
+        started = time.perf_counter()
+        valid = super().validate_level_value(level_name, value, config)
+        self.cost(f"value:{level_name}").add(time.perf_counter() - started, not valid)
+        return valid
+
+    def match_level_values(self, level_name: str, matcher: LevelMatcher,
+                           values: AbstractSet[str]) -> Dict[str, bool]:
+        started = time.perf_counter()
+        verdicts = super().match_level_values(level_name, matcher, values)
+        # Only the time: the calls and findings are counted per component
+        self.cost(f"value:{level_name}").seconds += time.perf_counter() - started
+        return verdicts
+
+    def check_files(self, rule: str, names: List[str], file_exists: Callable[[str], bool],
+                    config: StructureConfig) -> Tuple[List[str], List[str]]:
+        started = time.perf_counter()
+        present, missing = super().check_files(rule, names, file_exists, config)
+        self.cost(rule).add(time.perf_counter() - started, bool(missing))
+        return present, missing
+
+    def format_rule_costs(self, top: int = 10) -> str:
+        """Return the rule cost report: rules by total time, then .gitignore patterns by matches."""
+        lines = [
+            "Rule Costs",
+            "=" * 50,
+            f"   {'rule':<24} {'time ms':>9} {'calls':>9} {'fired':>7} {'µs/call':>8}",
+        ]
+        for rule, counter in sorted(self.rule_costs.items(), key=lambda item: -item[1].seconds)[:top]:
+            lines.append(format_counter(rule, counter))
+
+        for pattern in self.gitignore_patterns:
+            self.pattern_costs.setdefault(pattern, CostCounter())
+        if self.pattern_costs:
+            lines += ["", ".gitignore patterns (most matches first):",
+                      f"   {'pattern':<24} {'time ms':>9} {'calls':>9} {'fired':>7} {'µs/call':>8}"]
+            by_matches = sorted(self.pattern_costs.items(), key=lambda item: (-item[1].fired, -item[1].seconds))
+            for pattern, counter in by_matches[:top]:
+                lines.append(format_counter(pattern, counter))
+            unused = [pattern for pattern, counter in by_matches if not counter.fired]
+            if unused:
+                unused_ms = sum(self.pattern_costs[pattern].seconds for pattern in unused) * 1000
+                lines.append(f"   {len(unused)} pattern(s) never matched and cost {unused_ms:.1f} ms: "
+                             + ", ".join(unused[:top]) + (" ..." if len(unused) > top else ""))
+        return "\n".join(lines)
+
+
+def format_counter(name: str, counter: CostCounter) -> str:
+    """Format one row of the rule cost report."""
+    fired = 100 * counter.fired / counter.calls if counter.calls else 0.0
+    per_call = 1e6 * counter.seconds / counter.calls if counter.calls else 0.0
+    return (f"   {name:<24} {counter.seconds * 1000:>9.1f} {counter.calls:>9} "
+            f"{fired:>6.1f}% {per_call:>8.2f}")
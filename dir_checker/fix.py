@@ -0,0 +1,181 @@
+"""
+Autofix for dir-checker: create missing mandatory files.
+
+The validator reports missing mandatory files per component (rule
+``missing-mandatory-files``, one subject per file). ``--fix`` turns those
+findings into files rendered from per-file templates, found in
+``fix_templates_dir`` under the same name as the mandatory file. Templates may
+use ``{component}``, ``{module}`` or any other level name, ``{path}`` (the
+component directory) and ``{file}``; other braces are left untouched, so
+templates for HCL or JSON files need no escaping. Files without a template are
+created empty.
+
+Components are fixed in parallel; each worker creates the component's missing
+parent directories once and then its files. Existing files are never
+overwritten.
+"""
+
+import difflib
+import os
+import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dir_checker.main import RepositoryValidator, StructureConfig, ValidationError, colorize
+
+TEMPLATE_VARIABLE = re.compile(r"\{(\w+)\}")
+
+
+@dataclass
+class PlannedFile:
+    """A missing mandatory file and the content it will be created with."""
+
+    component: tuple
+    path: Path
+    content: str
+
+
+def render(template: str, variables: Dict[str, str]) -> str:
+    """Replace {name} placeholders for known variables, leaving other braces alone."""
+    return TEMPLATE_VARIABLE.sub(lambda m: variables.get(m.group(1), m.group(0)), template)
+
+
+def template_variables(config: StructureConfig, parts: tuple, name: str) -> Dict[str, str]:
+    """Return the template variables of a file in the component at parts."""
+    variables = dict(zip(config.levels, parts))
+    variables.setdefault("component", parts[-1] if parts else "")
+    variables["path"] = "/".join((Path(config.root_dir).as_posix(),) + tuple(parts))
+    variables["file"] = name
+    return variables
+
+
+class Fixer:
+    """Plans and creates missing mandatory files for a validator's findings."""
+
+    def __init__(self, validator: RepositoryValidator, templates_dir: Optional[Path] = None):
+        self.validator = validator
+        config = validator.config
+        if templates_dir is None and config.fix_templates_dir:
+            templates_dir = validator.base_dir / config.fix_templates_dir
+        self.templates_dir = templates_dir
+        self._templates: Dict[str, str] = {}
+
+    def template(self, name: str) -> str:
+        """Return the template of a mandatory file ("" when there is none)."""
+        template = self._templates.get(name)
+        if template is None:
+            template = ""
+            if self.templates_dir is not None:
+                try:
+                    template = (self.templates_dir / name).read_text()
+                except (OSError, UnicodeDecodeError):
+                    pass
+            self._templates[name] = template
+        return template
+
+    def plan(self, findings: Iterable[ValidationError]) -> List[PlannedFile]:
+        """Return the files to create for the missing-mandatory-files findings, in path order."""
+        root_path = self.validator.root_path
+        config = self.validator.config
+        planned = []
+        for finding in findings:
+            if finding.rule != "missing-mandatory-files" or finding.path is None:
+                continue
+            component_path = finding.path
+            if not component_path.is_dir():
+                continue  # Only in the git index (sparse checkout)
+            parts = component_path.relative_to(root_path).parts
+            for name in finding.subjects:
+                content = render(self.template(name), template_variables(config, parts, name))
+                planned.append(PlannedFile(parts, component_path / name, content))
+        planned.sort(key=lambda planned_file: planned_file.path)
+        return planned
+
+    def apply(self, planned: List[PlannedFile], max_workers: Optional[int] = None) -> List[Path]:
+        """Create the planned files, one task per component; return the files created."""
+        by_component: Dict[tuple, List[PlannedFile]] = {}
+        for planned_file in planned:
+            by_component.setdefault(planned_file.component, []).append(planned_file)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(self.create_component_files, by_component.values())
+            return [path for created in results for path in created]
+
+    def create_component_files(self, planned: List[PlannedFile]) -> List[Path]:
+        """Create the missing files of one component."""
+        for parent in sorted({planned_file.path.parent for planned_file in planned}):
+            os.makedirs(parent, exist_ok=True)
+
+        created = []
+        for planned_file in planned:
+            try:
+                fd = os.open(planned_file.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
+                continue  # Created since validation; never overwrite
+            with os.fdopen(fd, "w") as f:
+                f.write(planned_file.content)
+            created.append(planned_file.path)
+        return created
+
+
+def format_plan(planned: List[PlannedFile], base_dir: Path, full_diff: bool = False) -> str:
+    """Return a diff summary of the planned files (optionally the full diff)."""
+    lines = []
+    for planned_file in planned:
+        relative = os.path.relpath(planned_file.path, base_dir)
+        content_lines = planned_file.content.splitlines(keepends=True)
+        lines.append(f"   {colorize('+', 'green')} {relative} ({len(content_lines)} line(s))")
+        if full_diff and content_lines:
+            diff = difflib.unified_diff([], content_lines, "/dev/null", f"b/{relative}")
+            lines.extend("      " + line.rstrip("\n") for line in diff)
+    components = len({planned_file.component for planned_file in planned})
+    lines.append(f"{len(planned)} file(s) in {components} component(s)")
+    return "\n".join(lines)
+
+
+def stage(paths: List[Path], base_dir: Path) -> Tuple[bool, str]:
+    """Stage paths with a single `git add` (paths are passed on stdin, not argv)."""
+    pathspecs = "\0".join(os.path.relpath(path, base_dir) for path in paths)
+    try:
+        subprocess.run(
+            ["git", "add", "--pathspec-from-file=-", "--pathspec-file-nul"],
+            cwd=base_dir, input=pathspecs.encode("utf-8", "surrogateescape"),
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+        )
+    except OSError as e:
+        return False, str(e)
+    except subprocess.CalledProcessError as e:
+        return False, e.stderr.decode("utf-8", "replace").strip()
+    return True, ""
+
+
+def run_fix(validator: RepositoryValidator, dry_run: bool = False, stage_files: bool = False,
+            max_workers: Optional[int] = None) -> int:
+    """Validate, then create (or with dry_run, list) the missing mandatory files."""
+    validator.validate_directory_structure()
+    fixer = Fixer(validator)
+    planned = fixer.plan(validator.errors)
+
+    if not planned:
+        print(f"✅ {colorize('Nothing to fix:', 'green')} no missing mandatory files")
+        return 0
+
+    base_dir = validator.base_dir
+    if dry_run:
+        print(f"{colorize('Dry run:', 'blue')} would create")
+        print(format_plan(planned, base_dir, full_diff=validator.verbose))
+        return 0
+
+    created = fixer.apply(planned, max_workers)
+    print(f"🔧 {colorize('Fixed:', 'green')} created {len(created)} missing mandatory file(s)")
+    if stage_files and created:
+        staged, message = stage(created, base_dir)
+        if staged:
+            print(f"   Staged {len(created)} file(s) with git add")
+        else:
+            print(f"{colorize('Error:', 'red')} git add failed: {message}")
+            return 1
+    return 0
@@ -0,0 +1,419 @@
+"""
+Validation of commits straight from git objects (``--commits``).
+
+Server-side hooks (pre-receive, update) have no working tree. This module
+reads root_dir of a commit with one ``git ls-tree -r -t -z`` into an in-memory
+index of trees and blobs, and feeds it to the regular RepositoryValidator
+logic: component entry names come from the index and override files and
+``.gitignore`` are read through a single ``git cat-file --batch`` process.
+
+For a range of commits only the first commit is listed in full. Every
+following commit is applied as a ``git diff-tree`` against the previous one,
+and only the directories in that diff (or below a changed override file) are
+revalidated, so checking a long push costs little more than checking one
+commit.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from dir_checker.main import (
+    ConfigResolver,
+    RepositoryValidator,
+    ResultReporter,
+    StructureConfig,
+    ValidationError,
+    colorize,
+    load_config_data,
+)
+from dir_checker.sparse import run_git
+
+
+class GitObjectReader:
+    """Reads objects through one long-running `git cat-file --batch` process."""
+
+    def __init__(self, cwd: Path):
+        self.process = subprocess.Popen(
+            ["git", "cat-file", "--batch"], cwd=cwd,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            env=dict(os.environ, GIT_NO_LAZY_FETCH="1", GIT_OPTIONAL_LOCKS="0"),
+        )
+
+    def read(self, spec: str) -> Optional[bytes]:
+        """Return the content of an object (an id or "<rev>:<path>"), or None if it does not exist."""
+        self.process.stdin.write(spec.encode("utf-8", "surrogateescape") + b"\n")
+        self.process.stdin.flush()
+        header = self.process.stdout.readline().split()
+        if len(header) != 3:
+            return None  # "<spec> missing" (or ambiguous)
+        data = self.process.stdout.read(int(header[2]))
+        self.process.stdout.read(1)  # Trailing newline
+        return data
+
+    def read_text(self, spec: str) -> Optional[str]:
+        data = self.read(spec)
+        return None if data is None else data.decode("utf-8", "surrogateescape")
+
+    def close(self) -> None:
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+
+
+class GitTreeIndex:
+    """Trees and blobs under root_dir in one commit, keyed by parts relative to root_dir."""
+
+    def __init__(self, root_parts: tuple):
+        self.root_parts = root_parts
+        # parts -> (object type, object id)
+        self.objects: Dict[tuple, Tuple[str, str]] = {}
+        # Tree parts -> names of its entries
+        self.children: Dict[tuple, Set[str]] = {}
+
+    def relative(self, path: str) -> Optional[tuple]:
+        """Return the parts of a repository path relative to root_dir (None if outside)."""
+        parts = tuple(path.split("/"))
+        size = len(self.root_parts)
+        if parts[:size] != self.root_parts or len(parts) == size:
+            return None
+        return parts[size:]
+
+    def add(self, parts: tuple, object_type: str, object_id: str) -> None:
+        self.objects[parts] = (object_type, object_id)
+        self.children.setdefault(parts[:-1], set()).add(parts[-1])
+        if object_type == "tree":
+            self.children.setdefault(parts, set())
+
+    def remove(self, parts: tuple) -> None:
+        self.objects.pop(parts, None)
+        siblings = self.children.get(parts[:-1])
+        if siblings is not None:
+            siblings.discard(parts[-1])
+        self.children.pop(parts, None)
+
+    def load(self, commit: str, cwd: Path) -> bool:
+        """Replace the index with root_dir of commit; return whether root_dir exists there."""
+        self.objects.clear()
+        self.children.clear()
+        pathspec = "/".join(self.root_parts) or "."
+        listing = run_git(["ls-tree", "-r", "-t", "-z", "--full-tree", commit, "--", pathspec], cwd)
+        if listing is None:
+            raise ValueError(f"cannot list commit {commit}")
+        for record in listing.split("\0"):
+            if "\t" not in record:
+                continue
+            meta, path = record.split("\t", 1)
+            parts = self.relative(path)
+            if parts is not None:
+                _, object_type, object_id = meta.split()
+                self.add(parts, object_type, object_id)
+        exists = bool(self.objects) or not self.root_parts
+        if exists:
+            self.children.setdefault((), set())
+        return exists
+
+    def apply_diff(self, old: str, new: str, cwd: Path) -> Tuple[Dict[tuple, str], Set[str]]:
+        """
+        Move the index from commit old to commit new.
+
+        Returns {changed parts under root_dir: status (A, D or M)} and the
+        changed repository paths outside root_dir (such as .gitignore).
+        """
+        pathspec = "/".join(self.root_parts) or "."
+        output = run_git(["diff-tree", "-r", "-t", "-z", "--no-renames", "--no-commit-id",
+                          old, new, "--", pathspec, ".gitignore"], cwd)
+        if output is None:
+            raise ValueError(f"cannot diff {old} and {new}")
+        changed: Dict[tuple, str] = {}
+        outside: Set[str] = set()
+        records = iter(output.split("\0"))
+        for meta in records:
+            if not meta.startswith(":"):
+                continue
+            path = next(records, "")
+            _, new_mode, _, new_id, status = meta[1:].split()
+            parts = self.relative(path)
+            if parts is None:
+                outside.add(path)
+                continue
+            changed[parts] = status
+            if status == "D":
+                self.remove(parts)
+            else:
+                object_type = "tree" if new_mode == "040000" else "commit" if new_mode == "160000" else "blob"
+                self.add(parts, object_type, new_id)
+        if self.root_parts and not self.objects:
+            self.children.pop((), None)
+        else:
+            self.children.setdefault((), set())
+        return changed, outside
+
+    def is_tree(self, parts: tuple) -> bool:
+        return parts in self.children
+
+    def iter_trees(self, parts: tuple = ()) -> Iterator[tuple]:
+        """Yield the trees below parts (not parts itself), parents before children."""
+        stack = [parts]
+        while stack:
+            current = stack.pop()
+            names = sorted(self.children.get(current, ()), reverse=True)
+            for name in names:
+                child = current + (name,)
+                if child in self.children:
+                    stack.append(child)
+            if current != parts:
+                yield current
+
+    def nested_names(self, parts: tuple) -> Set[str]:
+        """Return every path below a tree, relative to it ('/'-separated)."""
+        names = set()
+        stack = [(parts, "")]
+        while stack:
+            current, prefix = stack.pop()
+            for name in self.children.get(current, ()):
+                relative = prefix + name
+                names.add(relative)
+                child = current + (name,)
+                if child in self.children:
+                    stack.append((child, relative + "/"))
+        return names
+
+
+class GitConfigResolver(ConfigResolver):
+    """Resolves override files from a GitTreeIndex instead of the disk."""
+
+    def __init__(self, config: StructureConfig, root_path: Path, index: GitTreeIndex,
+                 reader: GitObjectReader, log=None, on_invalidate=None):
+        self.index = index
+        self.reader = reader
+        super().__init__(config, root_path, log, on_invalidate)
+
+    def read_override(self, override_path: Path, parts: tuple) -> Optional[Dict[str, Any]]:
+        entry = self.index.objects.get(parts + (self.filename,))
+        if entry is None or entry[0] != "blob":
+            return None
+        content = self.reader.read_text(entry[1])
+        return None if content is None else load_config_data(override_path, content)
+
+
+class GitTreeValidator(RepositoryValidator):
+    """A RepositoryValidator whose directories come from a GitTreeIndex."""
+
+    def __init__(self, config: StructureConfig, index: GitTreeIndex, reader: GitObjectReader,
+                 commit: str, verbose: bool = False, strict: bool = False,
+                 base_dir: Optional[Path] = None, quiet: bool = False):
+        self.index = index
+        self.reader = reader
+        self.commit = commit
+        super().__init__(config, verbose, strict, base_dir, quiet=quiet)
+        self.config_resolver = GitConfigResolver(config, self.root_path, index, reader, self.log,
+                                                 self.forget_configs)
+        self.complete_entry_names = True
+
+    def load_gitignore_patterns(self):
+        """Load .gitignore patterns from the commit."""
+        content = self.reader.read_text(f"{self.commit}:.gitignore")
+        self.gitignore_patterns = [
+            line.strip() for line in (content or "").splitlines()
+            if line.strip() and not line.strip().startswith('#')
+        ]
+
+    def component_entry_names(self, path, parts: tuple):
+        return self.index.nested_names(parts)
+
+
+class GitCommitChecker:
+    """
+    Validates a sequence of commits, revalidating only what changed between them.
+
+    Findings are kept per directory (like the watch mode); each commit's diff
+    against the previous one decides which directories are revalidated.
+    """
+
+    def __init__(self, config: StructureConfig, base_dir: Optional[Path] = None,
+                 strict: bool = False, verbose: bool = False):
+        self.config = config
+        self.base_dir = Path(base_dir) if base_dir is not None else Path()
+        self.strict = strict
+        self.verbose = verbose
+        root = Path(config.root_dir).as_posix().strip("/")
+        self.index = GitTreeIndex(tuple(part for part in root.split("/") if part and part != "."))
+        self.reader = GitObjectReader(self.base_dir)
+        self.validator: Optional[GitTreeValidator] = None
+        self.commit: Optional[str] = None
+        self.root_exists = False
+        # Directory parts -> (findings, components found, files checked)
+        self.results: Dict[tuple, Tuple[List[ValidationError], int, int]] = {}
+        self.skipped: Dict[tuple, bool] = {}
+        self.revalidated = 0
+
+    def close(self) -> None:
+        self.reader.close()
+
+    def new_validator(self, commit: str) -> None:
+        self.validator = GitTreeValidator(self.config, self.index, self.reader, commit,
+                                          self.verbose, self.strict, self.base_dir, quiet=True)
+        self.skipped.clear()
+        self.results.clear()
+
+    def is_skipped(self, parts: tuple) -> bool:
+        """Whether a directory or one of its ancestors is skipped (skip_dirs or .gitignore)."""
+        skipped = self.skipped.get(parts)
+        if skipped is None:
+            if not parts:
+                skipped = False
+            elif self.is_skipped(parts[:-1]):
+                skipped = True
+            else:
+                path_str = os.path.join(os.fspath(self.validator.root_path), *parts)
+                skipped = self.validator.should_skip_entry(path_str, parts[-1], True)
+            self.skipped[parts] = skipped
+        return skipped
+
+    def validate_one(self, parts: tuple) -> None:
+        """Validate one directory and store its results."""
+        validator = self.validator
+        validator.errors = []
+        components = validator.stats["components_found"]
+        files_checked = validator.stats["files_checked"]
+        validator.validate_directory(validator.root_path.joinpath(*parts), parts)
+        self.results[parts] = (
+            validator.errors,
+            validator.stats["components_found"] - components,
+            validator.stats["files_checked"] - files_checked,
+        )
+        validator.errors = []
+        self.revalidated += 1
+
+    def revalidate(self, parts: tuple, subtree: bool = False) -> None:
+        """Drop and rebuild the results of a directory (and with subtree, everything below it)."""
+        if subtree:
+            for key in [key for key in self.results if key[:len(parts)] == parts]:
+                del self.results[key]
+            for key in [key for key in self.skipped if key[:len(parts)] == parts]:
+                del self.skipped[key]
+            self.validator.config_resolver.invalidate(parts)
+            trees = list(self.index.iter_trees(parts))
+            if parts and self.index.is_tree(parts):
+                trees.insert(0, parts)
+        else:
+            self.results.pop(parts, None)
+            self.skipped.pop(parts, None)
+            trees = [parts] if self.index.is_tree(parts) else []
+        for tree in trees:
+            if not self.is_skipped(tree):
+                self.validate_one(tree)
+
+    def check(self, commit: str) -> None:
+        """Move to commit and revalidate what changed since the previous one."""
+        config = self.config
+        if self.commit is None:
+            self.root_exists = self.index.load(commit, self.base_dir)
+            self.new_validator(commit)
+            if self.root_exists:
+                self.revalidate((), subtree=True)
+            self.commit = commit
+            return
+
+        changed, outside = self.index.apply_diff(self.commit, commit, self.base_dir)
+        self.commit = commit
+        self.root_exists = () in self.index.children
+        if ".gitignore" in outside or (not self.index.root_parts and (".gitignore",) in changed):
+            # Skip decisions may change anywhere: start over with the new patterns
+            self.new_validator(commit)
+            self.revalidate((), subtree=True)
+            return
+        self.validator.commit = commit
+
+        override_dirs = {parts[:-1] for parts in changed if parts[-1] == config.override_file}
+        # Directories above components only report on their own existence, so
+        # they need revalidation when added or deleted; components whenever
+        # anything below them changed
+        components: Set[tuple] = set()
+        for parts, status in changed.items():
+            if len(parts) > config.max_depth:
+                components.add(parts[:config.max_depth])
+            if status != "M" and (parts in self.results or self.index.is_tree(parts)):
+                components.add(parts)
+        for parts in sorted(override_dirs, key=len):
+            if not any(parts[:len(other)] == other for other in override_dirs if len(other) < len(parts)):
+                self.revalidate(parts, subtree=True)
+        for parts in components:
+            if not any(parts[:len(other)] == other for other in override_dirs):
+                self.revalidate(parts)
+
+    def findings(self) -> List[ValidationError]:
+        """Return the findings of the current commit in path order."""
+        if not self.root_exists:
+            return [ValidationError("ERROR", f"Root directory '{self.config.root_dir}' not found",
+                                    rule="root-not-found")]
+        findings: List[ValidationError] = []
+        for parts in sorted(self.results):
+            findings.extend(self.results[parts][0])
+        return findings
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "components_found": sum(result[1] for result in self.results.values()),
+            "directories_scanned": len(self.results),
+            "files_checked": sum(result[2] for result in self.results.values()),
+        }
+
+    def exit_code(self, findings: List[ValidationError]) -> int:
+        levels = {finding.level for finding in findings}
+        if "ERROR" in levels:
+            return 1
+        if self.strict and ("WARNING" in levels or "OPTIONAL_WARNING" in levels):
+            return 1
+        return 0
+
+
+def list_commits(spec: str, cwd: Path) -> List[str]:
+    """Return the commits of a range ("A..B", oldest first) or a single revision."""
+    if ".." in spec:
+        output = run_git(["rev-list", "--reverse", spec], cwd)
+    else:
+        output = run_git(["rev-parse", "--verify", "--end-of-options", f"{spec}^{{commit}}"], cwd)
+    if output is None:
+        raise ValueError(f"unknown revision or range '{spec}'")
+    return output.split()
+
+
+def run_commit_checks(config: StructureConfig, spec: str, base_dir: Optional[Path] = None,
+                      strict: bool = False, verbose: bool = False) -> int:
+    """Validate every commit of spec and print one line per commit (plus the failures)."""
+    base_dir = Path(base_dir) if base_dir is not None else Path()
+    try:
+        commits = list_commits(spec, base_dir)
+    except ValueError as e:
+        print(f"{colorize('Error:', 'red')} {e}")
+        return 1
+
+    checker = GitCommitChecker(config, base_dir, strict, verbose)
+    reporter = ResultReporter()
+    failed = 0
+    try:
+        for commit in commits:
+            checker.check(commit)
+            findings = checker.findings()
+            exit_code = checker.exit_code(findings)
+            stats = checker.stats()
+            if exit_code == 0:
+                print(f"✅ {commit[:12]}: {stats['components_found']} component(s) passed")
+                continue
+            failed += 1
+            blocking = [f for f in findings if f.level == "ERROR" or
+                        (strict and f.level in ("WARNING", "OPTIONAL_WARNING"))]
+            print(f"❌ {commit[:12]}: {len(blocking)} blocking finding(s)")
+            reporter.write_lines(reporter.format_findings(blocking))
+    except ValueError as e:
+        print(f"{colorize('Error:', 'red')} {e}")
+        return 1
+    finally:
+        checker.close()
+
+    print(f"\nChecked {len(commits)} commit(s), {failed} failed "
+          f"({checker.revalidated} directory validation(s))")
+    return 1 if failed else 0
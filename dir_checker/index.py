@@ -0,0 +1,615 @@
+"""
+Persisted component index for dir-checker (``index_file``).
+
+The index keeps the results of the last run on disk so that the next run
+only revalidates components that changed. It stores one fixed-width record
+per walked directory: its path, signature (mtime and inode), flags, a hash of
+its effective configuration, its statistics and its findings. Directories the
+walk skipped (skip_dirs, .gitignore) get a record too, so the next run looks
+the skip decision up instead of matching patterns again.
+
+File layout (little endian)::
+
+    header    magic, version, generation, config fingerprints, counts and
+              offsets of the sections below, the stored configuration
+    strings   UTF-8 string table: paths (parts joined by NUL), rules,
+              messages and subjects, addressed by (offset, length)
+    findings  fixed-width finding records (level, rule, message, subjects)
+    records   fixed-width directory records sorted by path, so the records
+              of a directory's subtree follow it contiguously
+
+The file is read through mmap: a lookup binary-searches the records and a
+restored component decodes only its own records and findings, so a run that
+touches five components decodes five records, not the whole index.
+
+Writes are atomic (temporary file and rename). Unchanged subtrees are copied
+as raw records; their strings and findings stay valid because the new file
+starts with the old string and finding tables and appends to them. Every
+COMPACT_AFTER incremental writes the index is rebuilt without the garbage.
+
+The index also stores the configuration it was written for. When only rules
+that can be overridden per directory changed (valid_values, mandatory_files,
+fail_on_*, ...), ConfigImpact compares each component's old and new
+effective configuration and only the components whose findings the change
+can affect are revalidated. Changes to anything that shapes the walk
+(root_dir, levels, skip_dirs, .gitignore, ...) discard the index.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from dataclasses import asdict
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from dir_checker.cache import OUTPUT_FIELDS, config_fingerprint
+from dir_checker.main import ConfigResolver, RepositoryValidator, StructureConfig, ValidationError, apply_config_data
+from dir_checker.tree import FLAG_DIR, TreeModel, TreeNode
+
+INDEX_MAGIC = b"DCIX"
+INDEX_VERSION = 2
+
+# magic, version, generation, fingerprint, walk fingerprint, record count,
+# component count, strings, findings and records offsets and sizes, stored
+# configuration (string offset and length)
+HEADER = struct.Struct("<4sHH20s20sIIIIIIIII")
+# key offset, key length, flags, mtime_ns, inode, config signature, subtree
+# size, first finding, finding count, files checked
+RECORD = struct.Struct("<IHBxqQQIIII")
+CONFIG_SIGNATURE_OFFSET = struct.calcsize("<IHBxqQ")
+# level, rule, message, subjects (offset and length of each string)
+FINDING = struct.Struct("<BIIIIII")
+
+# Record flags
+RECORD_COMPONENT = 1
+RECORD_IGNORED = 2  # Skipped by the walk (skip_dirs or .gitignore)
+RECORD_OVERRIDE = 4  # Contains an override file
+
+LEVELS = ("ERROR", "WARNING", "OPTIONAL_WARNING", "INFO")
+LEVEL_IDS = {level: i for i, level in enumerate(LEVELS)}
+
+# Directories modified this close to the start of a run may change again
+# within the same timestamp tick; their signature is not trusted
+RACY_NS = 2_000_000_000
+
+COMPACT_AFTER = 16
+
+
+def index_key(parts: tuple) -> bytes:
+    """Return the index key of a directory: its parts joined by NUL."""
+    return "\0".join(parts).encode("utf-8", "surrogateescape")
+
+
+def key_parts(key: bytes) -> tuple:
+    """Return the parts of an index key."""
+    return tuple(key.decode("utf-8", "surrogateescape").split("\0"))
+
+
+def index_fingerprint(config: StructureConfig, base_dir: Path) -> bytes:
+    """Return the fingerprint of the configuration and .gitignore an index was written for."""
+    return bytes.fromhex(config_fingerprint(config, base_dir))
+
+
+def walk_fingerprint(config: StructureConfig, base_dir: Path) -> bytes:
+    """Return the fingerprint of the settings that cannot differ per directory, and .gitignore."""
+    return bytes.fromhex(config_fingerprint(config, base_dir, OUTPUT_FIELDS | ConfigResolver.OVERRIDABLE_KEYS))
+
+
+def encode_config(config: StructureConfig) -> bytes:
+    """Serialize the settings of a configuration that affect findings."""
+    data = {key: value for key, value in asdict(config).items() if key not in OUTPUT_FIELDS}
+    return json.dumps(data, sort_keys=True, default=sorted).encode()
+
+
+class ComponentIndex:
+    """Read-only view of an index file through mmap."""
+
+    def __init__(self, data: mmap.mmap, header: tuple):
+        self.data = data
+        (_, _, self.generation, self.fingerprint, self.walk_fingerprint, self.record_count,
+         self.component_count, self.strings_offset, self.strings_size, self.findings_offset,
+         self.finding_count, self.records_offset, self.config_offset, self.config_size) = header
+        # Decoded strings by offset: rules and most messages repeat across components
+        self._strings: Dict[int, str] = {}
+        self._subjects: Dict[int, tuple] = {}
+
+    @classmethod
+    def open(cls, path: Path) -> Optional["ComponentIndex"]:
+        """Map an index file; None if it is missing or corrupt."""
+        try:
+            with open(path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None  # Missing, unreadable or empty
+        try:
+            header = HEADER.unpack_from(data, 0)
+        except struct.error:
+            data.close()
+            return None
+        index = cls(data, header)
+        end = index.records_offset + index.record_count * RECORD.size
+        if (header[0] != INDEX_MAGIC or header[1] != INDEX_VERSION
+                or index.config_offset + index.config_size > index.strings_size
+                or index.strings_offset + index.strings_size > index.findings_offset
+                or index.findings_offset + index.finding_count * FINDING.size > index.records_offset
+                or end != len(data)):
+            data.close()
+            return None
+        return index
+
+    def close(self) -> None:
+        self.data.close()
+
+    def config(self) -> Optional[StructureConfig]:
+        """Return the configuration the index was written for (None if it cannot be read)."""
+        config = StructureConfig()
+        try:
+            apply_config_data(config, json.loads(self.string(self.config_offset, self.config_size)))
+        except (ValueError, TypeError):
+            return None
+        return config
+
+    def string(self, offset: int, length: int) -> bytes:
+        start = self.strings_offset + offset
+        return self.data[start:start + length]
+
+    def text(self, offset: int, length: int) -> str:
+        if not length:
+            return ""  # Empty strings share their offset with the next string
+        text = self._strings.get(offset)
+        if text is None:
+            text = self._strings[offset] = self.string(offset, length).decode("utf-8", "surrogateescape")
+        return text
+
+    def record(self, i: int) -> tuple:
+        """Return the fields of record i (see RECORD)."""
+        return RECORD.unpack_from(self.data, self.records_offset + i * RECORD.size)
+
+    def key(self, i: int) -> bytes:
+        key_offset, key_length = struct.unpack_from("<IH", self.data, self.records_offset + i * RECORD.size)
+        return self.string(key_offset, key_length)
+
+    def find(self, key: bytes, hint: int = -1) -> int:
+        """
+        Return the record of a directory key, or -1.
+
+        hint is the record expected to hold key (such as the record after the
+        previous sibling's subtree); it is checked before searching.
+        """
+        if 0 <= hint < self.record_count and self.key(hint) == key:
+            return hint
+        low, high = 0, self.record_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.record_count and self.key(low) == key:
+            return low
+        return -1
+
+    def findings(self, first: int, count: int) -> List[Tuple[str, str, str, tuple]]:
+        """Return (level, message, rule, subjects) of count findings starting at first."""
+        start = self.findings_offset + first * FINDING.size
+        text, subjects = self.text, self.subjects
+        return [
+            (LEVELS[level], text(message_offset, message_length), text(rule_offset, rule_length),
+             subjects(subjects_offset, subjects_length))
+            for level, rule_offset, rule_length, message_offset, message_length, subjects_offset, subjects_length
+            in FINDING.iter_unpack(self.data[start:start + count * FINDING.size])
+        ]
+
+    def subjects(self, offset: int, length: int) -> tuple:
+        if not length:
+            return ()
+        subjects = self._subjects.get(offset)
+        if subjects is None:
+            subjects = self._subjects[offset] = tuple(self.text(offset, length).split("\0"))
+        return subjects
+
+    def raw_records(self, first: int, count: int) -> bytes:
+        start = self.records_offset + first * RECORD.size
+        return self.data[start:start + count * RECORD.size]
+
+
+class IndexWriter:
+    """
+    Builds a new index file from new directory records and subtrees of an old index.
+
+    With reuse, the old string and finding tables are kept as the prefix of the
+    new ones, so records of unchanged subtrees are copied byte for byte.
+    """
+
+    def __init__(self, base: Optional[ComponentIndex] = None, reuse: bool = True):
+        self.base = base
+        self.reuse = base is not None and reuse
+        self.strings = bytearray()
+        self.string_offsets: Dict[bytes, int] = {}
+        self.findings = bytearray()
+        self.finding_count = 0
+        if self.reuse:
+            self.strings += base.string(0, base.strings_size)
+            start = base.findings_offset
+            self.findings += base.data[start:start + base.finding_count * FINDING.size]
+            self.finding_count = base.finding_count
+        # (key, record fields or None, raw records of a copied subtree, record count)
+        self.items: List[Tuple[bytes, Optional[list], bytes, int]] = []
+        self.component_count = 0
+
+    def intern(self, value: bytes) -> Tuple[int, int]:
+        offset = self.string_offsets.get(value)
+        if offset is None:
+            offset = self.string_offsets[value] = len(self.strings)
+            self.strings += value
+        return offset, len(value)
+
+    def add(self, key: bytes, flags: int, mtime_ns: int = 0, inode: int = 0, config_signature: int = 0,
+            files_checked: int = 0, findings: List[Tuple[str, str, str, tuple]] = ()) -> None:
+        """Add a directory record with its findings as (level, message, rule, subjects)."""
+        first = self.finding_count
+        for level, message, rule, subjects in findings:
+            self.findings += FINDING.pack(
+                LEVEL_IDS.get(level, 0),
+                *self.intern(rule.encode("utf-8", "surrogateescape")),
+                *self.intern(message.encode("utf-8", "surrogateescape")),
+                *self.intern("\0".join(subjects).encode("utf-8", "surrogateescape")),
+            )
+        self.finding_count += len(findings)
+        self.component_count += bool(flags & RECORD_COMPONENT)
+        self.items.append((key, [flags, mtime_ns, inode, config_signature, 1, first,
+                                 len(findings), files_checked], b"", 1))
+
+    def add_subtree(self, first: int, config_signatures: Optional[Dict[int, int]] = None) -> None:
+        """Copy the records of an old directory's subtree, replacing the given {record: config signature}."""
+        base = self.base
+        config_signatures = config_signatures or {}
+        fields = base.record(first)
+        count = fields[6]
+        if not self.reuse:
+            for i in range(first, first + count):
+                (_, _, flags, mtime_ns, inode, config_signature, _, finding_first,
+                 finding_count, files_checked) = base.record(i)
+                self.add(base.key(i), flags, mtime_ns, inode, config_signatures.get(i, config_signature),
+                         files_checked, base.findings(finding_first, finding_count))
+            return
+        for i in range(first, first + count):
+            self.component_count += bool(base.record(i)[2] & RECORD_COMPONENT)
+        raw = base.raw_records(first, count)
+        if config_signatures:
+            raw = bytearray(raw)
+            for i, config_signature in config_signatures.items():
+                struct.pack_into("<Q", raw, (i - first) * RECORD.size + CONFIG_SIGNATURE_OFFSET, config_signature)
+        self.items.append((base.key(first), None, raw, count))
+
+    def write(self, path: Path, config: StructureConfig, fingerprint: bytes, walk: bytes,
+              generation: int) -> None:
+        """Write the index atomically."""
+        self.items.sort(key=lambda item: item[0])
+
+        # Subtree sizes of new records: every item adds its size to its open ancestors
+        open_records: List[Tuple[bytes, list]] = []
+        for key, fields, _, count in self.items:
+            while open_records and not key.startswith(open_records[-1][0]):
+                open_records.pop()
+            for _, ancestor in open_records:
+                ancestor[4] += count
+            if fields is not None:
+                open_records.append((key + b"\0", fields))
+
+        records = bytearray()
+        for key, fields, raw, _ in self.items:
+            if fields is None:
+                records += raw
+            else:
+                records += RECORD.pack(*self.intern(key), *fields)
+
+        config_offset, config_size = self.intern(encode_config(config))
+        record_count = len(records) // RECORD.size
+        strings_offset = HEADER.size
+        findings_offset = strings_offset + len(self.strings)
+        records_offset = findings_offset + len(self.findings)
+        header = HEADER.pack(INDEX_MAGIC, INDEX_VERSION, generation, fingerprint, walk,
+                             record_count, self.component_count, strings_offset, len(self.strings),
+                             findings_offset, self.finding_count, records_offset, config_offset, config_size)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(self.strings)
+                f.write(self.findings)
+                f.write(records)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+
+class ConfigImpact:
+    """
+    Decide which recorded components a change of the per-directory rules affects.
+    
+    The old effective config of a component is resolved from the stored
+    configuration and the override files on disk. A component is unaffected
+    when every rule that differs between its old and new config cannot change
+    its findings: e.g. a level's valid_values that accept its value before and
+    after, or fail_on_missing_files for a component that has all its files.
+    """
+
+    # Rules that only matter below the components (check_depth_limit)
+    SUBDIR_KEYS = frozenset({"allow_subdirs", "fail_on_invalid_structure"})
+
+    def __init__(self, validator: "IndexedValidator", old_config: StructureConfig):
+        self.validator = validator
+        self.resolver = ConfigResolver(old_config, validator.root_path)
+        self.changes = self.describe(old_config, validator.config)
+        self._diffs: Dict[Tuple[int, int], FrozenSet[str]] = {}
+
+    @staticmethod
+    def describe(old: StructureConfig, new: StructureConfig) -> List[str]:
+        """Name the rules that differ between two configs (valid_values per level)."""
+        changes = []
+        for key in sorted(ConfigResolver.OVERRIDABLE_KEYS):
+            old_value, new_value = getattr(old, key), getattr(new, key)
+            if key == "valid_values":
+                changes += [f"valid_values.{level}" for level in sorted(old_value.keys() | new_value.keys())
+                            if old_value.get(level) != new_value.get(level)]
+            elif old_value != new_value:
+                changes.append(key)
+        return changes
+
+    def diff(self, old: StructureConfig, new: StructureConfig) -> FrozenSet[str]:
+        """Return the changed rules of two resolved configs (memoized: configs are shared by subtrees)."""
+        changed = self._diffs.get((id(old), id(new)))
+        if changed is None:
+            changed = self._diffs[(id(old), id(new))] = frozenset(self.describe(old, new))
+        return changed
+
+    def unaffected(self, index: ComponentIndex, first: int, record: int, parts: tuple,
+                   config: StructureConfig) -> bool:
+        """Whether the recorded results of a directory still hold under its new config."""
+        validator = self.validator
+        _, _, flags, _, _, config_signature, _, finding_first, finding_count, _ = index.record(record)
+        old = self.resolver.resolve(parts, bool(flags & RECORD_OVERRIDE))
+        if validator.config_signature(old) != config_signature:
+            return False  # An override file was edited as well
+        changed = self.diff(old, config)
+        if record != first:
+            return not changed & self.SUBDIR_KEYS
+
+        findings = {(rule, subjects) for _, _, rule, subjects in index.findings(finding_first, finding_count)}
+        rules = {rule for rule, _ in findings}
+        for change in changed:
+            if change.startswith("valid_values."):
+                level_name = change[len("valid_values."):]
+                if level_name not in validator.config.levels:
+                    continue
+                value = parts[validator.config.levels.index(level_name)]
+                # The message of an invalid value lists the valid values
+                if (("invalid-value", (level_name,)) in findings
+                        or not validator.validate_level_value(level_name, value, config)):
+                    return False
+            elif change == "fail_on_missing_files":
+                if "missing-mandatory-files" in rules:
+                    return False
+            elif change == "fail_on_invalid_values":
+                if "invalid-value" in rules:
+                    return False
+            elif change in self.SUBDIR_KEYS:
+                count = index.record(first)[6]
+                if any(not index.record(i)[2] & RECORD_IGNORED for i in range(first + 1, first + count)):
+                    return False
+            else:
+                return False  # mandatory_files, optional_files, skip_files
+        return True
+
+
+class IndexedValidator(RepositoryValidator):
+    """A validator that restores unchanged components from the index_file of the last run."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.index_path = self.base_dir / self.config.index_file if self.config.index_file else None
+        self.index_hits = 0
+        self.index_misses = 0
+        self._config_signatures: Dict[int, int] = {}
+        self.impact: Optional[ConfigImpact] = None
+        # Restored directories are referenced like walked ones, without building Paths
+        self._restored_tree = TreeModel(self.root_path)
+        self._restored_nodes: Dict[tuple, int] = {(): 0}
+
+    def config_signature(self, config: StructureConfig) -> int:
+        """Return a 64-bit hash of the per-directory settings of a resolved config."""
+        signature = self._config_signatures.get(id(config))
+        if signature is None:
+            data = {key: value for key, value in asdict(config).items() if key in ConfigResolver.OVERRIDABLE_KEYS}
+            encoded = json.dumps(data, sort_keys=True, default=sorted).encode()
+            signature = int.from_bytes(hashlib.blake2b(encoded, digest_size=8).digest(), "little")
+            self._config_signatures[id(config)] = signature
+        return signature
+
+    def is_unchanged(self, index: ComponentIndex, first: int, config_signatures: Dict[int, int]) -> bool:
+        """
+        Whether every directory of a recorded subtree still has its recorded signature and config.
+        
+        Records whose config changed without affecting their results get
+        their new config signature in config_signatures.
+        """
+        root = os.fspath(self.root_path)
+        count = index.record(first)[6]
+        for i in range(first, first + count):
+            _, _, flags, mtime_ns, inode, config_signature, _, _, _, _ = index.record(i)
+            if flags & RECORD_IGNORED:
+                continue
+            if not mtime_ns:
+                return False  # Recorded while racy
+            parts = key_parts(index.key(i))
+            try:
+                stat = os.lstat(os.path.join(root, *parts))
+            except OSError:
+                return False
+            if stat.st_mtime_ns != mtime_ns or stat.st_ino != inode:
+                return False
+            if i == first or flags & RECORD_OVERRIDE:
+                # An unchanged mtime means the override file was neither added nor removed
+                config = self.config_resolver.resolve(parts, bool(flags & RECORD_OVERRIDE))
+                signature = self.config_signature(config)
+                if signature != config_signature:
+                    if self.impact is None or not self.impact.unaffected(index, first, i, parts, config):
+                        return False
+                    config_signatures[i] = signature
+        return True
+
+    def validate_directory_structure(self) -> None:
+        config = self.config
+        # Symlink targets and sparse checkouts are not described by directory signatures
+        if (self.index_path is None or not self.root_path.is_dir() or not config.max_depth
+                or config.sparse_mode != "off" or config.follow_symlinks):
+            super().validate_directory_structure()
+            return
+
+        self.log(f"Validating directory structure in: {self.root_path}")
+        fingerprint = index_fingerprint(config, self.base_dir)
+        walk = walk_fingerprint(config, self.base_dir)
+        base = ComponentIndex.open(self.index_path)
+        self.impact = None
+        if base is not None and base.fingerprint != fingerprint:
+            # Only per-directory rules changed: keep the components they cannot affect
+            old_config = base.config() if base.walk_fingerprint == walk else None
+            if old_config is None:
+                self.log("Configuration changed, rebuilding the component index")
+                base.close()
+                base = None
+            else:
+                self.impact = ConfigImpact(self, old_config)
+                self.log(f"Configuration changed ({', '.join(self.impact.changes) or 'override files'}), "
+                         f"revalidating affected components")
+        generation = base.generation + 1 if base is not None else 0
+        writer = IndexWriter(base, reuse=generation < COMPACT_AFTER)
+        if not writer.reuse:
+            generation = 0
+
+        started_ns = time.time_ns()
+        root = os.fspath(self.root_path)
+        max_depth = config.max_depth
+        signatures: Dict[str, Tuple[int, int]] = {}
+        restored: List[Tuple[int, Dict[int, int]]] = []
+        ignored: List[bytes] = []
+        changed = base is None or self.impact is not None
+        # The walk passes the entries of a directory in order, so the next
+        # sibling's record usually follows the previous sibling's subtree
+        hint = -1
+
+        def skip_entry(path_str: str, name: str, is_dir: bool) -> bool:
+            nonlocal changed, hint
+            key = path_str[len(root) + 1:].replace(os.sep, "\0").encode("utf-8", "surrogateescape")
+            record = base.find(key, hint) if base is not None else -1
+            if record >= 0:
+                hint = record + base.record(record)[6]
+            if record < 0:
+                changed = True
+                skipped = self.should_skip_entry(path_str, name, is_dir)
+            else:
+                skipped = bool(base.record(record)[2] & RECORD_IGNORED)
+                if not skipped and key.count(b"\0") + 1 == max_depth:
+                    config_signatures: Dict[int, int] = {}
+                    if self.is_unchanged(base, record, config_signatures):
+                        restored.append((record, config_signatures))
+                        return True
+            if skipped:
+                ignored.append(key)
+                return True
+            try:
+                stat = os.lstat(path_str)
+            except OSError:
+                return False
+            racy = stat.st_mtime_ns + RACY_NS >= started_ns
+            signatures[path_str] = (0 if racy else stat.st_mtime_ns, stat.st_ino)
+            return False
+
+        # Findings per walked directory and restored subtree, merged in walk order
+        sections: List[Tuple[tuple, List[ValidationError]]] = []
+        first_error = len(self.errors)
+        directories = list(self.iter_directories(self.root_path, skip_entry=skip_entry))
+        self.batch_level_values(parts for _, parts in directories)
+        for path, parts in directories:
+            errors_before = len(self.errors)
+            components_before = self.stats["components_found"]
+            files_before = self.stats["files_checked"]
+            self.validate_directory(path, parts)
+
+            flags = RECORD_COMPONENT if self.stats["components_found"] > components_before else 0
+            config_signature = 0
+            if path.has_marker:
+                flags |= RECORD_OVERRIDE
+            if len(parts) >= max_depth:
+                changed = True
+                self.index_misses += len(parts) == max_depth
+                if len(parts) == max_depth or flags & RECORD_OVERRIDE:
+                    config_signature = self.config_signature(self.config_resolver.resolve(parts))
+            mtime_ns, inode = signatures.get(os.fspath(path), (0, 0))
+            writer.add(index_key(parts), flags, mtime_ns, inode, config_signature,
+                       self.stats["files_checked"] - files_before,
+                       [(e.level, e.message, e.rule, e.subjects) for e in self.errors[errors_before:]])
+            sections.append((parts, self.errors[errors_before:]))
+
+        for key in ignored:
+            writer.add(key, RECORD_IGNORED)
+        for first, config_signatures in restored:
+            errors_before = len(self.errors)
+            self.restore_subtree(base, first)
+            writer.add_subtree(first, config_signatures)
+            sections.append((key_parts(base.key(first)), self.errors[errors_before:]))
+        self.index_hits = len(restored)
+        # The walk lists directories depth first in name order, i.e. in the order of their parts
+        del self.errors[first_error:]
+        for _, findings in sorted(sections, key=itemgetter(0)):
+            self.errors.extend(findings)
+
+        if changed or writer.component_count != base.component_count:
+            try:
+                writer.write(self.index_path, config, fingerprint, walk, generation)
+            except OSError as e:
+                self.log(f"Failed to write component index {self.index_path}: {e}", "WARNING")
+        if base is not None:
+            base.close()
+        self.log(f"Component index: {self.index_hits} component(s) restored, {self.index_misses} revalidated")
+
+    def restore_subtree(self, index: ComponentIndex, first: int) -> None:
+        """Add the findings and statistics recorded for a directory subtree."""
+        count = index.record(first)[6]
+        for i in range(first, first + count):
+            _, _, flags, _, _, _, _, finding_first, finding_count, files_checked = index.record(i)
+            if flags & RECORD_IGNORED:
+                continue
+            self.stats["directories_scanned"] += 1
+            self.stats["components_found"] += bool(flags & RECORD_COMPONENT)
+            self.stats["files_checked"] += files_checked
+            if finding_count:
+                path = TreeNode(self._restored_tree, self.restored_node(key_parts(index.key(i))))
+                for level, message, rule, subjects in index.findings(finding_first, finding_count):
+                    self.add_error(level, message, path, rule, subjects)
+
+    def restored_node(self, parts: tuple) -> int:
+        """Return the node of a restored directory in the restored tree."""
+        node = self._restored_nodes.get(parts)
+        if node is None:
+            parent = self.restored_node(parts[:-1])
+            node = self._restored_nodes[parts] = self._restored_tree.add(parent, parts[-1], len(parts), FLAG_DIR)
+        return node
+
+    def counters(self) -> Dict[str, int]:
+        counters = super().counters()
+        counters["index_hits"] = self.index_hits
+        counters["index_misses"] = self.index_misses
+        return counters
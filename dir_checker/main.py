@@ -29,26 +29,55 @@ Configuration:
 import os
 import sys
 import argparse
+import contextlib
+import functools
+import time
 from pathlib import Path
-from typing import Dict, Set, Any, Optional, List
-from dataclasses import dataclass, field
+from typing import AbstractSet, Callable, Dict, Set, Any, Optional, List, Iterable, Iterator, Tuple, Union
+from dataclasses import dataclass, field, replace
 import fnmatch
+import itertools
+import re
 
 # Import json (always available) 
 import json
 import subprocess
 
+from dir_checker.sparse import SPARSE_MODES
+from dir_checker.tree import FLAG_CYCLE, FLAG_MOUNT, FLAG_SYMLINK, TreeNode, walk_tree
+
+ANSI_COLORS = {
+    'red': '\033[31m',
+    'yellow': '\033[33m',
+    'green': '\033[32m',
+    'blue': '\033[34m',
+    'cyan': '\033[36m',
+    'reset': '\033[0m'
+}
+
+# Display label and color for each finding level
+LEVEL_STYLES = {
+    "ERROR": ("Error", 'red'),
+    "WARNING": ("Warning", 'yellow'),
+    "OPTIONAL_WARNING": ("Warning", 'yellow'),
+    "INFO": ("Info", 'blue'),
+}
+
 def colorize(text: str, color: str) -> str:
     """Add ANSI color codes to text."""
-    colors = {
-        'red': '\033[31m',
-        'yellow': '\033[33m',
-        'green': '\033[32m',
-        'blue': '\033[34m',
-        'cyan': '\033[36m',
-        'reset': '\033[0m'
-    }
-    return f"{colors.get(color, '')}{text}{colors['reset']}"
+    return f"{ANSI_COLORS.get(color, '')}{text}{ANSI_COLORS['reset']}"
+
+def supports_color(stream: Any) -> bool:
+    """Check whether ANSI colors should be written to the given stream."""
+    if os.environ.get("NO_COLOR"):
+        return False
+    if os.environ.get("FORCE_COLOR"):
+        return True
+    isatty = getattr(stream, "isatty", None)
+    try:
+        return bool(isatty and isatty())
+    except ValueError:  # Closed stream
+        return False
 
 @dataclass
 class StructureConfig:
@@ -72,6 +101,12 @@ class StructureConfig:
     # Respect .gitignore patterns
     respect_gitignore: bool = True
     
+    # Walk into symlinked directories (each directory is still scanned only once)
+    follow_symlinks: bool = False
+    
+    # Do not descend into directories on other filesystems (mount points)
+    one_filesystem: bool = False
+    
     # Valid values for each level
     valid_values: Dict[str, List[str]] = field(default_factory=lambda: {
         "module": ["frontend", "backend", "shared", "common"],
@@ -100,25 +135,53 @@ class StructureConfig:
         ".DS_Store", "*.log", "*.tmp"
     })
     
+    # Sparse checkouts: "off" validates what is on disk, "skip" skips components
+    # that are not fully checked out, "index" validates them from the git index
+    sparse_mode: str = "off"
+    
+    # Baseline of known violations; findings listed there do not fail the run
+    baseline_file: str = "dir-checker-baseline.txt"
+    
+    # Templates for --fix, one per mandatory file name (missing templates give empty files)
+    fix_templates_dir: str = ".dir-checker/templates"
+    
+    # Per-directory override file layered onto this config (empty disables)
+    override_file: str = ".dir-checker.yaml"
+    
     # Validation settings
     fail_on_missing_files: bool = True
     fail_on_invalid_structure: bool = True
     fail_on_invalid_values: bool = False  # Only warn by default
     
+    # Append run timings and counters to this SQLite file (empty disables)
+    metrics_file: str = ""
+    
+    # Persist results here and revalidate only changed components on the next run (empty disables)
+    index_file: str = ""
+    
     # Logging settings
     log_level: str = "warn"  # Options: "error", "warn", "info"
     verbose: bool = True
+    
+    # Output settings
+    color: str = "auto"  # Options: "auto", "always", "never"
+    max_findings_per_section: int = 0  # 0 shows every finding
+    group_messages: bool = False  # Collapse identical messages into one line
 
-def parse_yaml_with_bash(file_path: str) -> Dict[str, Any]:
+def parse_yaml_with_bash(file_path: str, content: Optional[str] = None) -> Dict[str, Any]:
     """
     Parse simple YAML files using bash commands (like pre-commit-terraform does).
     This avoids the need for PyYAML dependency.
+    
+    content, when given, is parsed instead of reading file_path (e.g. a file
+    read from a git object); file_path is then only used in messages.
     """
     config_data: Dict[str, Any] = {}
     
     try:
-        with open(file_path, 'r') as f:
-            content = f.read()
+        if content is None:
+            with open(file_path, 'r') as f:
+                content = f.read()
         
         lines = content.split('\n')
         current_key = None
@@ -217,33 +280,405 @@ def parse_yaml_with_bash(file_path: str) -> Dict[str, Any]:
         print(f"⚠️  Failed to parse YAML file {file_path}: {e}")
         return {}
 
+def gitignore_pattern_matches(pattern: str, path_str: str, name: str, is_dir: Callable[[], bool]) -> bool:
+    """Check a path against a single .gitignore pattern."""
+    # Handle different gitignore pattern types
+    if fnmatch.fnmatch(path_str, pattern) or fnmatch.fnmatch(name, pattern):
+        return True
+    # Handle directory patterns ending with /
+    if pattern.endswith('/') and is_dir():
+        dir_pattern = pattern[:-1]
+        if fnmatch.fnmatch(path_str, dir_pattern) or fnmatch.fnmatch(name, dir_pattern):
+            return True
+    # Handle ** patterns (recursive)
+    if '**' in pattern:
+        # Convert ** pattern to fnmatch pattern
+        fnmatch_pattern = pattern.replace('**/', '*/')
+        if fnmatch.fnmatch(path_str, fnmatch_pattern):
+            return True
+    return False
+
 class ValidationError:
-    def __init__(self, level: str, message: str, path: Optional[Path] = None):
+    __slots__ = ("level", "message", "_path", "rule", "subjects")
+    
+    def __init__(self, level: str, message: str, path: Union[Path, TreeNode, None] = None,
+                 rule: str = "", subjects: Tuple[str, ...] = ()):
         self.level = level  # ERROR, WARNING, INFO
         self.message = message
-        self.path = path
+        self._path = path
+        # Stable id of the check that produced the finding, and what it is about
+        # (e.g. the missing file names), used to match findings across runs
+        self.rule = rule
+        self.subjects = subjects
+    
+    @property
+    def path_str(self) -> str:
+        """Path of the finding as a '/'-separated string, without building a Path."""
+        if self._path is None:
+            return ""
+        return os.fspath(self._path).replace(os.sep, "/")
+    
+    @property
+    def path(self) -> Optional[Path]:
+        """Path of the finding, materialized from the tree model on first access."""
+        if isinstance(self._path, TreeNode):
+            self._path = self._path.to_path()
+        return self._path
     
     def __str__(self):
-        if self.level == "ERROR":
-            prefix = colorize("Error", 'red')
-        elif self.level == "WARNING":
-            prefix = colorize("Warning", 'yellow')
-        elif self.level == "OPTIONAL_WARNING":
-            prefix = colorize("Warning", 'yellow')
-        else:  # INFO
-            prefix = colorize("Info", 'blue')
+        label, color = LEVEL_STYLES.get(self.level, LEVEL_STYLES["INFO"])
+        prefix = colorize(label, color)
         
         if self.path:
             return f"{prefix}: {self.message}: {self.path}"
         return f"{prefix}: {self.message}"
 
+class ResultReporter:
+    """
+    Format validation results and write them in batches.
+    
+    Each section is rendered into a buffer and written with a handful of
+    writes instead of one print per finding. Level prefixes are rendered once,
+    ANSI colors are dropped when the stream is not a terminal, large sections
+    can be capped, and identical messages can be collapsed into a single line.
+    """
+    
+    # Number of lines rendered before the buffer is flushed to the stream
+    BATCH_SIZE = 1024
+    
+    def __init__(self, stream: Any = None, color: Optional[bool] = None,
+                 max_per_section: int = 0, group_messages: bool = False):
+        self.stream = stream if stream is not None else sys.stdout
+        self.color = supports_color(self.stream) if color is None else color
+        self.max_per_section = max_per_section
+        self.group_messages = group_messages
+        self._prefixes: Dict[str, str] = {}
+    
+    def paint(self, text: str, color: str) -> str:
+        """Colorize text if colors are enabled for this reporter."""
+        return colorize(text, color) if self.color else text
+    
+    def prefix(self, level: str) -> str:
+        """Return the cached, indented prefix for a finding level."""
+        prefix = self._prefixes.get(level)
+        if prefix is None:
+            label, color = LEVEL_STYLES.get(level, LEVEL_STYLES["INFO"])
+            prefix = self._prefixes[level] = f"   {self.paint(label, color)}: "
+        return prefix
+    
+    def format_findings(self, findings: List["ValidationError"]) -> Iterator[str]:
+        """Yield one formatted line per finding (or per group of identical findings)."""
+        if not self.group_messages:
+            for finding in findings:
+                prefix = self.prefix(finding.level)
+                if finding.path:
+                    yield f"{prefix}{finding.message}: {finding.path}"
+                else:
+                    yield f"{prefix}{finding.message}"
+            return
+        
+        # Collapse identical messages, keeping first-seen order
+        groups: Dict[Tuple[str, str], List[ValidationError]] = {}
+        for finding in findings:
+            groups.setdefault((finding.level, finding.message), []).append(finding)
+        for (level, message), group in groups.items():
+            prefix = self.prefix(level)
+            first = group[0].path
+            if len(group) > 1:
+                yield f"{prefix}{message} ({len(group)} paths, e.g. {first})"
+            elif first:
+                yield f"{prefix}{message}: {first}"
+            else:
+                yield f"{prefix}{message}"
+    
+    def write_lines(self, lines: Iterable[str]) -> None:
+        """Write lines to the stream, flushing the buffer every BATCH_SIZE lines."""
+        buffer: List[str] = []
+        for line in lines:
+            buffer.append(line)
+            if len(buffer) >= self.BATCH_SIZE:
+                self.stream.write("\n".join(buffer) + "\n")
+                buffer.clear()
+        if buffer:
+            self.stream.write("\n".join(buffer) + "\n")
+    
+    def write_section(self, title: str, color: str, findings: List["ValidationError"]) -> None:
+        """Write a titled section of findings, capped at max_per_section lines."""
+        lines = [f"\n{self.paint(title, color)}"]
+        formatted = self.format_findings(findings)
+        if self.max_per_section:
+            formatted = itertools.islice(formatted, self.max_per_section)
+        shown = 0
+        for line in formatted:
+            lines.append(line)
+            shown += 1
+            if len(lines) >= self.BATCH_SIZE:
+                self.write_lines(lines)
+                lines = []
+        # Count the rest without formatting (or materializing paths for) them
+        if self.group_messages:
+            hidden = len({(f.level, f.message) for f in findings}) - shown
+        else:
+            hidden = len(findings) - shown
+        if hidden:
+            lines.append(f"   ... {hidden} more not shown (raise max_findings_per_section to see them)")
+        self.write_lines(lines)
+    
+    def report(self, findings: List["ValidationError"], stats: Dict[str, int],
+               show_optional: bool = True, show_info: bool = True) -> None:
+        """Write the full results report: statistics, summary, findings and status."""
+        # Group findings by level in a single pass
+        by_level: Dict[str, List[ValidationError]] = {level: [] for level in LEVEL_STYLES}
+        for finding in findings:
+            by_level.setdefault(finding.level, []).append(finding)
+        errors = by_level["ERROR"]
+        warnings = by_level["WARNING"]
+        optional_warnings = by_level["OPTIONAL_WARNING"]
+        infos = by_level["INFO"]
+        counts = {level: len(level_findings) for level, level_findings in by_level.items()}
+        
+        self.write_lines(self.summary_lines(counts, stats))
+        
+        if errors:
+            self.write_section(f'Found {len(errors)} error(s):', 'red', errors)
+        if warnings:
+            self.write_section(f'Found {len(warnings)} warning(s):', 'yellow', warnings)
+        if optional_warnings and show_optional:
+            self.write_section(f'Found {len(optional_warnings)} optional file warning(s):', 'yellow', optional_warnings)
+        if infos and show_info:
+            self.write_section(f'Found {len(infos)} info message(s):', 'blue', infos)
+        
+        self.write_lines([self.status_line(counts)])
+        self.stream.flush()
+    
+    def summary_lines(self, counts: Dict[str, int], stats: Dict[str, int]) -> List[str]:
+        """Return the statistics and summary lines for the number of findings per level."""
+        paint = self.paint
+        errors = counts.get("ERROR", 0)
+        warnings = counts.get("WARNING", 0)
+        optional_warnings = counts.get("OPTIONAL_WARNING", 0)
+        infos = counts.get("INFO", 0)
+        
+        lines = [
+            f"\n{paint('Repository Structure Validation Results', 'cyan')}",
+            "=" * 50,
+            f"{paint('Statistics:', 'blue')}",
+            f"   • Components found: {stats['components_found']}",
+            f"   • Directories scanned: {stats['directories_scanned']}",
+            f"   • Files checked: {stats['files_checked']}",
+        ]
+        
+        # Always show a summary, even if no issues
+        if not errors and not warnings and not optional_warnings and not infos:
+            lines.append(f"\n{paint('✅ All validations passed! Repository structure is compliant.', 'green')}")
+        else:
+            lines.append(f"\n{paint('Summary:', 'blue')}")
+            if errors:
+                lines.append(f"   • {paint(f'{errors} error(s)', 'red')} - blocking issues")
+            if warnings:
+                lines.append(f"   • {paint(f'{warnings} warning(s)', 'yellow')} - structure issues")
+            if optional_warnings:
+                lines.append(f"   • {paint(f'{optional_warnings} optional file warning(s)', 'yellow')} - missing recommended files")
+            if infos:
+                lines.append(f"   • {paint(f'{infos} info message(s)', 'blue')} - informational")
+        return lines
+    
+    def status_line(self, counts: Dict[str, int]) -> str:
+        """Return the final status line for the number of findings per level."""
+        if counts.get("ERROR"):
+            status = self.paint('❌ Validation failed due to errors above.', 'red')
+        elif counts.get("WARNING") or counts.get("OPTIONAL_WARNING") or counts.get("INFO"):
+            status = self.paint('⚠️  Validation passed with warnings/info above.', 'yellow')
+        else:
+            status = self.paint('✅ Perfect! No issues found.', 'green')
+        return f"\n{status}"
+
+class ConfigResolver:
+    """
+    Resolve per-directory override files layered on top of the base config.
+    
+    An override file (``.dir-checker.yaml`` by default) placed in any directory
+    under root_dir replaces the rule settings listed in OVERRIDABLE_KEYS for that
+    directory and everything below it; ``valid_values`` is merged per level.
+    Each directory is resolved once and cached. Directories without an override
+    file share their parent's config object, so lookups cost one dict access.
+    on_invalidate is called with the configs dropped by invalidate, so that
+    anything cached per config can be dropped with them.
+    """
+    
+    # Keys that may differ per subtree. Keys that shape the walk itself
+    # (root_dir, levels, max_depth, skip_dirs, ...) stay global.
+    OVERRIDABLE_KEYS = {
+        "valid_values", "mandatory_files", "optional_files", "skip_files",
+        "allow_subdirs", "fail_on_missing_files", "fail_on_invalid_structure",
+        "fail_on_invalid_values",
+    }
+    
+    def __init__(self, config: StructureConfig, root_path: Path, log=None,
+                 on_invalidate: Optional[Callable[[List[StructureConfig]], None]] = None):
+        self.base_config = config
+        self.root_path = root_path
+        self.filename = config.override_file
+        self.log = log or (lambda message, level="INFO": None)
+        self.on_invalidate = on_invalidate or (lambda configs: None)
+        self._cache: Dict[tuple, StructureConfig] = {}
+        self._cache[()] = self.layer(config, ())
+        self.hits = 0
+        self.misses = 0
+    
+    def layer(self, parent: StructureConfig, parts: tuple,
+              has_override: Optional[bool] = None) -> StructureConfig:
+        """Return parent with the override file of a directory applied, if it has one."""
+        if not self.filename or has_override is False:
+            return parent
+        override_path = self.root_path.joinpath(*parts, self.filename)
+        
+        try:
+            override_data = self.read_override(override_path, parts)
+        except Exception as e:
+            self.log(f"Failed to load override file {override_path}: {e}", "WARNING")
+            return parent
+        if override_data is None:
+            return parent
+        
+        changes: Dict[str, Any] = {}
+        for key, value in override_data.items():
+            if key not in self.OVERRIDABLE_KEYS:
+                self.log(f"Ignoring '{key}' in {override_path}: it cannot be overridden per directory", "WARNING")
+            elif key == "valid_values" and isinstance(value, dict):
+                changes[key] = {**parent.valid_values, **value}
+            elif key == "skip_files" and isinstance(value, list):
+                changes[key] = set(value)
+            else:
+                changes[key] = value
+        
+        self.log(f"Applied overrides from {override_path}: {', '.join(sorted(changes)) or 'none'}")
+        return replace(parent, **changes) if changes else parent
+    
+    def read_override(self, override_path: Path, parts: tuple) -> Optional[Dict[str, Any]]:
+        """Return the data of a directory's override file, or None if it has none."""
+        if not override_path.is_file():
+            return None
+        return load_config_data(override_path)
+    
+    def resolve(self, parts: tuple, has_override: Optional[bool] = None) -> StructureConfig:
+        """
+        Return the effective config for a directory given its parts relative to root_dir.
+        
+        has_override is a hint from the walk, which already listed the directory;
+        when it is False the override file is not looked up on disk.
+        """
+        config = self._cache.get(parts)
+        if config is None:
+            self.misses += 1
+            config = self._cache[parts] = self.layer(self.resolve(parts[:-1]), parts, has_override)
+        else:
+            self.hits += 1
+        return config
+    
+    def invalidate(self, parts: tuple = ()) -> None:
+        """Forget resolved configs for a directory and its descendants."""
+        size = len(parts)
+        dropped = [self._cache.pop(key) for key in [key for key in self._cache if key and key[:size] == parts]]
+        if not parts:
+            dropped.append(self._cache[()])
+            self._cache[()] = self.layer(self.base_config, ())
+        self.on_invalidate(dropped)
+
+def is_glob(value: str) -> bool:
+    """Whether a name contains fnmatch metacharacters (``*``, ``?`` or ``[``)."""
+    return "*" in value or "?" in value or "[" in value
+
+class LevelMatcher:
+    """
+    Compiled list of names and globs: exact names, a wildcard flag and one combined glob regex.
+    
+    Used for the valid_values of each level and for skip_files.
+    """
+    
+    __slots__ = ("allow_all", "exact", "pattern")
+    
+    def __init__(self, valid_values: Iterable[str]):
+        valid_values = list(valid_values)
+        self.allow_all = "*" in valid_values
+        self.exact = frozenset(value for value in valid_values if not is_glob(value))
+        globs = [value for value in valid_values if is_glob(value) and value != "*"]
+        self.pattern = re.compile("|".join(
+            f"(?:{fnmatch.translate(os.path.normcase(glob))})" for glob in globs
+        )) if globs else None
+    
+    def __call__(self, value: str) -> bool:
+        if self.allow_all or value in self.exact:
+            return True
+        return self.pattern is not None and self.pattern.match(os.path.normcase(value)) is not None
+    
+    def match_all(self, values: AbstractSet[str]) -> Dict[str, bool]:
+        """Match a set of distinct values: exact names by set operations, the glob regex only for the rest."""
+        if self.allow_all:
+            return dict.fromkeys(values, True)
+        verdicts = dict.fromkeys(values & self.exact, True)
+        rest = values - self.exact
+        if self.pattern is None:
+            verdicts.update(dict.fromkeys(rest, False))
+        else:
+            match = self.pattern.match
+            for value in rest:
+                verdicts[value] = match(os.path.normcase(value)) is not None
+        return verdicts
+
+def compile_level_matchers(valid_values: Dict[str, List[str]]) -> Dict[str, LevelMatcher]:
+    """Compile the valid_values of every level."""
+    return {level: LevelMatcher(values) for level, values in valid_values.items()}
+
+class CompiledConfig:
+    """
+    A StructureConfig with its matchers compiled once.
+    
+    Compiled configs are never modified after creation, so one instance can be
+    shared by any number of validators, including ones running concurrently.
+    """
+    
+    def __init__(self, config: StructureConfig):
+        self.config = config
+        self.level_matchers = compile_level_matchers(config.valid_values)
+        self.skip_dirs = frozenset(config.skip_dirs)
+        self.skip_files = LevelMatcher(config.skip_files)
+
+def compile_config(config: StructureConfig) -> CompiledConfig:
+    """Compile a configuration for reuse across validation runs."""
+    return CompiledConfig(config)
+
 class RepositoryValidator:
-    def __init__(self, config: StructureConfig, verbose: bool = False, strict: bool = False):
+    def __init__(self, config: StructureConfig, verbose: bool = False, strict: bool = False,
+                 base_dir: Optional[Path] = None, compiled: Optional[CompiledConfig] = None,
+                 quiet: bool = False):
         self.config = config
         self.verbose = verbose
         self.strict = strict
+        # Directory that root_dir, .gitignore and the baseline file are relative to
+        self.base_dir = Path(base_dir) if base_dir is not None else Path()
+        self.root_path = self.base_dir / config.root_dir
+        # Prefix stripped from walked paths before matching .gitignore patterns
+        self._base_prefix = os.path.join(os.fspath(self.base_dir), "")
+        # Suppress all log output (for library use)
+        self.quiet = quiet
+        self.compiled = compiled if compiled is not None and compiled.config is config else CompiledConfig(config)
+        # Compiled (overridden) configs by id. Each entry holds its config, so
+        # that the id cannot be reused by another config while it is cached.
+        self._compiled_configs: Dict[int, CompiledConfig] = {id(config): self.compiled}
+        # Verdicts of level values already matched, per config and level; only
+        # for configs in _compiled_configs and dropped with them
+        self._level_verdicts: Dict[int, Dict[str, Dict[str, bool]]] = {}
+        # Skip decisions of directories by parts relative to root_dir, inherited by their descendants
+        self._skipped: Dict[tuple, bool] = {(): False}
         self.errors: List[ValidationError] = []
         self.gitignore_patterns: List[str] = []
+        self.sparse_state = None
+        # Whether entry names also list every nested file, so that nested
+        # mandatory files missing from them are never looked up on disk
+        self.complete_entry_names = False
+        # Wall-clock time of each validation phase, in milliseconds
+        self.timings: Dict[str, float] = {}
         self.stats = {
             "components_found": 0,
             "directories_scanned": 0,
@@ -256,6 +691,7 @@ class RepositoryValidator:
         
         # Initialize after setup
         self.__post_init__()
+        self.config_resolver = ConfigResolver(config, self.root_path, self.log, self.forget_configs)
     
     def should_show_message(self, level: str) -> bool:
         """Check if a message of given level should be shown based on current log level."""
@@ -270,7 +706,7 @@ class RepositoryValidator:
     
     def load_gitignore_patterns(self):
         """Load patterns from .gitignore file."""
-        gitignore_path = Path(".gitignore")
+        gitignore_path = self.base_dir / ".gitignore"
         if gitignore_path.exists():
             try:
                 with open(gitignore_path, 'r') as f:
@@ -285,151 +721,341 @@ class RepositoryValidator:
     
     def log(self, message: str, level: str = "INFO"):
         """Log a message if verbose mode is enabled."""
+        if self.quiet:
+            return
         if self.verbose or level != "INFO":
             print(f"[{level}] {message}")
     
-    def add_error(self, level: str, message: str, path: Optional[Path] = None):
+    def add_error(self, level: str, message: str, path: Union[Path, TreeNode, None] = None,
+                  rule: str = "", subjects: Tuple[str, ...] = ()):
         """Add a validation error."""
-        self.errors.append(ValidationError(level, message, path))
+        self.errors.append(ValidationError(level, message, path, rule, subjects))
     
     def should_skip_path(self, path: Path) -> bool:
         """Check if a path should be skipped during validation."""
-        # Check skip_dirs configuration
-        path_parts = set(path.parts)
-        if path_parts.intersection(self.config.skip_dirs):
+        try:
+            parts = path.relative_to(self.root_path).parts
+        except ValueError:
+            # Outside root_dir: check every part
+            if not self.compiled.skip_dirs.isdisjoint(path.parts):
+                return True
+            return self.is_gitignored(str(path), path.name, path.is_dir)
+        return self.is_skipped(parts)
+    
+    def is_skipped(self, parts: tuple) -> bool:
+        """
+        Whether a directory under root_dir or one of its ancestors is skipped.
+        
+        Each directory is decided once, like in the walk: a skipped parent
+        skips its children, otherwise only the directory's own entry is checked.
+        """
+        skipped = self._skipped.get(parts)
+        if skipped is None:
+            skipped = self.is_skipped(parts[:-1]) or self.should_skip_entry(
+                os.path.join(self.root_path, *parts), parts[-1], True)
+            self._skipped[parts] = skipped
+        return skipped
+    
+    def should_skip_entry(self, path_str: str, name: str, is_dir: bool) -> bool:
+        """
+        Check if a directory entry found during the walk should be skipped.
+        
+        The walk prunes skipped directories, so only the entry's own name needs
+        to be checked against skip_dirs.
+        """
+        if name in self.compiled.skip_dirs:
             return True
-            
-        # Check gitignore patterns if enabled
-        if self.config.respect_gitignore and self.gitignore_patterns:
-            path_str = str(path)
-            for pattern in self.gitignore_patterns:
-                # Handle different gitignore pattern types
-                if fnmatch.fnmatch(path_str, pattern) or fnmatch.fnmatch(path.name, pattern):
-                    return True
-                # Handle directory patterns ending with /
-                if pattern.endswith('/') and path.is_dir():
-                    dir_pattern = pattern[:-1]
-                    if fnmatch.fnmatch(path_str, dir_pattern) or fnmatch.fnmatch(path.name, dir_pattern):
-                        return True
-                # Handle ** patterns (recursive)
-                if '**' in pattern:
-                    # Convert ** pattern to fnmatch pattern
-                    fnmatch_pattern = pattern.replace('**/', '*/')
-                    if fnmatch.fnmatch(path_str, fnmatch_pattern):
-                        return True
+        return self.is_gitignored(path_str, name, lambda: is_dir)
+    
+    def relative_to_base(self, path_str: str) -> str:
+        """Return a path below base_dir relative to it, as .gitignore patterns are."""
+        if path_str.startswith(self._base_prefix):
+            return path_str[len(self._base_prefix):]
+        return path_str
+    
+    def is_gitignored(self, path_str: str, name: str, is_dir: Callable[[], bool]) -> bool:
+        """Check a path against the loaded .gitignore patterns."""
+        if not (self.config.respect_gitignore and self.gitignore_patterns):
+            return False
         
-        return False
+        path_str = self.relative_to_base(path_str)
+        return any(gitignore_pattern_matches(pattern, path_str, name, is_dir)
+                   for pattern in self.gitignore_patterns)
     
-    def validate_level_value(self, level_name: str, value: str) -> bool:
-        """Validate a value against allowed values for a specific level."""
-        if level_name not in self.config.valid_values:
-            return True  # No restrictions defined
+    def validate_level_value(self, level_name: str, value: str,
+                             config: Optional[StructureConfig] = None) -> bool:
+        """
+        Validate a value against allowed values for a specific level.
         
-        valid_values = self.config.valid_values[level_name]
+        "*" allows anything, values containing "*", "?" or "[" are glob
+        patterns and anything else must match exactly.
+        """
+        config = config or self.config
+        matcher = self.level_matchers(config).get(level_name)
+        if matcher is None:
+            return True  # No restrictions defined
+        verdicts = self.level_verdicts(config, level_name)
+        valid = verdicts.get(value)
+        if valid is None:
+            valid = verdicts[value] = matcher(value)
+        return valid
+    
+    def compiled_config(self, config: StructureConfig) -> CompiledConfig:
+        """Return a (possibly overridden) config with its matchers compiled."""
+        compiled = self._compiled_configs.get(id(config))
+        if compiled is None:
+            compiled = self._compiled_configs[id(config)] = CompiledConfig(config)
+        return compiled
+    
+    def forget_configs(self, configs: Iterable[StructureConfig]) -> None:
+        """Drop what was compiled for configs the config resolver no longer uses."""
+        for config in configs:
+            if config is not self.config:
+                self._compiled_configs.pop(id(config), None)
+                self._level_verdicts.pop(id(config), None)
+    
+    def level_matchers(self, config: StructureConfig) -> Dict[str, LevelMatcher]:
+        """Return the compiled level matchers of a (possibly overridden) config."""
+        return self.compiled_config(config).level_matchers
+    
+    def skip_file_matcher(self, config: StructureConfig) -> LevelMatcher:
+        """Return the compiled skip_files of a (possibly overridden) config."""
+        return self.compiled_config(config).skip_files
+    
+    def level_verdicts(self, config: StructureConfig, level_name: str) -> Dict[str, bool]:
+        """Return the verdicts of the values of one level already matched under a config."""
+        by_level = self._level_verdicts.get(id(config))
+        if by_level is None:
+            self.compiled_config(config)  # Keeps config, and so its id, alive
+            by_level = self._level_verdicts[id(config)] = {}
+        verdicts = by_level.get(level_name)
+        if verdicts is None:
+            verdicts = by_level[level_name] = {}
+        return verdicts
+    
+    def batch_level_values(self, directories: Iterable[tuple]) -> None:
+        """
+        Match the level values of all components found by a walk at once.
         
-        for valid_value in valid_values:
-            if valid_value == "*":  # Wildcard - allow anything
-                return True
-            elif "*" in valid_value:  # Pattern matching with wildcards
-                # Use fnmatch for glob-style pattern matching
-                if fnmatch.fnmatch(value, valid_value):
-                    return True
-            elif value == valid_value:  # Exact match
-                return True
+        Module and component names repeat across thousands of components, so
+        the values are deduplicated per level and each distinct value is
+        matched once; validate_level_value then only looks up the verdict.
+        Components under per-directory overrides are matched on first use.
+        """
+        config = self.config
+        values: List[Set[str]] = [set() for _ in config.levels]
+        for parts in directories:
+            if len(parts) == config.max_depth:
+                for level_values, value in zip(values, parts):
+                    level_values.add(value)
         
-        return False
+        matchers = self.level_matchers(config)
+        for level_name, level_values in zip(config.levels, values):
+            matcher = matchers.get(level_name)
+            if matcher is not None and level_values:
+                verdicts = self.level_verdicts(config, level_name)
+                verdicts.update(self.match_level_values(level_name, matcher, level_values - verdicts.keys()))
+    
+    def match_level_values(self, level_name: str, matcher: LevelMatcher,
+                           values: AbstractSet[str]) -> Dict[str, bool]:
+        """Match a batch of distinct values of one level."""
+        return matcher.match_all(values)
     
     def validate_directory_structure(self) -> None:
         """Validate the directory structure according to configuration."""
-        root_path = Path(self.config.root_dir)
+        root_path = self.root_path
         
         if not root_path.exists():
-            self.add_error("ERROR", f"Root directory '{self.config.root_dir}' not found")
+            self.add_error("ERROR", f"Root directory '{self.config.root_dir}' not found", rule="root-not-found")
             return
         
         self.log(f"Validating directory structure in: {root_path}")
         
-        for path in root_path.rglob("*"):
-            if not path.is_dir() or self.should_skip_path(path):
-                continue
-            
+        self.sparse_state = None
+        if self.config.sparse_mode != "off":
+            from dir_checker.sparse import load_sparse_state
+            self.sparse_state = load_sparse_state(self.base_dir, self.config.root_dir, self.config.max_depth)
+            if self.sparse_state is not None:
+                self.log(f"Sparse checkout detected ({len(self.sparse_state.partial)} partially checked out components)")
+        
+        directories = list(self.iter_directories(root_path))
+        self.batch_level_values(parts for _, parts in directories)
+        for path, parts in directories:
+            self.validate_directory(path, parts)
+        
+        if self.sparse_state is not None and self.config.sparse_mode == "index":
+            self.validate_index_only_components()
+    
+    def validate_index_only_components(self) -> None:
+        """Validate components that exist in the git index but not on disk."""
+        sparse = self.sparse_state
+        for parts in sorted(sparse.files):
+            path = self.root_path.joinpath(*parts)
+            if path.exists() or self.should_skip_path(path):
+                continue  # Already validated from disk, or skipped
             self.stats["directories_scanned"] += 1
-            relative_path = path.relative_to(root_path)
-            parts = relative_path.parts
-            depth = len(parts)
-            
-            # Check depth (if enabled)
-            if self.config.check_depth and depth > self.config.max_depth:
-                if not self.config.allow_subdirs or depth > self.config.max_depth + 1:
-                    level = "ERROR" if self.config.fail_on_invalid_structure else "WARNING"
-                    self.add_error(
-                        level, 
-                        f"Directory exceeds maximum depth ({self.config.max_depth})",
-                        path
-                    )
-                elif depth == self.config.max_depth + 1:
-                    self.add_error("INFO", "Subdirectory in component", path)
-            
-            # Validate component directories (exactly at max_depth)
-            elif depth == self.config.max_depth:
-                self.stats["components_found"] += 1
-                self.validate_component_directory(path, parts)
+            self.stats["components_found"] += 1
+            config = self.config_resolver.resolve(parts)
+            self.validate_component_directory(path, parts, config, sparse.index_names(parts))
+        # A sparse index keeps directories outside the cone as single entries
+        # that list no files, so the components below them cannot be checked
+        for parts in sparse.sparse_dirs:
+            path = self.root_path.joinpath(*parts)
+            if parts and len(parts) <= self.config.max_depth and not self.should_skip_path(path):
+                self.add_error("INFO", "Directory collapsed in the sparse index, components below it not checked",
+                               path, rule="sparse-collapsed")
+    
+    def iter_directories(self, start: Path, include_start: bool = False,
+                         skip_entry: Optional[Callable[[str, str, bool], bool]] = None,
+                         stop_depth: Optional[int] = None) -> Iterator[Tuple[TreeNode, tuple]]:
+        """
+        Yield (node, parts relative to root_dir) for every non-skipped directory under start.
+        
+        skip_entry replaces should_skip_entry to prune additional directories;
+        directories at stop_depth are yielded but not descended into.
+        """
+        root_path = self.root_path
+        prefix = start.relative_to(root_path).parts
+        tree = walk_tree(root_path, skip_entry or self.should_skip_entry, prefix,
+                         entries_depth=self.config.max_depth, marker=self.config.override_file,
+                         follow_symlinks=self.config.follow_symlinks,
+                         one_filesystem=self.config.one_filesystem, stop_depth=stop_depth)
+        
+        first = 0 if include_start and prefix else 1
+        for index in range(first, len(tree)):
+            yield TreeNode(tree, index), tree.parts(index)
     
-    def validate_component_directory(self, path: Path, parts: tuple) -> None:
-        """Validate a component directory structure and values."""
+    def validate_directory(self, path: Union[Path, TreeNode], parts: tuple) -> None:
+        """Validate a single directory found during the walk."""
+        self.stats["directories_scanned"] += 1
+        depth = len(parts)
+        
+        # Directories the walk did not descend into are reported, not validated
+        if isinstance(path, TreeNode) and path.flags & (FLAG_SYMLINK | FLAG_CYCLE | FLAG_MOUNT):
+            # Below components only with check_depth, like any other directory there
+            if depth > self.config.max_depth and not self.config.check_depth:
+                return
+            flags = path.flags
+            if flags & FLAG_CYCLE:
+                self.add_error("WARNING", "Directory already scanned through another path (symlink loop or duplicate link), skipped",
+                               path, rule="symlink-cycle")
+                return
+            if flags & FLAG_MOUNT:
+                self.add_error("INFO", "Directory on another filesystem, not scanned", path, rule="filesystem-boundary")
+                return
+            if not self.config.follow_symlinks:
+                self.add_error("WARNING", "Symlinked directory, not followed (enable follow_symlinks to validate it)",
+                               path, rule="symlinked-directory")
+                return
+
+        has_override = path.has_marker if isinstance(path, TreeNode) else None
+        config = self.config_resolver.resolve(parts, has_override)
+        
+        # Check depth (if enabled)
+        if self.config.check_depth and depth > self.config.max_depth:
+            self.check_depth_limit(path, depth, config)
+        
+        # Validate component directories (exactly at max_depth)
+        elif depth == self.config.max_depth:
+            entry_names = self.component_entry_names(path, parts)
+            if self.sparse_state is not None and self.sparse_state.is_partial(parts):
+                if self.config.sparse_mode == "skip":
+                    self.add_error("INFO", "Component not fully checked out (sparse checkout), skipped",
+                                   path, rule="sparse-skipped")
+                    return
+                # Files outside the sparse checkout still count as present
+                entry_names = set(entry_names or ()) | self.sparse_state.index_names(parts)
+            self.stats["components_found"] += 1
+            self.validate_component_directory(path, parts, config, entry_names)
+    
+    def check_depth_limit(self, path: Union[Path, TreeNode], depth: int, config: StructureConfig) -> bool:
+        """Report a directory below max_depth; return whether it is a violation."""
+        if not config.allow_subdirs or depth > self.config.max_depth + 1:
+            level = "ERROR" if config.fail_on_invalid_structure else "WARNING"
+            self.add_error(
+                level, 
+                f"Directory exceeds maximum depth ({self.config.max_depth})",
+                path,
+                rule="max-depth"
+            )
+            return True
+        self.add_error("INFO", "Subdirectory in component", path, rule="subdirectory")
+        return False
+    
+    def component_entry_names(self, path: Union[Path, TreeNode], parts: tuple) -> Optional[AbstractSet[str]]:
+        """Return the names listed in a component directory by the walk (None to use the disk)."""
+        return path.entry_names if isinstance(path, TreeNode) else None
+    
+    def validate_component_directory(self, path: Union[Path, TreeNode], parts: tuple,
+                                     config: Optional[StructureConfig] = None,
+                                     entry_names: Optional[AbstractSet[str]] = None) -> None:
+        """
+        Validate a component directory structure and values.
+        
+        entry_names, when given, lists the names present in the component
+        (e.g. from the walk or the git index) and is used instead of the disk.
+        """
+        config = config or self.config
+        
         # Add INFO message for component being validated
-        self.add_error("INFO", f"Validating component directory", path)
+        self.add_error("INFO", f"Validating component directory", path, rule="component")
         
         # Validate each level's value
-        for i, (level_name, value) in enumerate(zip(self.config.levels, parts)):
-            if not self.validate_level_value(level_name, value):
-                level = "ERROR" if self.config.fail_on_invalid_values else "WARNING"
-                valid_values = self.config.valid_values.get(level_name, ["*"])
+        for i, (level_name, value) in enumerate(zip(config.levels, parts)):
+            if not self.validate_level_value(level_name, value, config):
+                level = "ERROR" if config.fail_on_invalid_values else "WARNING"
+                valid_values = config.valid_values.get(level_name, ["*"])
                 self.add_error(
                     level,
                     f"Invalid {level_name} '{value}'. Valid values: {valid_values}",
-                    path
+                    path,
+                    rule="invalid-value",
+                    subjects=(level_name,)
                 )
             else:
                 # Add INFO message for valid level values
-                self.add_error("INFO", f"Valid {level_name}: '{value}'", path)
+                self.add_error("INFO", f"Valid {level_name}: '{value}'", path, rule="valid-value", subjects=(level_name,))
         
         # Validate mandatory and optional files
-        self.validate_component_files(path)
+        self.validate_component_files(path, config, entry_names)
     
-    def validate_component_files(self, component_path: Path) -> None:
-        """Validate that mandatory and optional files exist in a component directory."""
-        missing_mandatory_files = []
-        missing_optional_files = []
-        present_files = []
+    def validate_component_files(self, component_path: Union[Path, TreeNode],
+                                 config: Optional[StructureConfig] = None,
+                                 entry_names: Optional[AbstractSet[str]] = None) -> None:
+        """
+        Validate that mandatory and optional files exist in a component directory.
+        
+        When entry_names (the names listed in the component directory) is given,
+        plain file names are looked up there instead of calling stat.
+        """
+        config = config or self.config
+        
+        def file_exists(name: str) -> bool:
+            if entry_names is not None and (self.complete_entry_names or '/' not in name or name in entry_names):
+                return name in entry_names
+            return os.path.exists(os.path.join(component_path, name))
         
         # Check mandatory files
-        for required_file in self.config.mandatory_files:
-            file_path = component_path / required_file
-            self.stats["files_checked"] += 1
-            
-            if file_path.exists() and not any(pattern in file_path.name for pattern in self.config.skip_files):
-                present_files.append(required_file)
-            else:
-                missing_mandatory_files.append(required_file)
+        self.stats["files_checked"] += len(config.mandatory_files)
+        present_files, missing_mandatory_files = self.check_files(
+            "mandatory-files", config.mandatory_files, file_exists, config)
         
         # Check optional files
-        for optional_file in self.config.optional_files:
-            file_path = component_path / optional_file
-            
-            if file_path.exists() and not any(pattern in file_path.name for pattern in self.config.skip_files):
-                if optional_file not in present_files:  # Don't duplicate if already counted as mandatory
-                    present_files.append(optional_file)
-            else:
-                missing_optional_files.append(optional_file)
+        present_optional_files, missing_optional_files = self.check_files(
+            "optional-files", config.optional_files, file_exists, config)
+        for optional_file in present_optional_files:
+            if optional_file not in present_files:  # Don't duplicate if already counted as mandatory
+                present_files.append(optional_file)
         
         # Report missing mandatory files
         if missing_mandatory_files:
-            level = "ERROR" if self.config.fail_on_missing_files else "WARNING"
+            level = "ERROR" if config.fail_on_missing_files else "WARNING"
             self.add_error(
                 level,
                 f"Missing mandatory files: {', '.join(missing_mandatory_files)}",
-                component_path
+                component_path,
+                rule="missing-mandatory-files",
+                subjects=tuple(missing_mandatory_files)
             )
         
         # Report missing optional files as WARNING
@@ -437,108 +1063,170 @@ class RepositoryValidator:
             self.add_error(
                 "OPTIONAL_WARNING",
                 f"Missing optional files: {', '.join(missing_optional_files)}",
-                component_path
+                component_path,
+                rule="missing-optional-files",
+                subjects=tuple(missing_optional_files)
             )
         
         if self.verbose and present_files:
             self.log(f"Found files: {', '.join(sorted(present_files))} in {component_path}")
     
+    def check_files(self, rule: str, names: List[str], file_exists: Callable[[str], bool],
+                    config: StructureConfig) -> Tuple[List[str], List[str]]:
+        """Split the files of one rule into (present, missing); files matching skip_files count as missing."""
+        skipped = self.skip_file_matcher(config)
+        present, missing = [], []
+        for name in names:
+            if file_exists(name) and not skipped(os.path.basename(name)):
+                present.append(name)
+            else:
+                missing.append(name)
+        return present, missing
+    
     def validate(self) -> int:
         """Run all validations and return exit code."""
         self.log("Starting repository structure validation...")
         
         try:
-            self.validate_directory_structure()
+            with self.timed("walk"):
+                self.validate_directory_structure()
+            with self.timed("baseline"):
+                self.apply_baseline()
             
             # Always print results for visibility
-            self.print_results()
-            
-            # Determine exit code - only fail on errors, regardless of log level
-            error_count = len([e for e in self.errors if e.level == "ERROR"])
-            
-            # Only fail on actual errors
-            if error_count > 0:
-                return 1
+            with self.timed("report"):
+                self.print_results()
             
-            # Handle strict mode (only applies if no errors)
-            warning_count = len([e for e in self.errors if e.level == "WARNING"])
-            optional_warning_count = len([e for e in self.errors if e.level == "OPTIONAL_WARNING"])
-            if self.strict and (warning_count > 0 or optional_warning_count > 0):
-                return 1
-                
-            return 0
+            return self.exit_code()
                 
         except Exception as e:
             self.log(f"Validation failed with exception: {e}", "ERROR")
             return 1
     
-    def print_results(self) -> None:
-        """Print validation results."""
-        print(f"\n{colorize('Repository Structure Validation Results', 'cyan')}")
-        print("=" * 50)
+    @contextlib.contextmanager
+    def timed(self, phase: str) -> Iterator[None]:
+        """Record the wall-clock time of a phase in self.timings."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[phase] = self.timings.get(phase, 0.0) + (time.perf_counter() - started) * 1000
+    
+    def counters(self) -> Dict[str, int]:
+        """Return the run's statistics together with cache counters."""
+        counters = dict(self.stats)
+        counters["config_cache_hits"] = self.config_resolver.hits
+        counters["config_cache_misses"] = self.config_resolver.misses
+        return counters
+    
+    def level_counts(self) -> Dict[str, int]:
+        """Return the number of findings per level."""
+        counts: Dict[str, int] = {}
+        for error in self.errors:
+            counts[error.level] = counts.get(error.level, 0) + 1
+        return counts
+    
+    def exit_code(self) -> int:
+        """Return the exit code for the current findings."""
+        # Determine exit code - only fail on errors, regardless of log level
+        levels = self.level_counts()
         
-        # Print statistics
-        print(f"{colorize('Statistics:', 'blue')}")
-        print(f"   • Components found: {self.stats['components_found']}")
-        print(f"   • Directories scanned: {self.stats['directories_scanned']}")
-        print(f"   • Files checked: {self.stats['files_checked']}")
+        # Only fail on actual errors
+        if "ERROR" in levels:
+            return 1
         
-        # Group errors by level
-        errors = [e for e in self.errors if e.level == "ERROR"]
-        warnings = [e for e in self.errors if e.level == "WARNING"]
-        optional_warnings = [e for e in self.errors if e.level == "OPTIONAL_WARNING"]
-        infos = [e for e in self.errors if e.level == "INFO"]
+        # Handle strict mode (only applies if no errors)
+        if self.strict and ("WARNING" in levels or "OPTIONAL_WARNING" in levels):
+            return 1
         
-        # Always show a summary, even if no issues
-        if not errors and not warnings and not optional_warnings and not infos:
-            print(f"\n{colorize('✅ All validations passed! Repository structure is compliant.', 'green')}")
-        else:
-            # Show summary counts even when passing
-            total_issues = len(errors) + len(warnings) + len(optional_warnings) + len(infos)
-            print(f"\n{colorize('Summary:', 'blue')}")
-            if errors:
-                print(f"   • {colorize(f'{len(errors)} error(s)', 'red')} - blocking issues")
-            if warnings:
-                print(f"   • {colorize(f'{len(warnings)} warning(s)', 'yellow')} - structure issues")
-            if optional_warnings:
-                print(f"   • {colorize(f'{len(optional_warnings)} optional file warning(s)', 'yellow')} - missing recommended files")
-            if infos:
-                print(f"   • {colorize(f'{len(infos)} info message(s)', 'blue')} - informational")
+        return 0
+    
+    def load_baseline(self):
+        """Return the Baseline of the baseline file, or None if there is none."""
+        baseline_path = self.base_dir / self.config.baseline_file if self.config.baseline_file else None
+        if baseline_path is None or not baseline_path.exists():
+            return None
         
-        # Print errors
-        if errors:
-            print(f"\n{colorize(f'Found {len(errors)} error(s):', 'red')}")
-            for error in errors:
-                print(f"   {error}")
+        from dir_checker.baseline import Baseline
+        try:
+            return Baseline.load(baseline_path, self.base_dir)
+        except (OSError, ValueError) as e:
+            self.log(f"Failed to load baseline {baseline_path}: {e}", "WARNING")
+            return None
+    
+    def apply_baseline(self) -> None:
+        """Drop findings recorded in the baseline file and report stale baseline entries."""
+        baseline = self.load_baseline()
+        if baseline is None:
+            return
         
-        # Print warnings
-        if warnings:
-            print(f"\n{colorize(f'Found {len(warnings)} warning(s):', 'yellow')}")
-            for warning in warnings:
-                print(f"   {warning}")
-        
-        # Print optional file warnings (based on log level)
-        if optional_warnings and (self.should_show_message("warn") or self.verbose):
-            print(f"\n{colorize(f'Found {len(optional_warnings)} optional file warning(s):', 'yellow')}")
-            for warning in optional_warnings:
-                print(f"   {warning}")
-        
-        # Print info messages (based on log level)
-        if infos and (self.should_show_message("info") or self.verbose):
-            print(f"\n{colorize(f'Found {len(infos)} info message(s):', 'blue')}")
-            for info in infos:
-                print(f"   {info}")
-        
-        # Final status message
-        if errors:
-            print(f"\n{colorize('❌ Validation failed due to errors above.', 'red')}")
-        elif warnings or optional_warnings or infos:
-            print(f"\n{colorize('⚠️  Validation passed with warnings/info above.', 'yellow')}")
-        else:
-            print(f"\n{colorize('✅ Perfect! No issues found.', 'green')}")
+        self.errors, suppressed = baseline.filter(self.errors)
+        self.report_stale_baseline(baseline, suppressed)
+    
+    def stale_baseline_findings(self, baseline) -> List[ValidationError]:
+        """Return an INFO finding per baseline entry that no filtered finding matched."""
+        return [
+            ValidationError("INFO", f"Stale baseline entry '{rule}' (no longer reported)", self.base_dir / path,
+                            rule="stale-baseline")
+            for rule, path in baseline.stale()
+        ]
+    
+    def report_stale_baseline(self, baseline, suppressed: int, stream: Any = None) -> None:
+        """Add a finding per stale baseline entry and print the baseline summary line to stream."""
+        stale = self.stale_baseline_findings(baseline)
+        self.errors.extend(stale)
+        
+        if self.quiet:
+            return
+        # Colored like the results that follow it
+        color = {"always": True, "never": False}.get(self.config.color.lower())
+        reporter = ResultReporter(stream=stream, color=color)
+        baseline_path = self.base_dir / self.config.baseline_file
+        reporter.stream.write(
+            f"{reporter.paint('Baseline:', 'blue')} {suppressed} known finding(s) suppressed by {baseline_path}, "
+            f"{len(stale)} stale entry(ies)" + (" - rerun with --write-baseline to prune them" if stale else "") + "\n")
+    
+    def print_results(self) -> None:
+        """Print validation results."""
+        color = {"always": True, "never": False}.get(self.config.color.lower())
+        reporter = ResultReporter(
+            color=color,
+            max_per_section=self.config.max_findings_per_section,
+            group_messages=self.config.group_messages,
+        )
+        reporter.report(
+            self.errors,
+            self.stats,
+            show_optional=self.should_show_message("warn") or self.verbose,
+            show_info=self.should_show_message("info") or self.verbose,
+        )
+
+def load_config_data(config_path: Path, content: Optional[str] = None) -> Dict[str, Any]:
+    """Read raw configuration data from a YAML or JSON file (or from its given content)."""
+    if config_path.suffix.lower() in ['.yaml', '.yml']:
+        return parse_yaml_with_bash(str(config_path), content)
+    if content is not None:
+        return json.loads(content)
+    with open(config_path, 'r') as f:
+        return json.load(f)
+
+def apply_config_data(config: StructureConfig, config_data: Dict[str, Any]) -> None:
+    """Update config in place with values loaded from a configuration file."""
+    sparse_mode = config_data.get("sparse_mode")
+    if sparse_mode is not None:
+        if sparse_mode not in SPARSE_MODES:
+            raise ValueError(f"sparse_mode must be one of {', '.join(SPARSE_MODES)}, not '{sparse_mode}'")
+    for key, value in config_data.items():
+        if hasattr(config, key):
+            # Handle sets properly
+            if key in ['skip_dirs', 'skip_files'] and isinstance(value, list):
+                setattr(config, key, set(value))
+            else:
+                setattr(config, key, value)
 
-def load_config(config_file: Optional[str] = None) -> StructureConfig:
-    """Load configuration from file or use defaults."""
+def load_config(config_file: Optional[str] = None, quiet: bool = False,
+                load_data: Callable[[Path], Dict[str, Any]] = load_config_data) -> StructureConfig:
+    """Load configuration from file or use defaults (load_data parses the file)."""
     config = StructureConfig()
     
     # Determine config file and format
@@ -558,24 +1246,13 @@ def load_config(config_file: Optional[str] = None) -> StructureConfig:
     
     if config_path.exists():
         try:
-            if config_path.suffix.lower() in ['.yaml', '.yml']:
-                config_data = parse_yaml_with_bash(str(config_path))
-            else:
-                with open(config_path, 'r') as f:
-                    config_data = json.load(f)
-            
-            # Update config with loaded values
-            for key, value in config_data.items():
-                if hasattr(config, key):
-                    # Handle sets properly
-                    if key in ['skip_dirs', 'skip_files'] and isinstance(value, list):
-                        setattr(config, key, set(value))
-                    else:
-                        setattr(config, key, value)
+            apply_config_data(config, load_data(config_path))
             
-            print(f"{colorize('✅ Loaded configuration from:', 'green')} {config_path}")
+            if not quiet:
+                print(f"{colorize('✅ Loaded configuration from:', 'green')} {config_path}")
         except Exception as e:
-            print(f"{colorize('Warning:', 'yellow')} Failed to load config from {config_path}: {e}")
+            if not quiet:
+                print(f"{colorize('Warning:', 'yellow')} Failed to load config from {config_path}: {e}")
     
     return config
 
@@ -620,6 +1297,11 @@ check_depth: {str(config.check_depth).lower()}
 allow_subdirs: {str(config.allow_subdirs).lower()}
 respect_gitignore: {str(config.respect_gitignore).lower()}
 
+# Symlinked directories are reported unless follow_symlinks is enabled; when
+# following, each directory is scanned once (loops are detected and reported)
+follow_symlinks: {str(config.follow_symlinks).lower()}
+one_filesystem: {str(config.one_filesystem).lower()}
+
 # Valid values for each level (customize for your project)
 # Use "*" to allow any name, or "prefix*" for prefix matching
 valid_values:
@@ -641,13 +1323,40 @@ skip_dirs:
 skip_files:
 {skip_files_yaml}
 
+# Sparse checkouts: off, skip (ignore components that are not fully checked
+# out) or index (validate them from the git index, without fetching objects)
+sparse_mode: {config.sparse_mode}
+
+# Known violations that do not fail the run (create with --write-baseline)
+baseline_file: "{config.baseline_file}"
+
+# Templates used by --fix to create missing mandatory files: <dir>/<file name>,
+# with {{component}}, {{module}} (any level name), {{path}} and {{file}} replaced
+fix_templates_dir: "{config.fix_templates_dir}"
+
+# Per-directory override file: place one in any directory under root_dir to
+# change valid_values, mandatory_files, optional_files, skip_files, allow_subdirs
+# or fail_on_* settings for that subtree (set to "" to disable)
+override_file: "{config.override_file}"
+
 # Validation settings
 fail_on_missing_files: {str(config.fail_on_missing_files).lower()}
 fail_on_invalid_structure: {str(config.fail_on_invalid_structure).lower()}
 fail_on_invalid_values: {str(config.fail_on_invalid_values).lower()}
 
+# Record run timings for --stats-report (e.g. ".dir-checker/metrics.db")
+metrics_file: "{config.metrics_file}"
+
+# Reuse results of unchanged components from the last run (e.g. ".dir-checker/index.bin")
+index_file: "{config.index_file}"
+
 # Logging settings  
 log_level: {config.log_level}
+
+# Output settings
+color: {config.color}
+max_findings_per_section: {config.max_findings_per_section}
+group_messages: {str(config.group_messages).lower()}
 """
         
         with open(config_path, 'w') as f:
@@ -661,15 +1370,26 @@ log_level: {config.log_level}
             "check_depth": config.check_depth,
             "allow_subdirs": config.allow_subdirs,
             "respect_gitignore": config.respect_gitignore,
+            "follow_symlinks": config.follow_symlinks,
+            "one_filesystem": config.one_filesystem,
             "valid_values": config.valid_values,
             "mandatory_files": config.mandatory_files,
             "optional_files": config.optional_files,
             "skip_dirs": list(config.skip_dirs),
             "skip_files": list(config.skip_files),
+            "sparse_mode": config.sparse_mode,
+            "baseline_file": config.baseline_file,
+            "fix_templates_dir": config.fix_templates_dir,
+            "override_file": config.override_file,
             "fail_on_missing_files": config.fail_on_missing_files,
             "fail_on_invalid_structure": config.fail_on_invalid_structure,
             "fail_on_invalid_values": config.fail_on_invalid_values,
-            "log_level": config.log_level
+            "metrics_file": config.metrics_file,
+            "index_file": config.index_file,
+            "log_level": config.log_level,
+            "color": config.color,
+            "max_findings_per_section": config.max_findings_per_section,
+            "group_messages": config.group_messages
         }
         
         with open(config_path, 'w') as f:
@@ -717,12 +1437,184 @@ Examples:
         help="Set log level (error, warn, info). Default: warn"
     )
     
+    parser.add_argument(
+        "--color",
+        choices=["auto", "always", "never"],
+        help="Colorize output (auto disables colors when not writing to a terminal). Default: auto"
+    )
+    
+    parser.add_argument(
+        "--max-findings",
+        type=int,
+        metavar="N",
+        help="Show at most N findings per section (0 shows all)"
+    )
+    
+    parser.add_argument(
+        "--group-messages",
+        action="store_true",
+        help="Collapse identical messages across components into one line with a count"
+    )
+    
+    parser.add_argument(
+        "--follow-symlinks",
+        action="store_true",
+        help="Walk into symlinked directories, scanning each directory only once"
+    )
+    
+    parser.add_argument(
+        "--one-filesystem",
+        action="store_true",
+        help="Do not descend into directories on other filesystems"
+    )
+    
+    parser.add_argument(
+        "--sparse",
+        choices=SPARSE_MODES,
+        help="Sparse checkouts: skip components that are not fully checked out, or validate them from the git index"
+    )
+    
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        metavar="FILE",
+        help="Baseline file of known violations (default: dir-checker-baseline.txt)"
+    )
+    
+    parser.add_argument(
+        "--write-baseline",
+        action="store_true",
+        help="Record all current findings in the baseline file and exit"
+    )
+    
+    parser.add_argument(
+        "--commits",
+        type=str,
+        metavar="REV",
+        help="Validate a commit, or every commit of a range (A..B), from git objects instead of the working tree"
+    )
+    
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="Create missing mandatory files from templates, then validate"
+    )
+    
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With --fix, list the files that would be created and exit"
+    )
+    
+    parser.add_argument(
+        "--stage",
+        action="store_true",
+        help="With --fix, stage the created files with git add"
+    )
+    
+    parser.add_argument(
+        "--watch", "-w",
+        action="store_true",
+        help="Validate once, then revalidate changed components until interrupted"
+    )
+    
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="With --watch, poll directory modification times instead of using inotify"
+    )
+    
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Walk, validate and print findings concurrently, with bounded memory on large trees"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="With --stream, number of validator threads (default: CPU count, at most 4)"
+    )
+    
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        metavar="DIR",
+        default=os.environ.get("DIR_CHECKER_CACHE_DIR"),
+        help="Shared cache of validation results, keyed by git tree ids (default: $DIR_CHECKER_CACHE_DIR)"
+    )
+    
+    parser.add_argument(
+        "--cache-max-size",
+        type=int,
+        default=256,
+        metavar="MB",
+        help="Evict least recently used cache entries above this size (default: 256)"
+    )
+    
+    parser.add_argument(
+        "--repo-id",
+        type=str,
+        default=os.environ.get("DIR_CHECKER_REPO_ID"),
+        help="Repository id for cache keys (default: origin URL, or the repository path)"
+    )
+    
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        metavar="FILE",
+        help="Append this run's timings and counters to a SQLite metrics file"
+    )
+    
+    parser.add_argument(
+        "--index-file",
+        type=str,
+        metavar="FILE",
+        help="Persist results in a component index and revalidate only changed components on the next run"
+    )
+    
+    parser.add_argument(
+        "--rule-costs",
+        action="store_true",
+        help="Time every check and report the most expensive rules and .gitignore patterns"
+    )
+    
+    parser.add_argument(
+        "--stats-report",
+        action="store_true",
+        help="Print latency percentiles and trends from the metrics file and exit"
+    )
+    
     parser.add_argument(
         "--create-config",
         action="store_true",
         help="Create a default configuration file and exit"
     )
     
+    parser.add_argument(
+        "--scaffold",
+        type=str,
+        metavar="DIR",
+        help="Generate a directory tree under DIR that satisfies the configuration and exit"
+    )
+    
+    parser.add_argument(
+        "--scaffold-count",
+        type=int,
+        default=1,
+        metavar="N",
+        help="With --scaffold, generate N names for each \"*\" or glob value (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--scaffold-size",
+        type=int,
+        default=0,
+        metavar="BYTES",
+        help="With --scaffold, make files without a template this size (sparse, default: 0)"
+    )
+    
     parser.add_argument(
         "--debug-config",
         action="store_true",
@@ -752,15 +1644,130 @@ Examples:
         return 0
     
     # Load configuration
-    config = load_config(args.config)
+    started = time.perf_counter()
+    cache = None
+    if args.cache_dir:
+        from dir_checker.cache import LocalDirectoryCache, ValidationCache
+        cache = ValidationCache(LocalDirectoryCache(Path(args.cache_dir), args.cache_max_size * 1024 * 1024),
+                                args.repo_id)
+        config = load_config(args.config, load_data=cache.load_config_data)
+    else:
+        config = load_config(args.config)
+    config_ms = (time.perf_counter() - started) * 1000
     
     # Override config with command-line flags
     if args.log_level:
         config.log_level = args.log_level
+    if args.color:
+        config.color = args.color
+    if args.max_findings is not None:
+        config.max_findings_per_section = args.max_findings
+    if args.group_messages:
+        config.group_messages = True
+    if args.baseline:
+        config.baseline_file = args.baseline
+    if args.sparse:
+        config.sparse_mode = args.sparse
+    if args.follow_symlinks:
+        config.follow_symlinks = True
+    if args.one_filesystem:
+        config.one_filesystem = True
+    if args.metrics_file:
+        config.metrics_file = args.metrics_file
+    if args.index_file:
+        config.index_file = args.index_file
+    
+    if args.stats_report:
+        from dir_checker import metrics
+        if not config.metrics_file:
+            print(f"{colorize('Error:', 'red')} --stats-report needs metrics_file (or --metrics-file)")
+            return 1
+        print(metrics.format_stats_report(metrics.load_runs(Path(config.metrics_file))))
+        return 0
+    
+    # One validator runs; refuse combinations that would silently drop an option
+    modes = [name for name, enabled in (
+        ("--rule-costs", args.rule_costs), ("--stream", args.stream), ("--cache-dir", bool(args.cache_dir)),
+        ("--index-file" if args.index_file else "index_file (from the configuration)", bool(config.index_file)),
+    ) if enabled]
+    if len(modes) > 1:
+        parser.error(f"{', '.join(modes[:-1])} and {modes[-1]} cannot be used together")
+    if args.commits and (args.rule_costs or args.stream or args.cache_dir or args.index_file):
+        parser.error(f"--commits cannot be used together with {modes[0]}")
+    
+    if args.commits:
+        from dir_checker.gittree import run_commit_checks
+        return run_commit_checks(config, args.commits, strict=args.strict, verbose=args.verbose)
+    
+    if args.scaffold:
+        from dir_checker.scaffold import scaffold
+        scaffold_started = time.perf_counter()
+        templates_dir = Path(config.fix_templates_dir) if config.fix_templates_dir else None
+        components, files = scaffold(config, Path(args.scaffold), count=args.scaffold_count,
+                                     file_size=args.scaffold_size, templates_dir=templates_dir)
+        print(f"✅ Scaffolded {components} component(s) with {files} new file(s) under "
+              f"{Path(args.scaffold) / config.root_dir} in {time.perf_counter() - scaffold_started:.2f}s")
+        return 0
     
     # Create validator and run
-    validator = RepositoryValidator(config, args.verbose, args.strict)
-    return validator.validate()
+    validator_class = RepositoryValidator
+    if args.rule_costs:
+        from dir_checker.costs import RuleCostValidator
+        validator_class = RuleCostValidator
+    elif args.stream:
+        from dir_checker.pipeline import StreamingValidator
+        validator_class = functools.partial(StreamingValidator, workers=args.workers)
+    elif cache is not None:
+        from dir_checker.cache import CachedValidator
+        validator_class = functools.partial(CachedValidator, cache=cache)
+    elif config.index_file:
+        from dir_checker.index import IndexedValidator
+        validator_class = IndexedValidator
+    validator = validator_class(config, args.verbose, args.strict)
+    if args.write_baseline:
+        from dir_checker.baseline import Baseline
+        validator.validate_directory_structure()
+        baseline = Baseline.from_findings(validator.errors, validator.base_dir)
+        baseline_path = Path(config.baseline_file or "dir-checker-baseline.txt")
+        baseline.save(baseline_path)
+        print(f"✅ Wrote {len(baseline)} baseline entry(ies) to {baseline_path}")
+        return 0
+    if args.fix:
+        from dir_checker.fix import run_fix
+        fix_code = run_fix(validator, dry_run=args.dry_run, stage_files=args.stage)
+        if args.dry_run or fix_code:
+            return fix_code
+        # Report what is left after fixing
+        validator = validator_class(config, args.verbose, args.strict)
+    if args.watch:
+        from dir_checker.watch import run_watch
+        return run_watch(validator, poll=args.poll)
+    exit_code = validator.validate()
+    if cache is not None:
+        try:
+            cache.backend.prune()
+        except OSError as e:
+            validator.log(f"Failed to prune validation cache: {e}", "WARNING")
+    if args.rule_costs:
+        print()
+        print(validator.format_rule_costs())
+    
+    if config.metrics_file:
+        from dir_checker import metrics
+        validator.timings["config"] = config_ms
+        level_counts = validator.level_counts()
+        try:
+            metrics.record_run(
+                Path(config.metrics_file), config.root_dir,
+                total_ms=(time.perf_counter() - started) * 1000,
+                exit_code=exit_code,
+                phases=validator.timings,
+                counters=validator.counters(),
+                level_counts=level_counts,
+            )
+        except Exception as e:
+            validator.log(f"Failed to record metrics in {config.metrics_file}: {e}", "WARNING")
+    return exit_code
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Historical run metrics for dir-checker.
+
+Every run can append one row to a local SQLite database: timestamp, phase
+timings, the validator's counters (components, directories, files, cache
+hits/misses, ...) and finding counts. ``--stats-report`` summarizes latency
+percentiles and how they trend as the repository grows.
+"""
+
+import json
+import math
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    root TEXT NOT NULL,
+    total_ms REAL NOT NULL,
+    exit_code INTEGER NOT NULL,
+    components_found INTEGER NOT NULL,
+    directories_scanned INTEGER NOT NULL,
+    files_checked INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    warnings INTEGER NOT NULL,
+    infos INTEGER NOT NULL,
+    phases TEXT NOT NULL,
+    counters TEXT NOT NULL
+)
+"""
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """Open (and create if needed) a metrics database."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(str(db_path), timeout=10)
+    connection.execute(SCHEMA)
+    return connection
+
+
+def record_run(db_path: Path, root: str, total_ms: float, exit_code: int,
+               phases: Dict[str, float], counters: Dict[str, int],
+               level_counts: Dict[str, int], timestamp: Optional[float] = None) -> None:
+    """Append one run to the metrics database."""
+    connection = connect(db_path)
+    try:
+        with connection:
+            connection.execute(
+                "INSERT INTO runs (timestamp, root, total_ms, exit_code, components_found,"
+                " directories_scanned, files_checked, errors, warnings, infos, phases, counters)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    time.time() if timestamp is None else timestamp,
+                    root,
+                    round(total_ms, 3),
+                    exit_code,
+                    counters.get("components_found", 0),
+                    counters.get("directories_scanned", 0),
+                    counters.get("files_checked", 0),
+                    level_counts.get("ERROR", 0),
+                    level_counts.get("WARNING", 0) + level_counts.get("OPTIONAL_WARNING", 0),
+                    level_counts.get("INFO", 0),
+                    json.dumps({name: round(ms, 3) for name, ms in phases.items()}, sort_keys=True),
+                    json.dumps(counters, sort_keys=True),
+                ),
+            )
+    finally:
+        connection.close()
+
+
+def load_runs(db_path: Path, since: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Return recorded runs, oldest first."""
+    connection = connect(db_path)
+    connection.row_factory = sqlite3.Row
+    try:
+        query = "SELECT * FROM runs"
+        params: Sequence[Any] = ()
+        if since is not None:
+            query += " WHERE timestamp >= ?"
+            params = (since,)
+        rows = connection.execute(query + " ORDER BY timestamp, id", params).fetchall()
+    finally:
+        connection.close()
+
+    runs = []
+    for row in rows:
+        run = dict(row)
+        run["phases"] = json.loads(run["phases"])
+        run["counters"] = json.loads(run["counters"])
+        runs.append(run)
+    return runs
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Return the pct-th percentile of values (nearest rank)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def cache_hit_rates(counters: Dict[str, int]) -> Dict[str, float]:
+    """Return {cache: hit rate} for every <cache>_hits/<cache>_misses counter pair."""
+    rates = {}
+    for key, hits in counters.items():
+        if not key.endswith("_hits"):
+            continue
+        name = key[:-len("_hits")]
+        total = hits + counters.get(f"{name}_misses", 0)
+        if total:
+            rates[name] = hits / total
+    return rates
+
+
+def format_stats_report(runs: List[Dict[str, Any]], buckets: int = 4) -> str:
+    """Summarize latency percentiles, per-phase costs and trends over time."""
+    if not runs:
+        return "No runs recorded yet."
+
+    def fmt_time(ts: float) -> str:
+        return time.strftime("%Y-%m-%d %H:%M", time.localtime(ts))
+
+    totals = [run["total_ms"] for run in runs]
+    lines = [
+        "Performance Trend Report",
+        "=" * 50,
+        f"Runs: {len(runs)} ({fmt_time(runs[0]['timestamp'])} .. {fmt_time(runs[-1]['timestamp'])})",
+        "",
+        "Latency (ms):",
+        f"   • p50: {percentile(totals, 50):.1f}   p90: {percentile(totals, 90):.1f}"
+        f"   p99: {percentile(totals, 99):.1f}   max: {max(totals):.1f}",
+    ]
+
+    phase_names = sorted({name for run in runs for name in run["phases"]})
+    if phase_names:
+        lines += ["", "Phases (ms):"]
+        for name in phase_names:
+            values = [run["phases"][name] for run in runs if name in run["phases"]]
+            lines.append(f"   • {name:<12} p50: {percentile(values, 50):8.1f}   p90: {percentile(values, 90):8.1f}")
+
+    rates: Dict[str, List[float]] = {}
+    for run in runs:
+        for name, rate in cache_hit_rates(run["counters"]).items():
+            rates.setdefault(name, []).append(rate)
+    if rates:
+        lines += ["", "Cache hit rates (mean):"]
+        for name in sorted(rates):
+            lines.append(f"   • {name}: {100 * sum(rates[name]) / len(rates[name]):.1f}%")
+
+    # Trend: split runs into chronological buckets
+    size = max(1, -(-len(runs) // buckets))
+    lines += ["", "Trend:", f"   {'period starting':<17} {'runs':>5} {'p50 ms':>9} {'p90 ms':>9} {'components':>11} {'dirs':>9}"]
+    chunks = [runs[i:i + size] for i in range(0, len(runs), size)]
+    for chunk in chunks:
+        chunk_totals = [run["total_ms"] for run in chunk]
+        lines.append(
+            f"   {fmt_time(chunk[0]['timestamp']):<17} {len(chunk):>5} {percentile(chunk_totals, 50):>9.1f}"
+            f" {percentile(chunk_totals, 90):>9.1f} {chunk[-1]['components_found']:>11} {chunk[-1]['directories_scanned']:>9}"
+        )
+
+    if len(chunks) > 1:
+        first = percentile([run["total_ms"] for run in chunks[0]], 50)
+        last = percentile([run["total_ms"] for run in chunks[-1]], 50)
+        first_dirs = chunks[0][-1]["directories_scanned"] or 1
+        last_dirs = chunks[-1][-1]["directories_scanned"]
+        if first:
+            lines.append("")
+            lines.append(
+                f"Median latency changed {100 * (last - first) / first:+.1f}% while directories "
+                f"changed {100 * (last_dirs - first_dirs) / first_dirs:+.1f}%"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,251 @@
+"""
+Streaming validation for dir-checker (``--stream``).
+
+The plain validator walks the whole tree, validates it and reports all
+findings at the end. The streaming validator runs three stages connected by
+bounded queues instead:
+
+    walker     walks the directories above the units (one level above the
+               components, e.g. ``module/service``), then each unit subtree
+               in turn, and puts every subtree on the work queue
+    workers    validate the directories of a subtree and put its findings
+               and statistics on the result queue
+    reporter   (the calling thread) prints findings as they arrive and only
+               keeps their counts
+
+A full queue blocks the stage feeding it, so a slow terminal slows the
+workers and slow workers slow the walker: memory stays bounded by the queue
+sizes and the size of one unit, whatever the size of the repository, and
+the first error is printed while the walk is still running. Findings are
+not collected in ``errors``; the statistics, the number of findings per
+level and the exit code are the same as for a plain run.
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from dir_checker.main import ResultReporter, RepositoryValidator, ValidationError
+from dir_checker.tree import FLAG_CYCLE, FLAG_MOUNT, FLAG_SYMLINK, TreeNode
+
+# Subtrees in flight between the walker and the workers, and result batches
+# between the workers and the reporter
+QUEUE_SIZE = 64
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+class StreamingReporter(ResultReporter):
+    """
+    Prints findings as they arrive and keeps only their counts.
+    
+    With group_messages, the first finding of each message is printed when it
+    arrives and the number of other paths with that message at the end.
+    """
+
+    def __init__(self, *args, show_optional: bool = True, show_info: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.visible = {"ERROR", "WARNING"}
+        if show_optional:
+            self.visible.add("OPTIONAL_WARNING")
+        if show_info:
+            self.visible.add("INFO")
+        self.counts: Dict[str, int] = {}
+        self.shown: Dict[str, int] = {}
+        # Other findings per (level, message) after the first, and whether it was printed
+        self.repeats: Dict[Tuple[str, str], int] = {}
+        self.printed: Set[Tuple[str, str]] = set()
+
+    def add(self, findings: List[ValidationError]) -> None:
+        """Count a batch of findings and print the visible ones right away."""
+        lines = []
+        for finding in findings:
+            level = finding.level
+            self.counts[level] = self.counts.get(level, 0) + 1
+            if level not in self.visible:
+                continue
+            if self.group_messages:
+                key = (level, finding.message)
+                if key in self.repeats:
+                    self.repeats[key] += 1
+                    continue
+                self.repeats[key] = 0
+            shown = self.shown.get(level, 0)
+            if self.max_per_section and shown >= self.max_per_section:
+                continue
+            self.shown[level] = shown + 1
+            if self.group_messages:
+                self.printed.add((level, finding.message))
+            lines.extend(self.format_findings([finding]))
+        if lines:
+            self.write_lines(lines)
+            self.stream.flush()
+
+    def finish(self, stats: Dict[str, int]) -> None:
+        """Print the statistics, the summary and the final status."""
+        lines = [f"{self.prefix(level)}{message} ({count} more path(s))"
+                 for (level, message), count in self.repeats.items() if count and (level, message) in self.printed]
+        lines += self.summary_lines(self.counts, stats)
+        for level in ("ERROR", "WARNING", "OPTIONAL_WARNING", "INFO"):
+            if self.group_messages:
+                hidden = sum(1 for group in self.repeats if group[0] == level) - self.shown.get(level, 0)
+            else:
+                hidden = self.counts.get(level, 0) - self.shown.get(level, 0)
+            if hidden and level in self.visible:
+                lines.append(f"   ... {hidden} {level.lower()} finding(s) not shown "
+                             f"(raise max_findings_per_section to see them)")
+        lines.append(self.status_line(self.counts))
+        self.write_lines(lines)
+        self.stream.flush()
+
+
+class StreamingValidator(RepositoryValidator):
+    """A validator that walks, validates and reports in a pipeline of threads."""
+
+    def __init__(self, *args, workers: Optional[int] = None, stream: Any = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.workers = max(1, workers or DEFAULT_WORKERS)
+        self.stream = stream if stream is not None else sys.stdout
+        self.counts: Optional[Dict[str, int]] = None
+
+    def unit_depth(self) -> int:
+        """Depth of the subtrees handed to the workers: the directories holding components."""
+        return max(1, self.config.max_depth - 1)
+
+    def iter_work(self) -> Iterator[List[Tuple[TreeNode, tuple]]]:
+        """
+        Yield the directories to validate, one batch per unit subtree, as the walk finds them.
+
+        The levels above the units are listed one directory at a time, so only
+        the directories still to be listed are held, never all units at once.
+        Each listed directory is a batch of its own, together with the units
+        below it that the walk does not descend into.
+        """
+        depth = self.unit_depth()
+        pending = [()]
+        while pending:
+            parts = pending.pop()
+            batch, children = [], []
+            for path, child in self.iter_directories(self.root_path.joinpath(*parts), include_start=True,
+                                                     stop_depth=len(parts) + 1):
+                if child == parts:
+                    batch.append((path, parts))
+                # Units the walk did not descend into are reported from here
+                elif path.flags & (FLAG_SYMLINK | FLAG_CYCLE | FLAG_MOUNT):
+                    batch.append((path, child))
+                else:
+                    children.append(child)
+            if batch:
+                yield batch
+            if len(parts) + 1 < depth:
+                # Depth first, in name order
+                pending.extend(reversed(children))
+                continue
+            for child in children:
+                yield list(self.iter_directories(self.root_path.joinpath(*child), include_start=True))
+
+    def new_worker(self) -> RepositoryValidator:
+        """Return the validator of one worker (findings are collected per worker)."""
+        return RepositoryValidator(self.config, self.verbose, self.strict, base_dir=self.base_dir,
+                                   compiled=self.compiled, quiet=self.quiet)
+
+    def validate(self) -> int:
+        config = self.config
+        # Sparse checkouts and symlink cycle detection need the whole walk
+        if (not config.max_depth or config.sparse_mode != "off" or config.follow_symlinks
+                or not self.root_path.exists()):
+            return super().validate()
+
+        self.log("Starting repository structure validation...")
+        self.log(f"Validating directory structure in: {self.root_path} ({self.workers} worker(s))")
+        color = {"always": True, "never": False}.get(config.color.lower())
+        reporter = StreamingReporter(
+            self.stream, color=color, max_per_section=config.max_findings_per_section,
+            group_messages=config.group_messages,
+            show_optional=self.should_show_message("warn") or self.verbose,
+            show_info=self.should_show_message("info") or self.verbose,
+        )
+        baseline = self.load_baseline()
+        suppressed = 0
+        started = time.perf_counter()
+
+        work: queue.Queue = queue.Queue(QUEUE_SIZE)
+        results: queue.Queue = queue.Queue(QUEUE_SIZE)
+        failures: List[BaseException] = []
+
+        def walker() -> None:
+            try:
+                for batch in self.iter_work():
+                    work.put(batch)
+            except BaseException as e:
+                failures.append(e)
+            finally:
+                for _ in range(self.workers):
+                    work.put(None)
+
+        def worker() -> None:
+            validator = self.new_worker()
+            try:
+                while True:
+                    batch = work.get()
+                    if batch is None:
+                        break
+                    validator.batch_level_values(parts for _, parts in batch)
+                    stats_before = dict(validator.stats)
+                    for path, parts in batch:
+                        validator.validate_directory(path, parts)
+                    stats = {name: value - stats_before[name] for name, value in validator.stats.items()}
+                    results.put((validator.errors, stats))
+                    validator.errors = []
+            except BaseException as e:
+                failures.append(e)
+                # Keep draining so that the walker is never blocked on a full queue
+                while work.get() is not None:
+                    pass
+            finally:
+                results.put(None)
+
+        threads = [threading.Thread(target=walker, name="dir-checker-walker", daemon=True)]
+        threads += [threading.Thread(target=worker, name=f"dir-checker-worker-{i}", daemon=True)
+                    for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        running = self.workers
+        while running:
+            item = results.get()
+            if item is None:
+                running -= 1
+                continue
+            findings, stats = item
+            for name, value in stats.items():
+                self.stats[name] += value
+            if baseline is not None:
+                findings, batch_suppressed = baseline.filter(findings)
+                suppressed += batch_suppressed
+            if findings and "first_finding" not in self.timings:
+                self.timings["first_finding"] = (time.perf_counter() - started) * 1000
+            reporter.add(findings)
+        for thread in threads:
+            thread.join()
+        self.timings["walk"] = (time.perf_counter() - started) * 1000
+        if failures:
+            self.log(f"Validation failed with exception: {failures[0]}", "ERROR")
+            return 1
+
+        if baseline is not None:
+            self.report_stale_baseline(baseline, suppressed, self.stream)
+            reporter.add(self.errors)
+            self.errors = []
+        with self.timed("report"):
+            reporter.finish(self.stats)
+        self.counts = reporter.counts
+        return self.exit_code()
+
+    def level_counts(self) -> Dict[str, int]:
+        if self.counts is None:
+            return super().level_counts()
+        return dict(self.counts)
@@ -0,0 +1,125 @@
+"""
+Layout generation for dir-checker (``--scaffold``).
+
+Materializes a directory tree that satisfies a configuration: every
+combination of the levels' valid_values becomes a component with all
+mandatory files. Literal values are used as they are; "*" and glob values are
+expanded into ``count`` generated names each (``component-1``, ``svc-component-1``
+for ``svc-*``, ...), which also makes this a fast generator of large fixture
+trees for performance testing.
+
+Only leaf directories are passed to ``os.makedirs`` (parents are created
+implicitly), in batches across worker threads, and files are created sparse:
+templates from ``fix_templates_dir`` are rendered when present, otherwise the
+file is only truncated to the requested size without writing any data.
+"""
+
+import itertools
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from dir_checker.main import LevelMatcher, StructureConfig
+from dir_checker.fix import render, template_variables
+
+BATCH_SIZE = 512
+
+
+def level_names(level: str, valid_values: Optional[List[str]], count: int) -> List[str]:
+    """Return the directory names to generate for one level."""
+    if not valid_values:
+        valid_values = ["*"]
+    matcher = LevelMatcher(valid_values)
+    width = len(str(count))
+    names = []
+    for value in valid_values:
+        if "*" not in value:
+            names.append(value)
+            continue
+        for i in range(1, count + 1):
+            name = value.replace("*", f"{level}-{i:0{width}d}", 1).replace("*", "")
+            if matcher(name):
+                names.append(name)
+    return list(dict.fromkeys(names))
+
+
+def iter_components(config: StructureConfig, count: int = 1) -> Iterator[Tuple[str, ...]]:
+    """Yield the parts of every component of the generated layout."""
+    depth = config.max_depth or len(config.levels)
+    levels = [config.levels[i] if i < len(config.levels) else f"level{i + 1}" for i in range(depth)]
+    names = [level_names(level, config.valid_values.get(level), count) for level in levels]
+    return itertools.product(*names)
+
+
+class Scaffolder:
+    """Creates the components of a layout under a target directory."""
+
+    def __init__(self, config: StructureConfig, target: Path, file_size: int = 0,
+                 templates_dir: Optional[Path] = None):
+        self.config = config
+        self.root_path = Path(target) / config.root_dir
+        self.file_size = file_size
+        self.templates = {}
+        if templates_dir is not None:
+            for name in config.mandatory_files:
+                try:
+                    self.templates[name] = (templates_dir / name).read_text()
+                except (OSError, UnicodeDecodeError):
+                    pass
+        # Directories each component needs besides itself (for nested mandatory files)
+        self.subdirs = sorted({os.path.dirname(name) for name in config.mandatory_files} - {""})
+
+    def create_batch(self, batch: List[Tuple[str, ...]]) -> Tuple[int, int]:
+        """Create a batch of components; return (components, files) created."""
+        config = self.config
+        root = os.fspath(self.root_path)
+        created_files = 0
+        for parts in batch:
+            component = os.path.join(root, *parts)
+            os.makedirs(component, exist_ok=True)
+            for subdir in self.subdirs:
+                os.makedirs(os.path.join(component, subdir), exist_ok=True)
+            for name in config.mandatory_files:
+                try:
+                    fd = os.open(os.path.join(component, name), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+                except FileExistsError:
+                    continue
+                try:
+                    template = self.templates.get(name)
+                    if template is not None:
+                        os.write(fd, render(template, template_variables(config, parts, name)).encode())
+                    elif self.file_size:
+                        os.ftruncate(fd, self.file_size)  # Sparse: no data blocks are written
+                finally:
+                    os.close(fd)
+                created_files += 1
+        return len(batch), created_files
+
+    def run(self, components: Iterator[Tuple[str, ...]],
+            max_workers: Optional[int] = None) -> Tuple[int, int]:
+        """Create all components in batches across worker threads; return (components, files)."""
+        batches = iter(lambda: list(itertools.islice(components, BATCH_SIZE)), [])
+        max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        total_components = total_files = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Keep a bounded number of batches in flight so huge layouts are
+            # never materialized in memory at once
+            in_flight = 2 * max_workers
+            pending: deque = deque()
+            for batch in itertools.chain(batches, [None]):
+                if batch is not None:
+                    pending.append(executor.submit(self.create_batch, batch))
+                while pending and (batch is None or len(pending) >= in_flight):
+                    created_components, created_files = pending.popleft().result()
+                    total_components += created_components
+                    total_files += created_files
+        return total_components, total_files
+
+
+def scaffold(config: StructureConfig, target: Path, count: int = 1, file_size: int = 0,
+             templates_dir: Optional[Path] = None, max_workers: Optional[int] = None) -> Tuple[int, int]:
+    """Generate a layout satisfying config under target; return (components, files) created."""
+    scaffolder = Scaffolder(config, target, file_size, templates_dir)
+    return scaffolder.run(iter_components(config, count), max_workers)
@@ -0,0 +1,377 @@
+"""
+Load and soak testing for dir-checker (``python -m dir_checker.soak``).
+
+Pre-commit hooks often run many at a time: on shared build hosts and in
+several worktrees of one repository, all reading the same tree and writing
+the same caches. The soak harness reproduces that. It generates a tree (see
+scaffold.py) and keeps ``processes`` concurrent ``python -m dir_checker`` runs
+going for ``duration`` seconds while a mutator thread removes and restores
+mandatory files, rewrites them and adds and removes subdirectories.
+
+It reports latency percentiles, throughput and the peak RSS of the runs
+(from ``os.wait4``), and checks that
+
+    * every run during the churn completed and printed its results,
+    * once the tree is restored, concurrent runs print exactly the findings
+      and statistics of a plain run (no stale results were kept by the
+      shared cache or index), and
+    * the component index and every cache entry can still be read.
+
+``--mode`` selects what the runs share: nothing (plain), a component index
+(index), a cache directory in a git repository (cache), or nothing but with
+``--stream``. Other arguments are passed to every run. POSIX only.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from dir_checker.main import StructureConfig
+
+MODES = ("plain", "stream", "index", "cache")
+INDEX_FILE = ".dir-checker/index.bin"
+RESULTS_HEADER = "Repository Structure Validation Results"
+# Created by the mutator below components (beyond max_depth)
+EXTRA_DIR = "soak-tmp"
+
+
+@dataclass
+class Run:
+    """One dir-checker process."""
+
+    phase: str
+    latency_ms: float
+    exit_code: int
+    max_rss_kb: int
+    output: str
+
+    @property
+    def complete(self) -> bool:
+        """Whether the run exited normally after printing its results."""
+        return self.exit_code in (0, 1) and RESULTS_HEADER in self.output and "Traceback" not in self.output
+
+
+def soak_config() -> StructureConfig:
+    """Return the configuration of generated trees."""
+    return StructureConfig(
+        root_dir="src",
+        levels=["module", "service", "component"],
+        max_depth=3,
+        check_depth=True,
+        valid_values={"module": ["frontend", "backend", "shared"], "service": ["svc-*"], "component": ["*"]},
+        mandatory_files=["index.js", "package.json"],
+        optional_files=["README.md"],
+        respect_gitignore=False,
+    )
+
+
+def generate_tree(target: Path, config: StructureConfig, components: int) -> List[Tuple[str, ...]]:
+    """Create a tree of about `components` valid components and a few invalid ones; return all components."""
+    from dir_checker.scaffold import iter_components, scaffold
+
+    modules = len(config.valid_values["module"])
+    count = max(1, math.ceil(math.sqrt(components / modules)))
+    scaffold(config, target, count=count)
+    generated = list(iter_components(config, count))
+    # Known violations, so that every run has findings to compare
+    for parts in (("legacy", "svc-old", "api"), ("frontend", "billing", "api")):
+        component = target.joinpath(config.root_dir, *parts)
+        component.mkdir(parents=True, exist_ok=True)
+        (component / "index.js").touch()
+    (target / "dir-checker-config.json").write_text(json.dumps(asdict(config), indent=2, default=sorted))
+    # Like a checkout made earlier: recent directories are never cached or indexed
+    past = time.time() - 60
+    for directory, _, _ in os.walk(target / config.root_dir):
+        os.utime(directory, (past, past))
+    return generated
+
+
+def init_git(target: Path) -> None:
+    """Commit the generated tree, so that cache keys (git tree ids) exist."""
+    git = ["git", "-c", "user.name=dir-checker", "-c", "user.email=dir-checker@localhost"]
+    for command in (["init", "-q"], ["add", "-A"], ["commit", "-q", "-m", "Generated tree"]):
+        subprocess.run(git + command, cwd=target, check=True, stdout=subprocess.DEVNULL)
+
+
+class Mutator:
+    """Changes random components of a tree and restores them afterwards."""
+
+    def __init__(self, root_path: Path, components: Sequence[Tuple[str, ...]],
+                 mandatory_files: List[str], seed: int = 0):
+        self.root_path = root_path
+        self.components = components
+        self.mandatory_files = mandatory_files
+        self.random = random.Random(seed)
+        self.touched: set = set()
+        self.mutations = 0
+
+    def step(self) -> None:
+        """Apply one change: toggle a mandatory file or the extra subdirectory, or rewrite a file."""
+        parts = self.random.choice(self.components)
+        component = self.root_path.joinpath(*parts)
+        self.touched.add(parts)
+        action = self.random.randrange(3)
+        if action == 0:
+            path = component / self.random.choice(self.mandatory_files)
+            if path.exists():
+                path.unlink()
+            else:
+                path.touch()
+        elif action == 1:
+            extra = component / EXTRA_DIR
+            if extra.is_dir():
+                shutil.rmtree(extra)
+            else:
+                # Not empty: git (and so the cache) does not see empty directories
+                extra.mkdir()
+                (extra / "index.js").touch()
+        else:
+            path = component / self.random.choice(self.mandatory_files)
+            path.write_bytes(b"")  # Same (empty) content, new mtime
+        self.mutations += 1
+
+    def run(self, stop: threading.Event, interval: float) -> None:
+        while not stop.is_set():
+            self.step()
+            stop.wait(interval)
+
+    def restore(self) -> None:
+        """Undo every change: all mandatory files present, no extra subdirectories."""
+        for parts in self.touched:
+            component = self.root_path.joinpath(*parts)
+            for name in self.mandatory_files:
+                (component / name).touch()
+            shutil.rmtree(component / EXTRA_DIR, ignore_errors=True)
+        self.touched.clear()
+
+
+def run_once(command: List[str], cwd: Path, env: Dict[str, str], phase: str) -> Run:
+    """Run dir-checker once and measure it."""
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = process.stdout.read()
+    process.stdout.close()
+    # wait4 instead of wait: it returns the child's resource usage
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    latency_ms = (time.perf_counter() - started) * 1000
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    max_rss_kb = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return Run(phase, latency_ms, process.returncode, max_rss_kb, output.decode("utf-8", "replace"))
+
+
+def result_lines(output: str) -> List[str]:
+    """Return the findings and statistics of a run's output, sorted (section headers differ with --stream)."""
+    return sorted(line for line in output.splitlines() if line.startswith("   "))
+
+
+def check_index(path: Path) -> List[str]:
+    """Return the problems found reading every record and finding of a component index."""
+    from dir_checker.index import ComponentIndex
+
+    index = ComponentIndex.open(path)
+    if index is None:
+        return [f"component index {path} is missing or corrupt"]
+    try:
+        keys = []
+        for i in range(index.record_count):
+            keys.append(index.key(i))
+            record = index.record(i)
+            list(index.findings(record[7], record[8]))
+        if keys != sorted(keys):
+            return [f"component index {path} records are not sorted"]
+    except Exception as e:
+        return [f"component index {path} cannot be decoded: {e}"]
+    finally:
+        index.close()
+    return []
+
+
+def check_cache(directory: Path) -> Tuple[int, List[str]]:
+    """Return the number of cache entries and the problems found reading each of them."""
+    from dir_checker.cache import LocalDirectoryCache
+
+    backend = LocalDirectoryCache(directory)
+    entries = corrupt = leftover = 0
+    for _, _, path in backend.entries():
+        name = os.path.basename(path)
+        if name.startswith(".tmp-"):
+            leftover += 1
+        elif backend.get(name) is None:
+            corrupt += 1
+        else:
+            entries += 1
+    problems = []
+    if corrupt:
+        problems.append(f"{corrupt} corrupt cache entry(ies)")
+    if leftover:
+        problems.append(f"{leftover} temporary cache file(s) left behind")
+    return entries, problems
+
+
+class SoakTest:
+    """Runs concurrent dir-checker processes against a changing tree."""
+
+    def __init__(self, target: Path, mode: str = "plain", processes: int = 4, duration: float = 10.0,
+                 components: int = 1000, interval: float = 0.02, seed: int = 0,
+                 extra_args: Optional[List[str]] = None):
+        self.target = Path(target)
+        self.repo = self.target / "repo"
+        self.cache_dir = self.target / "cache"
+        self.mode = mode
+        self.processes = processes
+        self.duration = duration
+        self.components = components
+        self.interval = interval
+        self.seed = seed
+        self.extra_args = list(extra_args or [])
+        self.config = soak_config()
+        self.runs: List[Run] = []
+        self.problems: List[str] = []
+        self.mutations = 0
+        self.elapsed = 0.0
+        self.cache_entries = 0
+        self.env = dict(os.environ)
+        # Children import the same dir_checker as this process
+        package_dir = str(Path(__file__).resolve().parent.parent)
+        self.env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_dir, self.env.get("PYTHONPATH")]))
+        self._lock = threading.Lock()
+
+    def command(self, plain: bool = False) -> List[str]:
+        command = [sys.executable, "-m", "dir_checker", "--config", "dir-checker-config.json"]
+        if not plain:
+            command += {"plain": [], "stream": ["--stream"], "index": ["--index-file", INDEX_FILE],
+                        "cache": ["--cache-dir", str(self.cache_dir)]}[self.mode]
+        return command + self.extra_args
+
+    def run_concurrently(self, phase: str, deadline: Optional[float] = None) -> List[Run]:
+        """Keep `processes` runs going until the deadline (or run each once without one)."""
+        runs: List[Run] = []
+
+        def runner() -> None:
+            while True:
+                run = run_once(self.command(), self.repo, self.env, phase)
+                with self._lock:
+                    runs.append(run)
+                if deadline is None or time.perf_counter() >= deadline:
+                    break
+
+        threads = [threading.Thread(target=runner, name=f"dir-checker-soak-{i}") for i in range(self.processes)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return runs
+
+    def run(self) -> int:
+        components = generate_tree(self.repo, self.config, self.components)
+        if self.mode == "cache":
+            init_git(self.repo)
+        reference = run_once(self.command(plain=True), self.repo, self.env, "reference")
+        if not reference.complete:
+            self.problems.append(f"reference run failed:\n{reference.output}")
+            return 1
+
+        mutator = Mutator(self.repo / self.config.root_dir, components, self.config.mandatory_files, self.seed)
+        stop = threading.Event()
+        mutator_thread = threading.Thread(target=mutator.run, args=(stop, self.interval), name="dir-checker-mutator")
+        started = time.perf_counter()
+        mutator_thread.start()
+        try:
+            churn = self.run_concurrently("churn", started + self.duration)
+        finally:
+            stop.set()
+            mutator_thread.join()
+        self.elapsed = time.perf_counter() - started
+        self.mutations = mutator.mutations
+        mutator.restore()
+
+        # All processes at once on the restored tree: shared state must not leak stale results
+        settled = self.run_concurrently("settled")
+        self.runs = churn + settled
+
+        failed = [run for run in self.runs if not run.complete]
+        if failed:
+            self.problems.append(f"{len(failed)} run(s) did not complete, e.g.:\n{failed[0].output[-2000:]}")
+        expected = (reference.exit_code, result_lines(reference.output))
+        stale = [run for run in settled if (run.exit_code, result_lines(run.output)) != expected]
+        if stale:
+            self.problems.append(f"{len(stale)} of {len(settled)} run(s) on the restored tree differ from a plain run")
+        if self.mode == "index":
+            self.problems += check_index(self.repo / INDEX_FILE)
+        elif self.mode == "cache":
+            self.cache_entries, problems = check_cache(self.cache_dir)
+            self.problems += problems
+        return 1 if self.problems else 0
+
+    def format_report(self) -> str:
+        """Return the latency, throughput, memory and consistency report."""
+        from dir_checker.metrics import percentile
+
+        churn = [run for run in self.runs if run.phase == "churn"]
+        latencies = [run.latency_ms for run in self.runs]
+        rss_mb = [run.max_rss_kb / 1024 for run in self.runs]
+        throughput = len(churn) / self.elapsed if self.elapsed else 0.0
+        lines = [
+            "Soak Test",
+            "=" * 50,
+            f"   mode: {self.mode}, processes: {self.processes}, duration: {self.duration:g}s, "
+            f"components: {self.components}",
+            f"   runs: {len(self.runs)} ({throughput:.1f}/s during churn), mutations: {self.mutations}",
+            f"   latency ms: p50 {percentile(latencies, 50):.0f}, p90 {percentile(latencies, 90):.0f}, "
+            f"p99 {percentile(latencies, 99):.0f}, max {max(latencies, default=0):.0f}",
+            f"   peak RSS MB: p50 {percentile(rss_mb, 50):.1f}, max {max(rss_mb, default=0):.1f}",
+        ]
+        if self.mode == "cache":
+            lines.append(f"   cache entries: {self.cache_entries}")
+        lines += [f"   ❌ {problem}" for problem in self.problems]
+        lines.append("\n✅ All runs completed and matched a plain run." if not self.problems
+                     else "\n❌ Soak test failed.")
+        return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m dir_checker.soak",
+        description="Run concurrent dir-checker processes against a changing generated tree",
+        epilog="Other arguments are passed to every dir-checker run.",
+    )
+    parser.add_argument("--processes", "-n", type=int, default=4, help="Concurrent runs (default: 4)")
+    parser.add_argument("--duration", type=float, default=10.0, metavar="SECONDS",
+                        help="How long to keep changing the tree (default: 10)")
+    parser.add_argument("--components", type=int, default=1000, metavar="N",
+                        help="Approximate number of generated components (default: 1000)")
+    parser.add_argument("--mode", choices=MODES, default="plain",
+                        help="What the runs share: nothing, --stream, a component index or a cache directory")
+    parser.add_argument("--interval", type=float, default=20.0, metavar="MS",
+                        help="Pause between two changes of the tree (default: 20)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the changes (default: 0)")
+    parser.add_argument("--target", type=str, metavar="DIR",
+                        help="Generate the tree under DIR and keep it (default: a temporary directory)")
+    args, extra_args = parser.parse_known_args(argv)
+
+    target = Path(args.target) if args.target else Path(tempfile.mkdtemp(prefix="dir-checker-soak-"))
+    soak = SoakTest(target, args.mode, max(1, args.processes), args.duration, args.components,
+                    args.interval / 1000, args.seed, extra_args)
+    try:
+        exit_code = soak.run()
+        print(soak.format_report())
+    finally:
+        if not args.target:
+            shutil.rmtree(target, ignore_errors=True)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Sparse-checkout and partial-clone support for dir-checker.
+
+In a sparse checkout most of root_dir is not on disk, and components that are
+only partly materialized look like they are missing mandatory files. This
+module reads the git index (``git ls-files -t``) and the sparse-checkout cone
+to tell which components are fully checked out, and which files every
+component has according to the index.
+
+Only the index and the sparse-checkout file are read: no tree or blob objects
+are accessed, so no fetch is ever triggered in a partial clone.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+SPARSE_MODES = ("off", "skip", "index")
+
+
+def run_git(args: List[str], cwd: Path) -> Optional[str]:
+    """Run a read-only git command, returning its stdout or None on failure."""
+    env = dict(os.environ, GIT_NO_LAZY_FETCH="1", GIT_OPTIONAL_LOCKS="0")
+    try:
+        completed = subprocess.run(
+            ["git", *args], cwd=cwd, env=env,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.decode("utf-8", "surrogateescape")
+
+
+class SparseState:
+    """Per-component view of the git index for a sparse checkout."""
+
+    def __init__(self, cone_dirs: Optional[List[tuple]] = None):
+        # Recursive cone directories relative to root_dir (None when not in cone mode)
+        self.cone_dirs = cone_dirs
+        # Component parts -> names of the files under it in the index
+        # (relative to the component, '/'-separated)
+        self.files: Dict[tuple, Set[str]] = {}
+        # Components with at least one skip-worktree entry
+        self.partial: Set[tuple] = set()
+        # Sparse directory entries (unexpanded sparse index) relative to root_dir
+        self.sparse_dirs: List[tuple] = []
+
+    def in_cone(self, parts: tuple) -> bool:
+        """Whether a directory is inside a recursive cone directory (always fully checked out)."""
+        if self.cone_dirs is None:
+            return False
+        return any(parts[:len(cone)] == cone for cone in self.cone_dirs)
+
+    def is_partial(self, parts: tuple) -> bool:
+        """Whether a component is not fully checked out."""
+        if parts in self.partial:
+            return True
+        return any(parts[:len(sparse)] == sparse for sparse in self.sparse_dirs)
+
+    def index_names(self, parts: tuple) -> Set[str]:
+        """Return the names the index has for a component."""
+        return self.files.get(parts, set())
+
+
+def load_sparse_state(base_dir: Path, root_dir: str, max_depth: int) -> Optional[SparseState]:
+    """Read the sparse state of the repository at base_dir, or None if it is not a sparse checkout."""
+    enabled = run_git(["config", "--bool", "core.sparseCheckout"], base_dir)
+    if enabled is None or enabled.strip() != "true":
+        return None
+
+    root = Path(root_dir).as_posix().strip("/")
+    root_parts = len(Path(root).parts) if root not in ("", ".") else 0
+
+    cone_dirs = None
+    cone = run_git(["config", "--bool", "core.sparseCheckoutCone"], base_dir)
+    if cone is not None and cone.strip() == "true":
+        listing = run_git(["sparse-checkout", "list"], base_dir)
+        if listing is not None:
+            root_prefix = tuple(Path(root).parts[:root_parts])
+            cone_dirs = []
+            for line in listing.splitlines():
+                parts = tuple(part for part in line.strip().split("/") if part)
+                if parts[:root_parts] == root_prefix:
+                    cone_dirs.append(parts[root_parts:])
+                elif root_prefix[:len(parts)] == parts:
+                    cone_dirs.append(())  # root_dir itself is inside the cone
+    state = SparseState(cone_dirs)
+
+    # --sparse keeps sparse directory entries collapsed instead of expanding
+    # them from tree objects; older git versions do not know the flag
+    pathspec = root or "."
+    output = run_git(["ls-files", "-t", "-z", "--sparse", "--", pathspec], base_dir)
+    if output is None:
+        output = run_git(["ls-files", "-t", "-z", "--", pathspec], base_dir)
+    if output is None:
+        return None
+
+    in_cone: Dict[tuple, bool] = {}
+    for record in output.split("\0"):
+        if len(record) < 3:
+            continue
+        tag, path = record[0], record[2:]
+        parts = tuple(path.rstrip("/").split("/"))[root_parts:]
+        if path.endswith("/"):
+            state.sparse_dirs.append(parts)
+            continue
+        if len(parts) <= max_depth:
+            continue
+        component = parts[:max_depth]
+        if tag == "H":
+            # Components inside the cone are fully on disk: the walk sees
+            # their files, so there is no need to keep their index names
+            component_in_cone = in_cone.get(component)
+            if component_in_cone is None:
+                component_in_cone = in_cone[component] = state.in_cone(component)
+            if component_in_cone:
+                continue
+        state.files.setdefault(component, set()).add("/".join(parts[max_depth:]))
+        if tag == "S":
+            state.partial.add(component)
+    return state
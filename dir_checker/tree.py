@@ -0,0 +1,220 @@
+"""
+Compact directory tree model filled by the validator walk.
+
+Directories are stored as nodes in parallel arrays (parent index, interned
+name id, depth, flags) instead of one pathlib.Path per entry. Validators
+address nodes by index and Path objects are only built for nodes that end up
+in a reported finding.
+"""
+
+import os
+from array import array
+from operator import attrgetter
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, List, Optional
+
+# Node flags
+FLAG_DIR = 1
+FLAG_SYMLINK = 2
+FLAG_MARKER = 4  # Directory contains the walk's marker file (e.g. an override file)
+FLAG_CYCLE = 8  # Directory was already walked through another path (symlink loop or duplicate link)
+FLAG_MOUNT = 16  # Directory is on another filesystem than the walk's start
+
+_entry_name = attrgetter("name")
+
+
+class TreeModel:
+    """Directory nodes stored in arrays, rooted at root_dir."""
+
+    def __init__(self, root: Path, prefix: tuple = ()):
+        self.root = root
+        self.root_str = str(root)
+        # Parts (relative to root) of the directory the walk started from
+        self.prefix = prefix
+        self.parent = array("i")
+        self.name_id = array("i")
+        self.depth = array("H")
+        self.flags = array("B")
+        self.names: List[str] = []
+        self.name_ids: Dict[str, int] = {}
+        # Entry names of the directories at the walk's file depth (components)
+        self.entries: Dict[int, FrozenSet[str]] = {}
+        # Node 0 is the start directory itself
+        self.add(-1, "", len(prefix), FLAG_DIR)
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def intern(self, name: str) -> int:
+        """Return the id of a name, adding it to the name table if needed."""
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = self.name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def add(self, parent: int, name: str, depth: int, flags: int) -> int:
+        """Append a node and return its index."""
+        self.parent.append(parent)
+        self.name_id.append(self.intern(name))
+        self.depth.append(depth)
+        self.flags.append(flags)
+        return len(self.parent) - 1
+
+    def name(self, index: int) -> str:
+        """Return the name of a node."""
+        return self.names[self.name_id[index]]
+
+    def parts(self, index: int) -> tuple:
+        """Return the parts of a node relative to root."""
+        names = []
+        parent, name_id, all_names = self.parent, self.name_id, self.names
+        while index > 0:
+            names.append(all_names[name_id[index]])
+            index = parent[index]
+        names.reverse()
+        return self.prefix + tuple(names)
+
+    def os_path(self, index: int) -> str:
+        """Return the filesystem path of a node as a string."""
+        return os.path.join(self.root_str, *self.parts(index))
+
+    def path(self, index: int) -> Path:
+        """Materialize the Path of a node."""
+        return self.root.joinpath(*self.parts(index))
+
+
+class TreeNode:
+    """
+    Lightweight reference to a node, usable wherever a path is expected.
+
+    It supports os.fspath() and str(), and only builds a Path on demand.
+    """
+
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: TreeModel, index: int):
+        self.tree = tree
+        self.index = index
+
+    def __fspath__(self) -> str:
+        return self.tree.os_path(self.index)
+
+    def __str__(self) -> str:
+        return self.tree.os_path(self.index)
+
+    def __repr__(self) -> str:
+        return f"TreeNode({self.tree.os_path(self.index)!r})"
+
+    @property
+    def name(self) -> str:
+        return self.tree.name(self.index)
+
+    @property
+    def flags(self) -> int:
+        return self.tree.flags[self.index]
+
+    @property
+    def has_marker(self) -> Optional[bool]:
+        """Whether the walk saw the marker file in this directory (None if it was not listed)."""
+        flags = self.tree.flags[self.index]
+        if flags & (FLAG_SYMLINK | FLAG_CYCLE | FLAG_MOUNT):
+            return None
+        return bool(flags & FLAG_MARKER)
+
+    @property
+    def entry_names(self) -> Optional[FrozenSet[str]]:
+        """Names of the entries in this directory, if the walk recorded them."""
+        return self.tree.entries.get(self.index)
+
+    def to_path(self) -> Path:
+        """Materialize this node as a Path."""
+        return self.tree.path(self.index)
+
+
+def walk_tree(root: Path, skip_entry: Callable[[str, str, bool], bool],
+              prefix: tuple = (), entries_depth: Optional[int] = None,
+              marker: str = "", follow_symlinks: bool = False,
+              one_filesystem: bool = False, stop_depth: Optional[int] = None) -> TreeModel:
+    """
+    Walk the directories under root/prefix into a TreeModel.
+
+    skip_entry(path_str, name, is_dir) prunes a directory and everything below
+    it. Each directory's children are added in name order. The entry names of
+    directories at entries_depth (relative to root) are recorded so that file
+    checks there need no extra stat calls. Directories containing an entry
+    named marker get FLAG_MARKER.
+
+    Symlinked directories are recorded with FLAG_SYMLINK and only descended
+    into when follow_symlinks is set. In that case (or with one_filesystem)
+    every directory's (st_dev, st_ino) is tracked: a directory reached a
+    second time is recorded with FLAG_CYCLE and not descended into again, and
+    with one_filesystem a directory on another device is recorded with
+    FLAG_MOUNT and not descended into.
+
+    Directories at stop_depth (relative to root) are recorded but not
+    descended into (nor listed), so they can be walked separately later.
+    """
+    tree = TreeModel(root, prefix)
+    start = os.path.join(tree.root_str, *prefix)
+    stack = [(0, start)]
+
+    track_inodes = follow_symlinks or one_filesystem
+    visited = set()
+    root_dev = None
+    if track_inodes:
+        try:
+            start_stat = os.stat(start)
+        except OSError:
+            return tree
+        root_dev = start_stat.st_dev
+        visited.add((start_stat.st_dev, start_stat.st_ino))
+
+    while stack:
+        node, dir_path = stack.pop()
+        depth = tree.depth[node] + 1
+        try:
+            with os.scandir(dir_path) as iterator:
+                entries = sorted(iterator, key=_entry_name)
+        except OSError:
+            continue
+
+        if depth - 1 == entries_depth:
+            tree.entries[node] = frozenset(entry.name for entry in entries)
+
+        children = []
+        for entry in entries:
+            if entry.name == marker:
+                tree.flags[node] |= FLAG_MARKER
+            try:
+                if not entry.is_dir():
+                    continue
+                is_link = entry.is_symlink()
+            except OSError:
+                continue
+            if skip_entry(entry.path, entry.name, True):
+                continue
+
+            flags = FLAG_DIR | (FLAG_SYMLINK if is_link else 0)
+            descend = follow_symlinks or not is_link
+            if descend and track_inodes:
+                try:
+                    entry_stat = entry.stat()
+                except OSError:
+                    continue
+                key = (entry_stat.st_dev, entry_stat.st_ino)
+                if one_filesystem and entry_stat.st_dev != root_dev:
+                    flags |= FLAG_MOUNT
+                    descend = False
+                elif key in visited:
+                    flags |= FLAG_CYCLE
+                    descend = False
+                else:
+                    visited.add(key)
+
+            child = tree.add(node, entry.name, depth, flags)
+            if descend and depth != stop_depth:
+                children.append((child, entry.path))
+        stack.extend(reversed(children))
+
+    return tree
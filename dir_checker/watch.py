@@ -0,0 +1,384 @@
+"""
+Watch mode for dir-checker.
+
+Runs one full validation, then watches root_dir for directory entries being
+created, deleted or renamed and revalidates only the components affected by
+each burst of changes. File contents are never read by the validator, so only
+changes to directory listings are watched, and edits of per-directory
+override files.
+
+Linux uses inotify through ctypes; other platforms (or hosts that run out of
+inotify watches) fall back to polling directory modification times.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from dir_checker.main import RepositoryValidator, ResultReporter, ValidationError
+
+# inotify event flags (from <sys/inotify.h>)
+IN_CLOSE_WRITE = 0x00000008
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_ONLYDIR = 0x01000000
+
+WATCH_MASK = (IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_CLOSE_WRITE |
+              IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+EVENT_HEADER = struct.Struct("iIII")
+
+# Clear the screen and move the cursor home before redrawing
+CLEAR_SCREEN = "\033[H\033[2J"
+
+
+class PollingWatcher:
+    """Detect directory listing changes by polling directory (and override file) modification times."""
+
+    def __init__(self, validator: RepositoryValidator, root: Path, interval: float = 0.5):
+        self.validator = validator
+        self.root = root
+        self.interval = interval
+        self.snapshot = self.take_snapshot()
+
+    def take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Return {directory path: (st_mtime_ns, override file st_mtime_ns or 0)} for every watched directory."""
+        snapshot: Dict[str, Tuple[int, int]] = {}
+        override_file = self.validator.config.override_file
+        stack = [str(self.root)]
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+                override_mtime = 0
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False) and entry.name not in self.validator.compiled.skip_dirs:
+                            stack.append(entry.path)
+                        elif entry.name == override_file:
+                            # Edited in place, an override file leaves the directory mtime alone
+                            override_mtime = entry.stat().st_mtime_ns
+                snapshot[directory] = (mtime, override_mtime)
+            except OSError:
+                continue
+        return snapshot
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Block until at least one directory changed (or timeout) and return the changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self.take_snapshot()
+            changed = {path for path, mtime in snapshot.items() if self.snapshot.get(path) != mtime}
+            changed.update(path for path in self.snapshot if path not in snapshot)
+            self.snapshot = snapshot
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval)
+
+    def close(self) -> None:
+        """Release watcher resources."""
+
+
+class InotifyWatcher:
+    """Detect directory listing changes with Linux inotify."""
+
+    def __init__(self, validator: RepositoryValidator, root: Path):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.validator = validator
+        self.root = root
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: Dict[int, str] = {}
+        try:
+            self.add_tree(str(root))
+        except OSError:
+            self.close()
+            raise
+
+    def add_watch(self, directory: str) -> None:
+        """Watch a single directory."""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            if errno in (2, 20):  # ENOENT, ENOTDIR: removed before we got to it
+                return
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+        self.watches[wd] = directory
+
+    def add_tree(self, top: str) -> None:
+        """Watch a directory and every non-skipped directory below it."""
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            self.add_watch(directory)
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False) and entry.name not in self.validator.compiled.skip_dirs:
+                            stack.append(entry.path)
+            except OSError:
+                continue
+
+    def read_events(self) -> Set[str]:
+        """Drain pending events and return the affected paths."""
+        changed: Set[str] = set()
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    # Events were lost: treat the whole tree as changed
+                    changed.add(str(self.root))
+                    continue
+                directory = self.watches.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self.watches[wd]
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    changed.add(directory)
+                elif mask & IN_ISDIR:
+                    path = os.path.join(directory, name)
+                    changed.add(path)
+                    if mask & (IN_CREATE | IN_MOVED_TO) and name not in self.validator.compiled.skip_dirs:
+                        self.add_tree(path)
+                elif mask & IN_CLOSE_WRITE:
+                    # Of written files, only override files change the results
+                    if name == self.validator.config.override_file:
+                        changed.add(directory)
+                else:
+                    changed.add(directory)
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Block until events arrive (or timeout) and return the affected paths."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        return self.read_events()
+
+    def close(self) -> None:
+        """Release watcher resources."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(validator: RepositoryValidator, root: Path, poll: bool = False, interval: float = 0.5):
+    """Create an inotify watcher when available, otherwise a polling watcher."""
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(validator, root)
+        except (OSError, AttributeError) as e:
+            validator.log(f"inotify unavailable ({e}), falling back to polling", "WARNING")
+    return PollingWatcher(validator, root, interval)
+
+
+class WatchSession:
+    """
+    Keep per-directory validation results and revalidate only what changed.
+
+    Findings and statistics are stored per directory (keyed by its path relative
+    to root_dir), so a change can drop and rebuild the entries of one component
+    without touching the rest of the tree.
+    """
+
+    def __init__(self, validator: RepositoryValidator):
+        self.validator = validator
+        self.root = validator.root_path
+        self.results: Dict[tuple, List[ValidationError]] = {}
+        self.components: Set[tuple] = set()
+        self.global_findings: List[ValidationError] = []
+
+    def validate_one(self, path: Path, parts: tuple) -> None:
+        """Validate a single directory and store its findings."""
+        validator = self.validator
+        validator.errors = []
+        validator.validate_directory(path, parts)
+        self.results[parts] = validator.errors
+        if len(parts) == validator.config.max_depth:
+            self.components.add(parts)
+        validator.errors = []
+
+    def full_scan(self) -> None:
+        """Validate the whole tree from scratch."""
+        self.results.clear()
+        self.components.clear()
+        self.global_findings = []
+        if not self.root.exists():
+            self.global_findings.append(
+                ValidationError("ERROR", f"Root directory '{self.validator.config.root_dir}' not found")
+            )
+            return
+        directories = list(self.validator.iter_directories(self.root))
+        self.validator.batch_level_values(parts for _, parts in directories)
+        for path, parts in directories:
+            self.validate_one(path, parts)
+
+    def drop_subtree(self, parts: tuple) -> None:
+        """Forget results for a directory and everything below it."""
+        size = len(parts)
+        for key in [key for key in self.results if key[:size] == parts]:
+            del self.results[key]
+            self.components.discard(key)
+
+    def rescan_subtree(self, parts: tuple) -> None:
+        """Drop and rebuild the results of a directory subtree."""
+        self.drop_subtree(parts)
+        self.validator.config_resolver.invalidate(parts)
+        path = self.root.joinpath(*parts)
+        if path.is_dir() and not self.validator.should_skip_path(path):
+            for sub_path, sub_parts in self.validator.iter_directories(path, include_start=True):
+                self.validate_one(sub_path, sub_parts)
+
+    def known_children(self, parts: tuple) -> Set[tuple]:
+        """Return the directories currently known directly below parts."""
+        depth = len(parts) + 1
+        return {key for key in self.results if len(key) == depth and key[:-1] == parts}
+
+    def apply_changes(self, changed: Set[str]) -> Set[tuple]:
+        """Revalidate the subtrees affected by changed paths and return their anchors."""
+        root = os.path.abspath(self.root)
+        max_depth = self.validator.config.max_depth
+        anchors: Set[tuple] = set()
+
+        for changed_path in changed:
+            relative = os.path.relpath(os.path.abspath(changed_path), root)
+            if relative == os.curdir:
+                parts: tuple = ()
+            elif relative.startswith(os.pardir):
+                continue
+            else:
+                parts = tuple(Path(relative).parts)
+
+            if len(parts) >= max_depth:
+                # Anything inside a component only affects that component
+                anchors.add(parts[:max_depth])
+                continue
+
+            # An edited override file changes the rules for the whole subtree
+            resolver = self.validator.config_resolver
+            previous = resolver.resolve(parts)
+            resolver.invalidate(parts)
+            if resolver.resolve(parts) != previous:
+                anchors.add(parts)
+                continue
+
+            path = self.root.joinpath(*parts)
+            if path.is_dir() and (not parts or parts in self.results):
+                # Known directory above component level: only its child
+                # directories matter, so diff them against what we know
+                # (skipped ones are never known)
+                skip_entry = self.validator.should_skip_entry
+                try:
+                    with os.scandir(path) as entries:
+                        current = {parts + (entry.name,) for entry in entries
+                                   if entry.is_dir() and not skip_entry(entry.path, entry.name, True)}
+                except OSError:
+                    current = set()
+                anchors.update(self.known_children(parts) ^ current)
+            else:
+                # Directory created or deleted
+                anchors.add(parts)
+
+        # Rescan outermost anchors only
+        for parts in sorted(anchors, key=len):
+            if not any(parts[:len(other)] == other for other in anchors if len(other) < len(parts)):
+                self.rescan_subtree(parts)
+        return anchors
+
+    def findings(self) -> List[ValidationError]:
+        """Return all current findings in walk order, without those recorded in the baseline file."""
+        findings = list(self.global_findings)
+        for key in sorted(self.results):
+            findings.extend(self.results[key])
+        # The baseline is read again on every render, so that edits to it apply
+        baseline = self.validator.load_baseline()
+        if baseline is not None:
+            findings, _ = baseline.filter(findings)
+            findings.extend(self.validator.stale_baseline_findings(baseline))
+        return findings
+
+    def stats(self) -> Dict[str, int]:
+        """Return statistics for the current state of the tree."""
+        return {
+            "components_found": len(self.components),
+            "directories_scanned": len(self.results),
+            "files_checked": len(self.components) * len(self.validator.config.mandatory_files),
+        }
+
+
+def run_watch(validator: RepositoryValidator, poll: bool = False, interval: float = 0.5,
+              debounce: float = 0.02, stream=None) -> int:
+    """Validate once, then revalidate affected components on every change until interrupted."""
+    stream = stream if stream is not None else sys.stdout
+    session = WatchSession(validator)
+    redraw = stream.isatty() if hasattr(stream, "isatty") else False
+
+    def render(note: str) -> None:
+        if redraw:
+            stream.write(CLEAR_SCREEN)
+        color = {"always": True, "never": False}.get(validator.config.color.lower())
+        reporter = ResultReporter(
+            stream=stream,
+            color=color,
+            max_per_section=validator.config.max_findings_per_section,
+            group_messages=validator.config.group_messages,
+        )
+        reporter.report(
+            session.findings(),
+            session.stats(),
+            show_optional=validator.should_show_message("warn") or validator.verbose,
+            show_info=validator.should_show_message("info") or validator.verbose,
+        )
+        stream.write(f"\n[watch] {note} - press Ctrl+C to stop\n")
+        stream.flush()
+
+    started = time.perf_counter()
+    session.full_scan()
+    render(f"full scan in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    watcher = create_watcher(validator, session.root, poll=poll, interval=interval)
+    try:
+        while True:
+            changed = watcher.wait()
+            # Debounce: keep collecting until the burst of changes settles
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            started = time.perf_counter()
+            anchors = session.apply_changes(changed)
+            if anchors:
+                elapsed = (time.perf_counter() - started) * 1000
+                render(f"revalidated {len(anchors)} path(s) in {elapsed:.0f} ms")
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        watcher.close()
@@ -0,0 +1,81 @@
+from pathlib import Path
+
+from dir_checker import StructureConfig, ValidationResult, check, check_many, compile_config
+from dir_checker.main import main
+
+
+def make_repo(base: Path, components, with_files=True):
+    for component in components:
+        path = base / "src" / component
+        path.mkdir(parents=True)
+        if with_files:
+            (path / "index.js").write_text("")
+            (path / "package.json").write_text("{}")
+    return base
+
+
+class TestCheck:
+    """Test the library entry points."""
+
+    def test_check_returns_structured_result(self, tmp_path, capsys):
+        """Test that check validates relative to root and prints nothing."""
+        repo = make_repo(tmp_path / "repo", ["frontend/api/c1"], with_files=False)
+
+        result = check(repo, StructureConfig())
+
+        assert isinstance(result, ValidationResult)
+        assert result.exit_code == 1 and not result.passed
+        assert result.stats["components_found"] == 1
+        assert [f.rule for f in result.errors] == ["missing-mandatory-files"]
+        assert result.errors[0].path == repo / "src" / "frontend" / "api" / "c1"
+        assert len(list(result)) == len(result)
+        assert capsys.readouterr().out == ""
+
+    def test_gitignore_read_from_root(self, tmp_path):
+        """Test that .gitignore is read from the repository, not the working directory."""
+        repo = make_repo(tmp_path / "repo", ["frontend/api/c1"], with_files=False)
+        (repo / ".gitignore").write_text("c1\n")
+
+        result = check(repo, StructureConfig())
+
+        assert result.passed
+        assert result.stats["components_found"] == 0
+
+    def test_gitignore_paths_relative_to_absolute_root(self, tmp_path, monkeypatch):
+        """Test that .gitignore patterns with a slash match below an absolute root like below '.'."""
+        repo = make_repo(tmp_path, ["frontend/api/c1", "legacy/api/c2"])
+        (repo / ".gitignore").write_text("src/legacy\n")
+        monkeypatch.chdir(tmp_path)
+
+        absolute = check(tmp_path.resolve(), StructureConfig())
+        relative = check(".", StructureConfig())
+
+        assert absolute.stats["components_found"] == relative.stats["components_found"] == 1
+        assert absolute.passed
+
+    def test_check_many_shares_compiled_config(self, tmp_path):
+        """Test validating several repositories concurrently with one compiled config."""
+        good = make_repo(tmp_path / "good", ["frontend/api/c1", "backend/web/c2"])
+        bad = make_repo(tmp_path / "bad", ["nope/api/c1"])
+        config = StructureConfig()
+        config.fail_on_invalid_values = True
+        compiled = compile_config(config)
+
+        results = check_many([good, bad, good], compiled, max_workers=3)
+
+        assert [r.root for r in results] == [good, bad, good]
+        assert [r.exit_code for r in results] == [0, 1, 0]
+        assert results[1].errors[0].rule == "invalid-value"
+        assert compiled.level_matchers["module"]("frontend")
+
+    def test_check_applies_cli_baseline(self, tmp_path, monkeypatch):
+        """Test that a baseline written with --write-baseline suppresses the findings of check()."""
+        repo = make_repo(tmp_path / "repo", ["frontend/api/c1", "frontend/api/c2"], with_files=False)
+        monkeypatch.chdir(repo)
+        monkeypatch.setattr("sys.argv", ["dir-checker", "--write-baseline"])
+        assert main() == 0
+        assert "\tsrc/frontend/api/c1\n" in (repo / "dir-checker-baseline.txt").read_text()
+
+        result = check(repo, StructureConfig())
+        assert result.passed
+        assert not any(f.rule == "stale-baseline" for f in result)
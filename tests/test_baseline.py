@@ -0,0 +1,93 @@
+from pathlib import Path
+
+from dir_checker.main import StructureConfig, RepositoryValidator, ValidationError, main
+from dir_checker.baseline import Baseline, BASELINE_HEADER, finding_keys
+
+
+def missing(files, path="src/a/api/c1"):
+    return ValidationError("ERROR", "Missing mandatory files", Path(path),
+                           rule="missing-mandatory-files", subjects=tuple(files))
+
+
+class TestBaseline:
+    """Test baseline recording and filtering."""
+
+    def test_keys_per_subject(self):
+        """Test that each missing file gets its own key."""
+        keys = finding_keys(missing(["index.js", "package.json"]))
+        assert keys == [
+            ("missing-mandatory-files:index.js", "src/a/api/c1"),
+            ("missing-mandatory-files:package.json", "src/a/api/c1"),
+        ]
+
+    def test_filter_known_and_new(self):
+        """Test that only findings with new keys are kept."""
+        baseline = Baseline.from_findings([missing(["index.js"]), missing(["index.js"], "src/a/api/c2")])
+
+        remaining, suppressed = baseline.filter([
+            missing(["index.js"]),
+            missing(["index.js", "package.json"], "src/a/api/c2"),
+            ValidationError("INFO", "Validating component directory", Path("src/a/api/c1")),
+        ])
+
+        assert suppressed == 1
+        assert [f.level for f in remaining] == ["ERROR", "INFO"]
+        assert baseline.stale() == []
+
+    def test_stale_entries(self):
+        """Test reporting entries that no longer match a finding."""
+        baseline = Baseline.from_findings([missing(["index.js"]), missing(["index.js"], "src/a/api/c2")])
+        baseline.filter([missing(["index.js"])])
+
+        assert baseline.stale() == [("missing-mandatory-files:index.js", "src/a/api/c2")]
+
+    def test_save_is_sorted_and_round_trips(self, tmp_path):
+        """Test the on-disk format."""
+        baseline = Baseline.from_findings([missing(["b.js"], "src/z"), missing(["a.js"], "src/a")])
+        baseline_file = tmp_path / "baseline.txt"
+        baseline.save(baseline_file)
+
+        lines = baseline_file.read_text().splitlines()
+        assert lines[0] == BASELINE_HEADER
+        assert lines[1].endswith("\tsrc/a") and lines[2].endswith("\tsrc/z")
+        assert Baseline.load(baseline_file).entries == baseline.entries
+
+
+class TestBaselineIntegration:
+    """Test baseline handling in a full run."""
+
+    def test_write_then_validate(self, tmp_path, monkeypatch):
+        """Test that a written baseline makes the same tree pass, and new violations fail."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "src" / "frontend" / "api" / "c1").mkdir(parents=True)
+
+        monkeypatch.setattr('sys.argv', ['dir-checker', '--write-baseline'])
+        assert main() == 0
+        assert (tmp_path / "dir-checker-baseline.txt").exists()
+
+        assert RepositoryValidator(StructureConfig()).validate() == 0
+
+        (tmp_path / "src" / "frontend" / "api" / "c2").mkdir()
+        validator = RepositoryValidator(StructureConfig())
+        assert validator.validate() == 1
+        errors = [e for e in validator.errors if e.level == "ERROR"]
+        assert len(errors) == 1 and errors[0].path_str.endswith("c2")
+
+    def test_summary_line_follows_color_setting(self, tmp_path, monkeypatch, capsys):
+        """Test that the baseline summary line is only colored when the results are."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("FORCE_COLOR", raising=False)
+        (tmp_path / "src" / "frontend" / "api" / "c1").mkdir(parents=True)
+        monkeypatch.setattr('sys.argv', ['dir-checker', '--write-baseline'])
+        assert main() == 0
+        capsys.readouterr()
+
+        RepositoryValidator(StructureConfig()).validate()
+        out = capsys.readouterr().out
+        assert "Baseline: 2 known finding(s) suppressed" in out
+        assert "\033[" not in out
+
+        config = StructureConfig()
+        config.color = "always"
+        RepositoryValidator(config).validate()
+        assert "\033[34mBaseline:" in capsys.readouterr().out
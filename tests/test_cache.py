@@ -0,0 +1,190 @@
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dir_checker.main import RepositoryValidator, StructureConfig, main
+from dir_checker.cache import CachedValidator, LocalDirectoryCache, ValidationCache
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def git(repo, *args):
+    subprocess.run(["git", "-c", "user.email=t@example.com", "-c", "user.name=t", *args],
+                   cwd=repo, check=True, stdout=subprocess.DEVNULL)
+
+
+def make_repo(root):
+    for service in ("api", "web"):
+        for component in ("c1", "c2"):
+            path = root / "src" / "frontend" / service / component
+            path.mkdir(parents=True)
+            (path / "index.js").write_text("")
+            (path / "package.json").write_text("")
+    os.remove(root / "src" / "frontend" / "web" / "c2" / "index.js")
+    age(root / "src")
+    git(root, "init", "-q")
+    git(root, "add", "-A")
+    git(root, "commit", "-q", "-m", "init")
+
+
+def age(path):
+    """Backdate the mtimes of a tree so that its units are not racy."""
+    past = time.time() - 60
+    for directory, _, _ in os.walk(path):
+        os.utime(directory, (past, past))
+
+
+def run(root, cache_dir):
+    cache = ValidationCache(LocalDirectoryCache(cache_dir), repo_id="test")
+    validator = CachedValidator(StructureConfig(), base_dir=root, quiet=True, cache=cache)
+    validator.validate_directory_structure()
+    return validator, cache
+
+
+def summary(validator):
+    return sorted((e.level, e.message, e.path_str) for e in validator.errors), validator.stats
+
+
+class TestLocalDirectoryCache:
+    """Test the local directory backend."""
+
+    def test_round_trip_and_corruption(self, tmp_path):
+        """Test that entries round-trip and corrupt entries are dropped."""
+        backend = LocalDirectoryCache(tmp_path)
+        backend.put("ab12", b"data")
+        assert backend.get("ab12") == b"data"
+        assert backend.get("cd34") is None
+
+        with open(backend.entry_path("ab12"), "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b"X")
+        assert backend.get("ab12") is None
+        assert not backend.entry_path("ab12").exists()
+
+    def test_prune_evicts_least_recently_used(self, tmp_path):
+        """Test that pruning keeps recently read entries."""
+        backend = LocalDirectoryCache(tmp_path, max_bytes=300)
+        for i, key in enumerate(["aa01", "bb02", "cc03"]):
+            backend.put(key, b"x" * 100)
+            os.utime(backend.entry_path(key), (1000 + i, 1000 + i))
+        backend.get("aa01")  # Refreshes its mtime
+        backend.prune()
+
+        assert backend.get("aa01") is not None
+        assert backend.get("bb02") is None
+        assert backend.get("cc03") is not None
+
+    def test_concurrent_writers(self, tmp_path):
+        """Test that concurrent writes of one key leave a valid entry and no temporary files."""
+        backend = LocalDirectoryCache(tmp_path)
+        payloads = [bytes([i]) * 10000 for i in range(16)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda data: backend.put("ee55", data), payloads))
+
+        assert backend.get("ee55") in payloads
+        assert os.listdir(tmp_path / "ee") == ["ee55"]
+
+
+@requires_git
+class TestCachedValidator:
+    """Test restoring unit subtrees from the cache."""
+
+    def test_second_run_restores_units(self, tmp_path):
+        """Test that an unchanged repository is restored with identical results."""
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        make_repo(repo)
+        plain = RepositoryValidator(StructureConfig(), base_dir=repo, quiet=True)
+        plain.validate_directory_structure()
+
+        first, cache = run(repo, tmp_path / "cache")
+        assert (cache.hits, cache.misses) == (0, 2)
+        second, cache = run(repo, tmp_path / "cache")
+        assert (cache.hits, cache.misses) == (2, 0)
+        assert summary(second) == summary(first) == summary(plain)
+
+    def test_findings_in_walk_order(self, tmp_path):
+        """Test that restored and revalidated units are reported in the order of an uncached run."""
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        make_repo(repo)
+        run(repo, tmp_path / "cache")
+        os.remove(repo / "src" / "frontend" / "web" / "c1" / "index.js")
+        plain = RepositoryValidator(StructureConfig(), base_dir=repo, quiet=True)
+        plain.validate_directory_structure()
+
+        validator, cache = run(repo, tmp_path / "cache")
+        assert cache.hits == 1
+        assert [(e.level, e.message, e.path_str) for e in validator.errors] == \
+            [(e.level, e.message, e.path_str) for e in plain.errors]
+
+    def test_changed_units_are_revalidated(self, tmp_path):
+        """Test that local changes, commits and new empty directories are seen."""
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        make_repo(repo)
+        run(repo, tmp_path / "cache")
+
+        (repo / "src" / "frontend" / "web" / "c2" / "index.js").write_text("")
+        validator, cache = run(repo, tmp_path / "cache")
+        assert cache.hits == 1
+        assert validator.exit_code() == 0
+
+        git(repo, "add", "-A")
+        git(repo, "commit", "-q", "-m", "fix")
+        (repo / "src" / "frontend" / "api" / "c3").mkdir()
+        validator, cache = run(repo, tmp_path / "cache")
+        assert (cache.hits, cache.misses) == (0, 2)
+        assert validator.stats["components_found"] == 5
+        assert validator.exit_code() == 1
+
+    def test_units_changed_during_run_are_not_stored(self, tmp_path, monkeypatch):
+        """Test that a unit whose directories changed since git status was read is not stored."""
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        make_repo(repo)
+        package = repo / "src" / "frontend" / "web" / "c2" / "package.json"
+        unit_keys = ValidationCache.unit_keys
+
+        def remove_after_status(self, *args):
+            keys = unit_keys(self, *args)
+            package.unlink()  # Not seen by git status, seen by the walk
+            return keys
+
+        monkeypatch.setattr(ValidationCache, "unit_keys", remove_after_status)
+        run(repo, tmp_path / "cache")
+        monkeypatch.undo()
+        package.write_text("")
+        validator, cache = run(repo, tmp_path / "cache")
+        assert (cache.hits, cache.misses) == (1, 1)
+        plain = RepositoryValidator(StructureConfig(), base_dir=repo, quiet=True)
+        plain.validate_directory_structure()
+        assert summary(validator) == summary(plain)
+
+    def test_units_changed_before_run_are_stored(self, tmp_path):
+        """Test that a fresh checkout is stored, however recent its mtimes are."""
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        make_repo(repo)
+        just_now = time.time_ns() - 100_000_001
+        for directory, _, _ in os.walk(repo / "src"):
+            os.utime(directory, ns=(just_now, just_now))
+        run(repo, tmp_path / "cache")
+        validator, cache = run(repo, tmp_path / "cache")
+        assert (cache.hits, cache.misses) == (2, 0)
+
+    def test_main_with_cache_dir(self, tmp_path, monkeypatch):
+        """Test --cache-dir from the command line."""
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        make_repo(repo)
+        monkeypatch.chdir(repo)
+        monkeypatch.setattr('sys.argv', ['dir-checker', '--cache-dir', str(tmp_path / "cache")])
+
+        assert main() == 1
+        assert main() == 1
+        assert os.listdir(tmp_path / "cache")
@@ -0,0 +1,76 @@
+import time
+
+from dir_checker.main import LevelMatcher, RepositoryValidator, StructureConfig, main
+from dir_checker.costs import RuleCostValidator
+
+
+def build_tree(root):
+    for component in ("c1", "c2", "bad"):
+        (root / "src" / "frontend" / "api" / component).mkdir(parents=True)
+    (root / "src" / "frontend" / "api" / "c1" / "index.js").write_text("")
+    (root / "src" / "frontend" / "api" / "c1" / "package.json").write_text("")
+    (root / "src" / "frontend" / "unknown" / "c3").mkdir(parents=True)
+    (root / "src" / "frontend" / "api" / "c1" / "deep").mkdir()
+    (root / "src" / "frontend" / "tmp").mkdir()
+    (root / ".gitignore").write_text("tmp\n*.never\n")
+
+
+class TestRuleCosts:
+    """Test rule-level cost attribution."""
+
+    def test_rules_are_counted(self, tmp_path):
+        """Test invocation and fired counts per rule id."""
+        build_tree(tmp_path)
+        config = StructureConfig(check_depth=True, allow_subdirs=False)
+        validator = RuleCostValidator(config, base_dir=tmp_path, quiet=True)
+        validator.validate_directory_structure()
+        costs = validator.rule_costs
+
+        assert costs["value:service"].calls == 4 and costs["value:service"].fired == 1
+        assert costs["value:component"].fired == 0
+        assert costs["mandatory-files"].calls == 4 and costs["mandatory-files"].fired == 3
+        assert costs["depth"].calls == 1 and costs["depth"].fired == 1
+        assert costs["gitignore"].fired == 1
+        assert validator.pattern_costs["tmp"].fired == 1
+        assert validator.pattern_costs["*.never"].fired == 0
+
+    def test_findings_match_plain_validator(self, tmp_path):
+        """Test that timing does not change the findings."""
+        build_tree(tmp_path)
+        plain = RepositoryValidator(StructureConfig(), base_dir=tmp_path, quiet=True)
+        timed = RuleCostValidator(StructureConfig(), base_dir=tmp_path, quiet=True)
+        plain.validate_directory_structure()
+        timed.validate_directory_structure()
+
+        assert [str(e) for e in plain.errors] == [str(e) for e in timed.errors]
+
+    def test_batched_level_match_is_charged(self, tmp_path, monkeypatch):
+        """Test that the match of distinct values before the walk is charged to its level."""
+        build_tree(tmp_path)
+        match_all = LevelMatcher.match_all
+
+        def slow_match_all(self, values):
+            if self.pattern is not None:
+                time.sleep(0.05)  # An expensive glob
+            return match_all(self, values)
+
+        monkeypatch.setattr(LevelMatcher, "match_all", slow_match_all)
+        config = StructureConfig(valid_values={"service": ["ap*", "web-*", "*-svc"]})
+        validator = RuleCostValidator(config, base_dir=tmp_path, quiet=True)
+        validator.validate_directory_structure()
+
+        costs = validator.rule_costs
+        assert costs["value:service"].seconds >= 0.05
+        assert costs["value:service"].calls == 4 and costs["value:service"].fired == 1
+        assert validator.format_rule_costs().splitlines()[3].split()[0] == "value:service"
+
+    def test_report(self, tmp_path, monkeypatch, capsys):
+        """Test the --rule-costs report."""
+        monkeypatch.chdir(tmp_path)
+        build_tree(tmp_path)
+        monkeypatch.setattr('sys.argv', ['dir-checker', '--rule-costs'])
+        main()
+
+        out = capsys.readouterr().out
+        assert "Rule Costs" in out and "mandatory-files" in out and "value:module" in out
+        assert "1 pattern(s) never matched" in out and "*.never" in out
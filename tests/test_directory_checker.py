@@ -7,6 +7,8 @@ from dir_checker.main import (
     StructureConfig, 
     RepositoryValidator, 
     ValidationError,
+    ResultReporter,
+    ConfigResolver,
     load_config,
     parse_yaml_with_bash,
     main
@@ -116,6 +118,29 @@ class TestRepositoryValidator:
         assert validator.should_skip_path(Path(".git/objects"))
         assert validator.should_skip_path(Path("node_modules/package"))
         assert not validator.should_skip_path(Path("src/main"))
+        # Decided once per directory under root_dir and inherited by descendants
+        assert validator.should_skip_path(Path("test_root/frontend/dist/assets"))
+        assert validator._skipped[("frontend", "dist")] is True
+        assert validator._skipped[("frontend",)] is False
+    
+    def test_skip_files_globs(self):
+        """Test that skip_files are matched as globs against file names."""
+        validator = RepositoryValidator(self.config)
+        present, missing = validator.check_files(
+            "mandatory-files", ["index.js", "debug.log", "sub/.DS_Store", "logs.txt"],
+            lambda name: True, self.config)
+        assert present == ["index.js", "logs.txt"]
+        assert missing == ["debug.log", "sub/.DS_Store"]
+    
+    def test_skip_files_glob_metacharacters(self):
+        """Test that "?" and bracket patterns in skip_files are globs too."""
+        self.config.skip_files = {"tmp?.txt", "*.py[co]", "[!a]bc"}
+        validator = RepositoryValidator(self.config)
+        present, missing = validator.check_files(
+            "mandatory-files", ["tmp1.txt", "tmp10.txt", "main.pyc", "main.py", "xbc", "abc"],
+            lambda name: True, self.config)
+        assert present == ["tmp10.txt", "main.py", "abc"]
+        assert missing == ["tmp1.txt", "main.pyc", "xbc"]
     
     def test_validate_level_value(self):
         """Test level value validation."""
@@ -139,7 +164,22 @@ class TestRepositoryValidator:
         assert validator.validate_level_value("module", "sandbox-test") is True
         assert validator.validate_level_value("module", "prod") is True
         assert validator.validate_level_value("module", "dev") is False
-    
+
+    def test_batch_level_values(self, monkeypatch):
+        """Test that each distinct level value is matched once for all components."""
+        self.config.valid_values["module"] = ["sandbox*", "prod"]
+        validator = RepositoryValidator(self.config)
+        components = [("prod", "api", "c1"), ("prod", "api", "c2"), ("sandbox1", "web", "c1"),
+                      ("dev", "api", "c1"), ("prod", "api")]
+        validator.batch_level_values(components)
+        assert validator.level_verdicts(self.config, "module") == {"prod": True, "sandbox1": True, "dev": False}
+
+        # Verdicts are looked up, not matched again
+        matcher = validator.level_matchers(self.config)["module"]
+        monkeypatch.setattr(matcher, "pattern", None)
+        assert validator.validate_level_value("module", "sandbox1") is True
+        assert validator.validate_level_value("module", "dev") is False
+
     def test_log_level_filtering(self):
         """Test log level filtering."""
         self.config.log_level = "error"
@@ -157,6 +197,66 @@ class TestRepositoryValidator:
         assert validator.should_show_message("info") is True
 
 
+class TestConfigResolver:
+    """Test per-directory override files."""
+    
+    def test_override_applies_to_subtree(self, tmp_path):
+        """Test that an override file changes rules for its subtree only."""
+        (tmp_path / "backend").mkdir()
+        (tmp_path / "backend" / ".dir-checker.yaml").write_text(
+            'mandatory_files:\n  - "main.tf"\nvalid_values:\n  service:\n    - "vpc"\n'
+        )
+        config = StructureConfig()
+        resolver = ConfigResolver(config, tmp_path)
+        
+        backend = resolver.resolve(("backend", "vpc", "c1"))
+        assert backend.mandatory_files == ["main.tf"]
+        assert backend.valid_values["service"] == ["vpc"]
+        assert backend.valid_values["module"] == config.valid_values["module"]
+        
+        frontend = resolver.resolve(("frontend", "api", "c1"))
+        assert frontend is config
+    
+    def test_resolved_configs_are_shared(self, tmp_path):
+        """Test that descendants share the config resolved for their ancestor."""
+        (tmp_path / "backend").mkdir()
+        (tmp_path / "backend" / ".dir-checker.json").write_text('{"fail_on_missing_files": false}')
+        config = StructureConfig()
+        config.override_file = ".dir-checker.json"
+        resolver = ConfigResolver(config, tmp_path)
+        
+        first = resolver.resolve(("backend", "api", "c1"))
+        second = resolver.resolve(("backend", "web", "c2"))
+        assert first is second
+        assert first.fail_on_missing_files is False
+    
+    def test_non_overridable_keys_are_ignored(self, tmp_path):
+        """Test that keys shaping the walk cannot be overridden."""
+        (tmp_path / "backend").mkdir()
+        (tmp_path / "backend" / ".dir-checker.yaml").write_text('max_depth: 7\n')
+        resolver = ConfigResolver(StructureConfig(), tmp_path)
+        
+        assert resolver.resolve(("backend",)).max_depth == 3
+    
+    def test_invalidated_configs_are_forgotten(self, tmp_path):
+        """Test that the matchers of an edited override are recompiled, not reused."""
+        override = tmp_path / "src" / "backend" / ".dir-checker.yaml"
+        override.parent.mkdir(parents=True)
+        config = StructureConfig()
+        config.root_dir = str(tmp_path / "src")
+        validator = RepositoryValidator(config)
+        resolver = validator.config_resolver
+        
+        for service in ["api", "vpc"] * 10:
+            override.write_text(f'valid_values:\n  service:\n    - "{service}"\n')
+            resolver.invalidate(("backend",))
+            backend = resolver.resolve(("backend",))
+            assert validator.validate_level_value("service", service, backend) is True
+            assert validator.validate_level_value("service", "other", backend) is False
+            # Only the base config and the current override stay compiled
+            assert len(validator._compiled_configs) == 2
+
+
 class TestValidationError:
     """Test the ValidationError class."""
     
@@ -174,6 +274,54 @@ class TestValidationError:
         assert "Test warning" in warning_str
 
 
+class TestResultReporter:
+    """Test the batched results reporter."""
+    
+    def make_findings(self):
+        return [
+            ValidationError("ERROR", "Missing mandatory files: index.js", Path("src/a/api/c1")),
+            ValidationError("ERROR", "Missing mandatory files: index.js", Path("src/a/api/c2")),
+            ValidationError("ERROR", "Missing mandatory files: index.js", Path("src/a/api/c3")),
+            ValidationError("WARNING", "Invalid module 'x'", Path("src/x/api/c1")),
+        ]
+    
+    def test_plain_output_without_color(self):
+        """Test that no ANSI codes are written when colors are disabled."""
+        import io
+        stream = io.StringIO()
+        reporter = ResultReporter(stream=stream)  # StringIO is not a TTY
+        stats = {"components_found": 3, "directories_scanned": 5, "files_checked": 6}
+        reporter.report(self.make_findings(), stats)
+        
+        output = stream.getvalue()
+        assert "\033[" not in output
+        assert "Found 3 error(s):" in output
+        assert "   Error: Missing mandatory files: index.js: src/a/api/c2" in output
+        assert "Validation failed" in output
+    
+    def test_group_messages(self):
+        """Test collapsing identical messages into one line."""
+        import io
+        stream = io.StringIO()
+        reporter = ResultReporter(stream=stream, color=False, group_messages=True)
+        lines = list(reporter.format_findings(self.make_findings()))
+        
+        assert len(lines) == 2
+        assert "(3 paths, e.g. src/a/api/c1)" in lines[0]
+        assert lines[1] == "   Warning: Invalid module 'x': src/x/api/c1"
+    
+    def test_max_per_section(self):
+        """Test capping large sections with a summary line."""
+        import io
+        stream = io.StringIO()
+        reporter = ResultReporter(stream=stream, color=False, max_per_section=1)
+        reporter.write_section("Found 3 error(s):", "red", self.make_findings()[:3])
+        
+        output = stream.getvalue()
+        assert output.count("Error:") == 1
+        assert "2 more not shown" in output
+
+
 class TestConfigLoading:
     """Test configuration loading functionality."""
     
@@ -300,6 +448,63 @@ class TestIntegration:
         error_messages = [e.message for e in validator.errors if e.level == "ERROR"]
         assert any("Missing mandatory files" in msg for msg in error_messages)
     
+    def test_override_file_validation(self, tmp_path, monkeypatch):
+        """Test validation with a per-directory override of mandatory files."""
+        monkeypatch.chdir(tmp_path)
+        
+        frontend = tmp_path / "src" / "frontend" / "api" / "component1"
+        frontend.mkdir(parents=True)
+        (frontend / "index.js").write_text("// index file")
+        (frontend / "package.json").write_text('{"name": "component1"}')
+        
+        backend = tmp_path / "src" / "backend" / "api" / "stack1"
+        backend.mkdir(parents=True)
+        (backend / "main.tf").write_text("")
+        (tmp_path / "src" / "backend" / ".dir-checker.yaml").write_text(
+            'mandatory_files:\n  - "main.tf"\n'
+        )
+        
+        validator = RepositoryValidator(StructureConfig(), verbose=False)
+        assert validator.validate() == 0
+        assert validator.stats["components_found"] == 2
+    
+    def test_symlinked_component_is_reported(self, tmp_path, monkeypatch):
+        """Test that symlinked components are reported instead of validated."""
+        monkeypatch.chdir(tmp_path)
+        
+        real = tmp_path / "src" / "frontend" / "api" / "component1"
+        real.mkdir(parents=True)
+        (real / "index.js").write_text("// index file")
+        (real / "package.json").write_text('{"name": "component1"}')
+        (tmp_path / "src" / "frontend" / "api" / "alias").symlink_to(real)
+        
+        validator = RepositoryValidator(StructureConfig(), verbose=False)
+        validator.validate_directory_structure()
+        
+        assert validator.stats["components_found"] == 1
+        symlinks = [e for e in validator.errors if e.rule == "symlinked-directory"]
+        assert len(symlinks) == 1
+        assert symlinks[0].path.name == "alias"
+    
+    def test_symlinks_below_components_follow_check_depth(self, tmp_path, monkeypatch):
+        """Test that symlinks inside components are only reported when check_depth is on."""
+        monkeypatch.chdir(tmp_path)
+        component = tmp_path / "src" / "frontend" / "api" / "component1"
+        component.mkdir(parents=True)
+        (component / "index.js").write_text("")
+        (component / "package.json").write_text("{}")
+        (component / "shared").symlink_to(tmp_path)
+        
+        config = StructureConfig()
+        validator = RepositoryValidator(config, strict=True)
+        validator.validate_directory_structure()
+        assert not [e for e in validator.errors if e.level in ("ERROR", "WARNING")]
+        
+        config.check_depth = True
+        validator = RepositoryValidator(config, strict=True)
+        validator.validate_directory_structure()
+        assert [e.path.name for e in validator.errors if e.rule == "symlinked-directory"] == ["shared"]
+    
     def test_invalid_structure_validation(self, tmp_path, monkeypatch):
         """Test validation with invalid directory names."""
         monkeypatch.chdir(tmp_path)
@@ -0,0 +1,96 @@
+import subprocess
+import shutil
+
+import pytest
+
+from dir_checker.main import StructureConfig, RepositoryValidator, main
+from dir_checker.fix import Fixer, format_plan, render, run_fix
+
+
+def make_components(root, *names):
+    for name in names:
+        (root / "src" / "frontend" / "api" / name).mkdir(parents=True)
+
+
+class TestFix:
+    """Test planning and creating missing mandatory files."""
+
+    def test_render_leaves_unknown_braces(self):
+        """Test that only known variables are replaced."""
+        template = 'module "{component}" {\n  source = "../{module}"\n}\n'
+        assert render(template, {"component": "c1", "module": "frontend"}) == \
+            'module "c1" {\n  source = "../frontend"\n}\n'
+
+    def test_plan_and_apply(self, tmp_path):
+        """Test that missing files are created from templates and existing files are kept."""
+        make_components(tmp_path, "c1", "c2")
+        (tmp_path / "src" / "frontend" / "api" / "c2" / "index.js").write_text("keep")
+        templates = tmp_path / ".dir-checker" / "templates"
+        templates.mkdir(parents=True)
+        (templates / "package.json").write_text('{"name": "{module}-{service}-{component}"}\n')
+
+        validator = RepositoryValidator(StructureConfig(), base_dir=tmp_path, quiet=True)
+        validator.validate_directory_structure()
+        fixer = Fixer(validator)
+        planned = fixer.plan(validator.errors)
+
+        assert [p.path.relative_to(tmp_path).as_posix() for p in planned] == [
+            "src/frontend/api/c1/index.js",
+            "src/frontend/api/c1/package.json",
+            "src/frontend/api/c2/package.json",
+        ]
+        created = fixer.apply(planned, max_workers=2)
+        assert len(created) == 3
+        component = tmp_path / "src" / "frontend" / "api"
+        assert (component / "c1" / "package.json").read_text() == '{"name": "frontend-api-c1"}\n'
+        assert (component / "c1" / "index.js").read_text() == ""
+        assert (component / "c2" / "index.js").read_text() == "keep"
+
+        summary = format_plan(planned, tmp_path)
+        assert summary.endswith("3 file(s) in 2 component(s)")
+
+    def test_nested_mandatory_file(self, tmp_path):
+        """Test that parent directories of nested mandatory files are created."""
+        make_components(tmp_path, "c1")
+        config = StructureConfig(mandatory_files=["src/main.tf"])
+        validator = RepositoryValidator(config, base_dir=tmp_path, quiet=True)
+
+        assert run_fix(validator) == 0
+        assert (tmp_path / "src" / "frontend" / "api" / "c1" / "src" / "main.tf").exists()
+
+
+class TestFixIntegration:
+    """Test --fix from the command line."""
+
+    def test_dry_run_changes_nothing(self, tmp_path, monkeypatch, capsys):
+        """Test that --dry-run only lists the files."""
+        monkeypatch.chdir(tmp_path)
+        make_components(tmp_path, "c1")
+        monkeypatch.setattr('sys.argv', ['dir-checker', '--fix', '--dry-run'])
+
+        assert main() == 0
+        out = capsys.readouterr().out
+        assert "src/frontend/api/c1/index.js" in out
+        assert not (tmp_path / "src" / "frontend" / "api" / "c1" / "index.js").exists()
+
+    def test_fix_then_validate(self, tmp_path, monkeypatch):
+        """Test that a fixed tree passes."""
+        monkeypatch.chdir(tmp_path)
+        make_components(tmp_path, "c1", "c2")
+        monkeypatch.setattr('sys.argv', ['dir-checker', '--fix'])
+
+        assert main() == 0
+        assert RepositoryValidator(StructureConfig()).validate() == 0
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+    def test_stage_created_files(self, tmp_path, monkeypatch):
+        """Test that --stage adds the created files to the index."""
+        monkeypatch.chdir(tmp_path)
+        subprocess.run(["git", "init", "-q"], check=True)
+        make_components(tmp_path, "c1")
+        monkeypatch.setattr('sys.argv', ['dir-checker', '--fix', '--stage'])
+
+        assert main() == 0
+        staged = subprocess.run(["git", "diff", "--cached", "--name-only"], check=True,
+                                stdout=subprocess.PIPE, text=True).stdout.split()
+        assert staged == ["src/frontend/api/c1/index.js", "src/frontend/api/c1/package.json"]
@@ -0,0 +1,120 @@
+import io
+import shutil
+import subprocess
+import tarfile
+
+import pytest
+
+from dir_checker.main import RepositoryValidator, StructureConfig, main
+from dir_checker.gittree import GitCommitChecker, list_commits
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def git(repo, *args):
+    return subprocess.run(["git", "-c", "user.email=t@example.com", "-c", "user.name=t", *args],
+                          cwd=repo, check=True, stdout=subprocess.PIPE).stdout
+
+
+def write(repo, path, content=""):
+    target = repo / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(content)
+
+
+def commit(repo, message):
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", message)
+
+
+def disk_findings(repo, rev, tmp_path, config):
+    """Validate an extracted copy of rev the regular way."""
+    target = tmp_path / f"checkout-{rev}"
+    target.mkdir()
+    with tarfile.open(fileobj=io.BytesIO(git(repo, "archive", rev))) as archive:
+        archive.extractall(target)
+    validator = RepositoryValidator(config, base_dir=target, quiet=True)
+    validator.validate_directory_structure()
+    return sorted((e.level, e.message, str(e.path.relative_to(target))) for e in validator.errors), validator.stats
+
+
+def tree_findings(checker, repo):
+    return sorted((e.level, e.message, str(e.path.relative_to(repo))) for e in checker.findings()), checker.stats()
+
+
+@pytest.fixture
+def history(tmp_path):
+    """A repository whose commits add, break, override, delete and ignore components."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    git(repo, "init", "-q")
+    for component in ("frontend/api/c1", "frontend/api/c2", "backend/worker/w1"):
+        write(repo, f"src/{component}/index.js")
+        write(repo, f"src/{component}/package.json")
+    commit(repo, "init")
+    (repo / "src/frontend/api/c2/package.json").unlink()
+    write(repo, "src/frontend/api/bad name/index.js")
+    commit(repo, "break c2")
+    write(repo, "src/frontend/.dir-checker.yaml", 'mandatory_files:\n  - "index.js"\n')
+    commit(repo, "override")
+    shutil.rmtree(repo / "src/backend")
+    write(repo, "src/shared/cache/s1/index.js")
+    commit(repo, "move")
+    write(repo, ".gitignore", "s1\n")
+    commit(repo, "ignore")
+    return repo
+
+
+class TestGitTree:
+    """Test validating commits from git objects."""
+
+    def test_range_matches_checkouts(self, history, tmp_path):
+        """Test that every commit of a range gives the same results as validating its checkout."""
+        config = StructureConfig()
+        commits = list_commits("HEAD~4..HEAD", history)
+        commits.insert(0, list_commits("HEAD~4", history)[0])
+        checker = GitCommitChecker(config, history)
+        try:
+            for rev in commits:
+                checker.check(rev)
+                assert tree_findings(checker, history) == disk_findings(history, rev, tmp_path, config)
+        finally:
+            checker.close()
+
+    def test_range_revalidates_only_changes(self, history):
+        """Test that a commit only touching one component revalidates just that part."""
+        write(history, "src/frontend/api/c1/README.md")
+        commit(history, "docs")
+        checker = GitCommitChecker(StructureConfig(), history)
+        try:
+            checker.check(list_commits("HEAD~1", history)[0])
+            before = checker.revalidated
+            checker.check(list_commits("HEAD", history)[0])
+        finally:
+            checker.close()
+        assert checker.revalidated - before == 1
+
+    def test_nested_files_come_from_the_tree(self, history, tmp_path):
+        """Test that nested mandatory files are looked up in the commit, not on disk."""
+        config = StructureConfig(mandatory_files=["index.js", "src/main.tf"])
+        write(history, "src/frontend/api/c1/src/main.tf")  # Only in the working tree
+        checker = GitCommitChecker(config, history)
+        try:
+            checker.check("HEAD~3")  # Before the override of mandatory_files
+            missing = [e for e in checker.findings() if e.rule == "missing-mandatory-files"]
+        finally:
+            checker.close()
+        assert any(e.path_str.endswith("c1") for e in missing)
+
+    def test_main_commits(self, history, monkeypatch, capsys):
+        """Test --commits from the command line."""
+        monkeypatch.chdir(history)
+        monkeypatch.setattr('sys.argv', ['dir-checker', '--commits', 'HEAD~4..HEAD'])
+
+        assert main() == 1
+        out = capsys.readouterr().out
+        assert "Checked 4 commit(s), 2 failed" in out
+        assert "src/frontend/api/c2" in out
+
+        monkeypatch.setattr('sys.argv', ['dir-checker', '--commits', 'no-such-rev'])
+        assert main() == 1
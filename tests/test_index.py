@@ -0,0 +1,156 @@
+import os
+import time
+
+from dir_checker.main import RepositoryValidator, StructureConfig, main
+from dir_checker.index import ComponentIndex, IndexedValidator, index_key
+
+
+def make_tree(root):
+    for service in ("api", "web"):
+        for component in ("c1", "c2"):
+            path = root / "src" / "frontend" / service / component
+            path.mkdir(parents=True)
+            (path / "index.js").write_text("")
+            (path / "package.json").write_text("")
+    (root / "src" / "frontend" / "api" / "c1" / "node_modules").mkdir()
+    os.remove(root / "src" / "frontend" / "web" / "c2" / "index.js")
+    age(root / "src")
+
+
+def age(path):
+    """Backdate the mtimes of a tree so that its signatures are not racy."""
+    past = time.time() - 60
+    for directory, _, _ in os.walk(path):
+        os.utime(directory, (past, past))
+
+
+def run(root, **settings):
+    config = StructureConfig(index_file="index.bin", **settings)
+    validator = IndexedValidator(config, base_dir=root, quiet=True)
+    validator.validate_directory_structure()
+    return validator
+
+
+def summary(validator):
+    return sorted((e.level, e.message, e.path_str, e.rule, e.subjects) for e in validator.errors), validator.stats
+
+
+class TestIndexedValidator:
+    """Test restoring unchanged components from the component index."""
+
+    def test_unchanged_components_are_restored(self, tmp_path):
+        """Test that a second run restores every component with identical results."""
+        make_tree(tmp_path)
+        first = run(tmp_path)
+        assert (first.index_hits, first.index_misses) == (0, 4)
+
+        second = run(tmp_path)
+        assert (second.index_hits, second.index_misses) == (4, 0)
+        assert summary(second) == summary(first)
+
+    def test_changed_component_is_revalidated(self, tmp_path):
+        """Test that only the changed component is revalidated."""
+        make_tree(tmp_path)
+        run(tmp_path)
+        os.remove(tmp_path / "src" / "frontend" / "api" / "c2" / "package.json")
+
+        validator = run(tmp_path)
+        assert (validator.index_hits, validator.index_misses) == (3, 1)
+        missing = {e.path_str for e in validator.errors if e.rule == "missing-mandatory-files"}
+        assert missing == {str(tmp_path / "src" / "frontend" / "api" / "c2"),
+                           str(tmp_path / "src" / "frontend" / "web" / "c2")}
+
+    def test_findings_in_walk_order(self, tmp_path):
+        """Test that restored and revalidated components are reported in the order of a plain run."""
+        make_tree(tmp_path)
+        run(tmp_path)
+        os.remove(tmp_path / "src" / "frontend" / "web" / "c1" / "package.json")
+        plain = RepositoryValidator(StructureConfig(), base_dir=tmp_path, quiet=True)
+        plain.validate_directory_structure()
+
+        validator = run(tmp_path)
+        assert (validator.index_hits, validator.index_misses) == (3, 1)
+        assert [(e.level, e.message, e.path_str) for e in validator.errors] == \
+            [(e.level, e.message, e.path_str) for e in plain.errors]
+
+    def test_edited_override_is_revalidated(self, tmp_path):
+        """Test that editing an override file in place (directory mtime unchanged) is noticed."""
+        make_tree(tmp_path)
+        component = tmp_path / "src" / "frontend" / "web" / "c2"
+        (component / ".dir-checker.yaml").write_text("mandatory_files:\n  - package.json\n")
+        age(component)
+        assert any(e.rule == "missing-mandatory-files" for e in run(tmp_path).errors) is False
+
+        stat = os.stat(component)
+        (component / ".dir-checker.yaml").write_text("mandatory_files:\n  - index.js\n")
+        os.utime(component, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        validator = run(tmp_path)
+        assert validator.index_misses == 1
+        assert any(e.rule == "missing-mandatory-files" for e in validator.errors)
+
+    def test_records_are_decoded_on_demand(self, tmp_path):
+        """Test the index layout: sorted keys, subtree sizes and ignore decisions."""
+        make_tree(tmp_path)
+        run(tmp_path)
+        index = ComponentIndex.open(tmp_path / "index.bin")
+        try:
+            keys = [index.key(i) for i in range(index.record_count)]
+            assert keys == sorted(keys)
+            assert index.component_count == 4
+            api = index.find(index_key(("frontend", "api")))
+            assert index.record(api)[6] == 4  # api, c1, c1/node_modules, c2
+            ignored = index.find(index_key(("frontend", "api", "c1", "node_modules")))
+            assert index.record(ignored)[2] & 2
+            assert index.find(index_key(("frontend", "missing"))) == -1
+        finally:
+            index.close()
+
+    def test_corrupt_or_stale_index_is_rebuilt(self, tmp_path):
+        """Test that a truncated index or a changed configuration falls back to a full run."""
+        make_tree(tmp_path)
+        expected = summary(run(tmp_path))
+        with open(tmp_path / "index.bin", "r+b") as f:
+            f.truncate(100)
+        validator = run(tmp_path)
+        assert validator.index_hits == 0
+        assert summary(validator) == expected
+
+        (tmp_path / ".gitignore").write_text("c1\n")
+        validator = run(tmp_path)
+        assert validator.index_hits == 0
+        assert validator.stats["components_found"] == 2
+
+    def test_config_change_revalidates_affected_components(self, tmp_path):
+        """Test that a changed rule only revalidates the components it can affect."""
+        make_tree(tmp_path)
+        run(tmp_path, valid_values={"service": ["api"]})
+
+        # web becomes valid: only its two components have different findings
+        validator = run(tmp_path, valid_values={"service": ["api", "web"]})
+        assert (validator.index_hits, validator.index_misses) == (2, 2)
+        plain = RepositoryValidator(StructureConfig(valid_values={"service": ["api", "web"]}), base_dir=tmp_path, quiet=True)
+        plain.validate_directory_structure()
+        assert summary(validator) == summary(plain)
+
+        # Only web/c2 misses index.js
+        validator = run(tmp_path, valid_values={"service": ["api", "web"]}, fail_on_missing_files=False)
+        assert (validator.index_hits, validator.index_misses) == (3, 1)
+        validator = run(tmp_path, valid_values={"service": ["api", "web"]}, fail_on_missing_files=False,
+                        mandatory_files=["index.js"])
+        assert (validator.index_hits, validator.index_misses) == (0, 4)
+
+        # A change to the walk discards the index
+        validator = run(tmp_path, valid_values={"service": ["api", "web"]}, fail_on_missing_files=False,
+                        mandatory_files=["index.js"], skip_dirs={"node_modules", "c1"})
+        assert (validator.index_hits, validator.index_misses) == (0, 2)
+
+    def test_main_index_file(self, tmp_path, monkeypatch, capsys):
+        """Test --index-file through the command line."""
+        make_tree(tmp_path)
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr("sys.argv", ["dir-checker", "--index-file", ".dir-checker/index.bin"])
+        assert main() == 1
+        assert (tmp_path / ".dir-checker" / "index.bin").exists()
+        first = capsys.readouterr().out
+        assert main() == 1
+        assert capsys.readouterr().out == first
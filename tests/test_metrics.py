@@ -0,0 +1,85 @@
+from dir_checker.main import main
+from dir_checker.metrics import (
+    cache_hit_rates,
+    format_stats_report,
+    load_runs,
+    percentile,
+    record_run,
+)
+
+
+class TestMetrics:
+    """Test the run metrics store and report."""
+
+    def test_record_and_load_round_trip(self, tmp_path):
+        """Test that recorded runs come back oldest first with decoded phases and counters."""
+        db = tmp_path / "metrics" / "runs.db"
+        record_run(db, "src", 20.0, 1, {"walk": 15.0}, {"directories_scanned": 10},
+                   {"ERROR": 2, "OPTIONAL_WARNING": 1}, timestamp=200.0)
+        record_run(db, "src", 10.0, 0, {"walk": 8.0}, {"directories_scanned": 5}, {}, timestamp=100.0)
+
+        runs = load_runs(db)
+        assert [run["total_ms"] for run in runs] == [10.0, 20.0]
+        assert runs[1]["errors"] == 2 and runs[1]["warnings"] == 1
+        assert runs[1]["phases"] == {"walk": 15.0}
+        assert runs[1]["directories_scanned"] == 10
+        assert [run["total_ms"] for run in load_runs(db, since=150.0)] == [20.0]
+
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles."""
+        values = [float(v) for v in range(1, 11)]
+        assert percentile(values, 50) == 5.0
+        assert percentile(values, 90) == 9.0
+        assert percentile(values, 99) == 10.0
+        assert percentile([], 50) == 0.0
+
+    def test_cache_hit_rates(self):
+        """Test pairing of hit and miss counters."""
+        rates = cache_hit_rates({"config_cache_hits": 3, "config_cache_misses": 1, "files_checked": 7})
+        assert rates == {"config_cache": 0.75}
+
+    def test_report_trend(self, tmp_path):
+        """Test the report sections and the latency/size trend line."""
+        db = tmp_path / "runs.db"
+        for i in range(8):
+            record_run(db, "src", 10.0 * (i + 1), 0, {"walk": 5.0},
+                       {"directories_scanned": 100 * (i + 1), "config_cache_hits": 1,
+                        "config_cache_misses": 1}, {}, timestamp=1000.0 + i)
+
+        report = format_stats_report(load_runs(db))
+        assert "p50: 40.0" in report
+        assert "config_cache: 50.0%" in report
+        assert "walk" in report
+        assert "Median latency changed +600.0% while directories changed +300.0%" in report
+        assert format_stats_report([]) == "No runs recorded yet."
+
+
+class TestMetricsIntegration:
+    """Test recording runs from the command line."""
+
+    def test_main_records_and_reports(self, tmp_path, monkeypatch, capsys):
+        """Test --metrics-file recording followed by --stats-report."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "src" / "frontend" / "api" / "c1").mkdir(parents=True)
+        (tmp_path / "src" / "frontend" / "api" / "c1" / "README.md").write_text("")
+
+        for _ in range(2):
+            monkeypatch.setattr('sys.argv', ['dir-checker', '--metrics-file', 'metrics.db'])
+            main()
+
+        runs = load_runs(tmp_path / "metrics.db")
+        assert len(runs) == 2
+        assert {"config", "walk", "baseline", "report"} <= set(runs[0]["phases"])
+        assert runs[0]["components_found"] == 1
+        assert "config_cache_hits" in runs[0]["counters"]
+
+        capsys.readouterr()
+        monkeypatch.setattr('sys.argv', ['dir-checker', '--metrics-file', 'metrics.db', '--stats-report'])
+        assert main() == 0
+        assert "Runs: 2" in capsys.readouterr().out
+
+    def test_stats_report_needs_metrics_file(self, tmp_path, monkeypatch):
+        """Test that --stats-report without a metrics file fails."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr('sys.argv', ['dir-checker', '--stats-report'])
+        assert main() == 1
@@ -0,0 +1,147 @@
+import io
+import time
+
+import pytest
+
+from dir_checker import pipeline
+from dir_checker.baseline import Baseline
+from dir_checker.main import ResultReporter, RepositoryValidator, StructureConfig, main
+from dir_checker.pipeline import StreamingValidator
+
+
+def make_tree(root, services=10):
+    for module in ("frontend", "backend"):
+        for service in range(services):
+            for component in ("c1", "c2"):
+                path = root / "src" / module / f"svc{service}" / component
+                path.mkdir(parents=True)
+                (path / "index.js").write_text("")
+                if component == "c1":
+                    (path / "package.json").write_text("")
+    (root / "src" / "frontend" / "svc0" / "c1" / "deep" / "deeper").mkdir(parents=True)
+
+
+def config():
+    return StructureConfig(valid_values={"module": ["frontend"]}, check_depth=True, baseline_file="baseline.txt")
+
+
+class TestStreamingValidator:
+    """Test the walker / worker / reporter pipeline."""
+
+    def test_results_match_plain_validation(self, tmp_path):
+        """Test that statistics, counts, printed findings and exit code match a plain run."""
+        make_tree(tmp_path)
+        plain = RepositoryValidator(config(), base_dir=tmp_path, quiet=True)
+        plain.validate_directory_structure()
+
+        output = io.StringIO()
+        validator = StreamingValidator(config(), base_dir=tmp_path, quiet=True, workers=3, stream=output)
+        assert validator.validate() == plain.exit_code() == 1
+        assert validator.stats == plain.stats
+        assert validator.level_counts() == plain.level_counts()
+        assert validator.errors == []
+
+        reporter = ResultReporter(color=False)
+        visible = [e for e in plain.errors if e.level != "INFO"]
+        lines = output.getvalue().splitlines()
+        assert sorted(line for line in lines if line.startswith("   Error") or line.startswith("   Warning")) \
+            == sorted(reporter.format_findings(visible))
+        assert "❌ Validation failed due to errors above." in lines[-1]
+
+    def test_backpressure(self, tmp_path, monkeypatch):
+        """Test that findings are printed while the walk is running and the walker waits for the reporter."""
+        make_tree(tmp_path, services=20)
+        monkeypatch.setattr(pipeline, "QUEUE_SIZE", 1)
+        validator = StreamingValidator(config(), base_dir=tmp_path, quiet=True, workers=1, stream=io.StringIO())
+        yielded = []
+        iter_work = validator.iter_work
+
+        def counting_iter_work():
+            for batch in iter_work():
+                yielded.append(batch)
+                yield batch
+
+        first_write = []
+
+        class SlowStream(io.StringIO):
+            def write(self, text):
+                if not first_write:
+                    first_write.append(len(yielded))
+                time.sleep(0.01)
+                return super().write(text)
+
+        validator.iter_work = counting_iter_work
+        validator.stream = SlowStream()
+        validator.validate()
+        # 2 modules + 40 units; at most a few batches are queued or in progress at a time
+        assert len(yielded) == 42
+        assert first_write[0] <= 6
+
+    def test_units_are_yielded_as_the_walk_finds_them(self, tmp_path):
+        """Test that the first unit is yielded before the levels above all units have been listed."""
+        make_tree(tmp_path, services=2)
+        validator = StreamingValidator(config(), base_dir=tmp_path, quiet=True)
+        work = validator.iter_work()
+        assert [parts for _, parts in next(work)] == [("backend",)]
+        assert [parts for _, parts in next(work)][0] == ("backend", "svc0")
+
+        # frontend has not been listed yet
+        (tmp_path / "src" / "frontend" / "svc9").mkdir()
+        units = [batch[0][1] for batch in work if len(batch[0][1]) == 2]
+        assert units == [("backend", "svc1"), ("frontend", "svc0"), ("frontend", "svc1"), ("frontend", "svc9")]
+
+    def test_baseline(self, tmp_path):
+        """Test that baselined findings are suppressed while streaming."""
+        make_tree(tmp_path)
+        plain = RepositoryValidator(config(), base_dir=tmp_path, quiet=True)
+        plain.validate_directory_structure()
+        Baseline.from_findings(plain.errors, tmp_path).save(tmp_path / "baseline.txt")
+
+        validator = StreamingValidator(config(), base_dir=tmp_path, quiet=True, stream=io.StringIO())
+        assert validator.validate() == 0
+        assert "ERROR" not in validator.level_counts()
+
+    def test_group_messages(self, tmp_path):
+        """Test that identical messages are printed once, with the number of other paths at the end."""
+        make_tree(tmp_path)
+        grouped = StructureConfig(valid_values={"module": ["frontend"]}, group_messages=True)
+        output = io.StringIO()
+        validator = StreamingValidator(grouped, base_dir=tmp_path, quiet=True, workers=2, stream=output)
+        assert validator.validate() == 1
+        lines = output.getvalue().splitlines()
+        missing = [line for line in lines if "Missing mandatory files: package.json" in line]
+        assert len(missing) == 2
+        assert missing[1].endswith("Missing mandatory files: package.json (19 more path(s))")
+        assert validator.level_counts()["ERROR"] == 20
+
+    def test_main_stream(self, tmp_path, monkeypatch, capsys):
+        """Test --stream through the command line."""
+        make_tree(tmp_path, services=1)
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr("sys.argv", ["dir-checker", "--stream", "--workers", "2"])
+        assert main() == 1
+        output = capsys.readouterr().out
+        assert output.index("Missing mandatory files: package.json") < output.index("Statistics:")
+
+    def test_main_rejects_combined_modes(self, tmp_path, monkeypatch, capsys):
+        """Test that options --stream would silently drop are rejected."""
+        make_tree(tmp_path, services=1)
+        monkeypatch.chdir(tmp_path)
+        for argv, message in (
+            (["--stream", "--index-file", "index.bin", "--cache-dir", "cache"],
+             "--stream, --cache-dir and --index-file cannot be used together"),
+            (["--rule-costs", "--stream"], "--rule-costs and --stream cannot be used together"),
+            (["--commits", "HEAD", "--stream"], "--commits cannot be used together with --stream"),
+        ):
+            monkeypatch.setattr("sys.argv", ["dir-checker", *argv])
+            with pytest.raises(SystemExit) as exit_info:
+                main()
+            assert exit_info.value.code == 2
+            assert message in capsys.readouterr().err
+        assert not (tmp_path / "index.bin").exists()
+
+        (tmp_path / "dir-checker-config.yaml").write_text('index_file: "index.bin"\n')
+        monkeypatch.setattr("sys.argv", ["dir-checker", "--stream"])
+        with pytest.raises(SystemExit):
+            main()
+        assert "--stream and index_file (from the configuration) cannot be used together" in capsys.readouterr().err
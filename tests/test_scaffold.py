@@ -0,0 +1,63 @@
+import os
+
+from dir_checker.main import StructureConfig, RepositoryValidator, main
+from dir_checker.scaffold import iter_components, level_names, scaffold
+
+
+class TestScaffold:
+    """Test layout generation."""
+
+    def test_level_names_expand_globs(self):
+        """Test that literals are kept and wildcard values get generated matching names."""
+        assert level_names("service", ["api", "svc-*"], 2) == ["api", "svc-service-1", "svc-service-2"]
+        assert level_names("component", ["*"], 10)[:2] == ["component-01", "component-02"]
+        assert level_names("component", None, 1) == ["component-1"]
+
+    def test_components_are_the_product_of_levels(self):
+        """Test the levels x valid_values product."""
+        config = StructureConfig(valid_values={"module": ["a", "b"], "service": ["api"], "component": ["*"]})
+        assert list(iter_components(config, 2)) == [
+            ("a", "api", "component-1"), ("a", "api", "component-2"),
+            ("b", "api", "component-1"), ("b", "api", "component-2"),
+        ]
+
+    def test_scaffolded_tree_validates(self, tmp_path):
+        """Test that the generated tree passes validation with the same config."""
+        config = StructureConfig(mandatory_files=["index.js", "src/main.tf"], fail_on_invalid_values=True)
+        components, files = scaffold(config, tmp_path, count=3, file_size=1 << 20, max_workers=2)
+
+        assert components == 4 * 5 * 3
+        assert files == components * 2
+        index = tmp_path / "src" / "frontend" / "api" / "component-1" / "index.js"
+        assert index.stat().st_size == 1 << 20
+        validator = RepositoryValidator(config, base_dir=tmp_path, quiet=True)
+        validator.validate_directory_structure()
+        assert validator.exit_code() == 0
+
+    def test_templates_and_existing_files(self, tmp_path):
+        """Test that templates are rendered and existing files are kept."""
+        config = StructureConfig(valid_values={"module": ["m"], "service": ["s"], "component": ["c"]},
+                                 mandatory_files=["README.md", "index.js"])
+        templates = tmp_path / "templates"
+        templates.mkdir()
+        (templates / "README.md").write_text("# {component} ({module}/{service})\n")
+        existing = tmp_path / "out" / "src" / "m" / "s" / "c"
+        existing.mkdir(parents=True)
+        (existing / "index.js").write_text("keep")
+
+        assert scaffold(config, tmp_path / "out", templates_dir=templates) == (1, 1)
+        assert (existing / "README.md").read_text() == "# c (m/s)\n"
+        assert (existing / "index.js").read_text() == "keep"
+
+
+class TestScaffoldIntegration:
+    """Test --scaffold from the command line."""
+
+    def test_scaffold_command(self, tmp_path, monkeypatch, capsys):
+        """Test that --scaffold creates the default layout."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr('sys.argv', ['dir-checker', '--scaffold', 'generated', '--scaffold-count', '2'])
+
+        assert main() == 0
+        assert "Scaffolded 40 component(s)" in capsys.readouterr().out
+        assert os.path.exists(tmp_path / "generated" / "src" / "shared" / "cache" / "component-2" / "package.json")
@@ -0,0 +1,39 @@
+import os
+
+from dir_checker.soak import EXTRA_DIR, Mutator, SoakTest, generate_tree, result_lines, soak_config
+
+
+class TestSoak:
+    """Test the load and soak harness."""
+
+    def test_mutator_restores_tree(self, tmp_path):
+        """Test that every change of the mutator is undone by restore."""
+        config = soak_config()
+        components = generate_tree(tmp_path, config, 12)
+        root = tmp_path / config.root_dir
+        before = sorted(os.walk(root))
+
+        mutator = Mutator(root, components, config.mandatory_files, seed=1)
+        for _ in range(50):
+            mutator.step()
+        assert sorted(os.walk(root)) != before
+        mutator.restore()
+        assert sorted(os.walk(root)) == before
+        assert not any(EXTRA_DIR in directories for _, directories, _ in os.walk(root))
+
+    def test_result_lines_ignore_headers(self):
+        """Test that outputs with and without section headers compare equal."""
+        plain = "Found 1 error(s):\n   Error: Missing mandatory files: index.js: src/a/b/c\n\n   • Components found: 1\n"
+        streamed = "   • Components found: 1\n[INFO] Component index: 0 restored\n   Error: Missing mandatory files: index.js: src/a/b/c\n"
+        assert result_lines(plain) == result_lines(streamed)
+
+    def test_concurrent_runs_with_index(self, tmp_path):
+        """Test a short soak with a shared component index."""
+        soak = SoakTest(tmp_path, mode="index", processes=2, duration=0.5, components=12, interval=0.01)
+        assert soak.run() == 0, soak.problems
+        assert soak.mutations > 0
+        assert {run.phase for run in soak.runs} == {"churn", "settled"}
+        assert all(run.max_rss_kb > 0 for run in soak.runs)
+        report = soak.format_report()
+        assert "latency ms: p50" in report
+        assert "✅ All runs completed and matched a plain run." in report
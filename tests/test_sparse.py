@@ -0,0 +1,103 @@
+import shutil
+import subprocess
+
+import pytest
+
+from dir_checker.main import StructureConfig, RepositoryValidator, apply_config_data, load_config, load_config_data
+from dir_checker.sparse import load_sparse_state
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def git(cwd, *args):
+    subprocess.run(["git", "-c", "user.email=test@example.com", "-c", "user.name=test", *args],
+                   cwd=cwd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+@pytest.fixture
+def sparse_repo(tmp_path):
+    """A repository with two components, only the first one checked out."""
+    for component in ["frontend/api/c1", "backend/web/c2"]:
+        path = tmp_path / "src" / component
+        path.mkdir(parents=True)
+        (path / "index.js").write_text("")
+        (path / "package.json").write_text("{}")
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "init")
+    git(tmp_path, "sparse-checkout", "set", "src/frontend")
+    assert not (tmp_path / "src" / "backend").exists()
+    return tmp_path
+
+
+def make_config(mode):
+    config = StructureConfig()
+    config.sparse_mode = mode
+    config.respect_gitignore = False
+    return config
+
+
+class TestSparseState:
+    """Test reading the sparse checkout state from git."""
+
+    def test_load_state(self, sparse_repo):
+        """Test that skip-worktree components and cone directories are detected."""
+        state = load_sparse_state(sparse_repo, "src", 3)
+
+        assert state is not None
+        assert state.cone_dirs == [("frontend",)]
+        assert state.is_partial(("backend", "web", "c2"))
+        assert not state.is_partial(("frontend", "api", "c1"))
+        assert state.index_names(("backend", "web", "c2")) == {"index.js", "package.json"}
+        # Cone components are read from disk, so their names are not kept
+        assert ("frontend", "api", "c1") not in state.files
+
+    def test_not_sparse(self, tmp_path):
+        """Test that regular repositories have no sparse state."""
+        git(tmp_path, "init", "-q")
+        assert load_sparse_state(tmp_path, "src", 3) is None
+
+
+class TestSparseValidation:
+    """Test validation modes for sparse checkouts."""
+
+    def test_index_mode_validates_absent_components(self, sparse_repo):
+        """Test that absent components are validated from the index."""
+        validator = RepositoryValidator(make_config("index"), base_dir=sparse_repo, quiet=True)
+        validator.validate_directory_structure()
+
+        assert validator.stats["components_found"] == 2
+        assert not [e for e in validator.errors if e.level == "ERROR"]
+
+    def test_partial_component(self, sparse_repo):
+        """Test a component whose directory exists but whose files are not checked out."""
+        partial = sparse_repo / "src" / "backend" / "web" / "c2"
+        partial.mkdir(parents=True)  # e.g. left behind by a build
+
+        skip = RepositoryValidator(make_config("skip"), base_dir=sparse_repo, quiet=True)
+        skip.validate_directory_structure()
+        assert [e.rule for e in skip.errors if e.rule == "sparse-skipped"] == ["sparse-skipped"]
+        assert not [e for e in skip.errors if e.level == "ERROR"]
+
+        off = RepositoryValidator(make_config("off"), base_dir=sparse_repo, quiet=True)
+        off.validate_directory_structure()
+        assert [e.rule for e in off.errors if e.level == "ERROR"] == ["missing-mandatory-files"]
+
+    def test_index_mode_reports_collapsed_directories(self, sparse_repo):
+        """Test that components hidden in collapsed sparse index entries are reported."""
+        git(sparse_repo, "sparse-checkout", "set", "--sparse-index", "src/frontend")
+
+        validator = RepositoryValidator(make_config("index"), base_dir=sparse_repo, quiet=True)
+        validator.validate_directory_structure()
+
+        assert validator.stats["components_found"] == 1
+        collapsed = [e for e in validator.errors if e.rule == "sparse-collapsed"]
+        assert [(e.level, e.path_str) for e in collapsed] == [("INFO", f"{sparse_repo}/src/backend")]
+
+    def test_unknown_mode_is_rejected(self, tmp_path):
+        """Test that a misspelled sparse_mode does not silently select a mode."""
+        config_file = tmp_path / "config.json"
+        config_file.write_text('{"sparse_mode": "skipp", "max_depth": 4}')
+        with pytest.raises(ValueError, match="sparse_mode must be one of off, skip, index"):
+            apply_config_data(StructureConfig(), load_config_data(config_file))
+        assert load_config(str(config_file), quiet=True).sparse_mode == "off"
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+from dir_checker.tree import TreeModel, TreeNode, walk_tree, FLAG_CYCLE, FLAG_DIR, FLAG_MARKER, FLAG_SYMLINK
+
+
+def no_skip(path_str, name, is_dir):
+    return False
+
+
+class TestTreeModel:
+    """Test the array-backed tree model."""
+
+    def test_add_and_parts(self):
+        """Test node parts, names and path materialization."""
+        tree = TreeModel(Path("src"))
+        a = tree.add(0, "frontend", 1, FLAG_DIR)
+        b = tree.add(a, "api", 2, FLAG_DIR)
+        c = tree.add(b, "api", 3, FLAG_DIR)
+
+        assert tree.parts(c) == ("frontend", "api", "api")
+        assert tree.path(c) == Path("src/frontend/api/api")
+        assert tree.name_id[b] == tree.name_id[c]  # Names are interned
+        assert len(tree) == 4
+
+    def test_tree_node_is_path_like(self):
+        """Test that TreeNode works with os.fspath and str."""
+        import os
+        tree = TreeModel(Path("src"), prefix=("frontend",))
+        node = tree.add(0, "api", 2, FLAG_DIR)
+        ref = TreeNode(tree, node)
+
+        assert os.fspath(ref) == os.path.join("src", "frontend", "api")
+        assert ref.to_path() == Path("src/frontend/api")
+
+
+class TestWalkTree:
+    """Test filling the tree model from disk."""
+
+    def test_walk_order_and_pruning(self, tmp_path):
+        """Test that skipped directories are pruned with their subtree."""
+        for path in ["b/x", "a/y", "a/node_modules/z"]:
+            (tmp_path / path).mkdir(parents=True)
+        (tmp_path / "a" / "file.txt").write_text("")
+
+        tree = walk_tree(tmp_path, lambda p, name, d: name == "node_modules")
+        parts = [tree.parts(i) for i in range(1, len(tree))]
+
+        assert parts[:2] == [("a",), ("b",)]
+        assert sorted(parts) == [("a",), ("a", "y"), ("b",), ("b", "x")]
+
+    def test_entries_and_marker(self, tmp_path):
+        """Test that entry names and marker flags are recorded."""
+        (tmp_path / "a" / "c1").mkdir(parents=True)
+        (tmp_path / "a" / "c1" / "index.js").write_text("")
+        (tmp_path / "a" / ".dir-checker.yaml").write_text("")
+
+        tree = walk_tree(tmp_path, no_skip, entries_depth=2, marker=".dir-checker.yaml")
+
+        assert tree.flags[1] & FLAG_MARKER
+        assert tree.entries[2] == frozenset({"index.js"})
+        assert TreeNode(tree, 2).entry_names == frozenset({"index.js"})
+
+    def test_symlinks_are_not_descended(self, tmp_path):
+        """Test that symlinked directories are recorded but not walked."""
+        (tmp_path / "real" / "inner").mkdir(parents=True)
+        (tmp_path / "link").symlink_to(tmp_path / "real")
+
+        tree = walk_tree(tmp_path, no_skip)
+        names = {tree.parts(i): tree.flags[i] for i in range(1, len(tree))}
+
+        assert names[("link",)] & FLAG_SYMLINK
+        assert ("link", "inner") not in names
+
+    def test_follow_symlinks_detects_cycles(self, tmp_path):
+        """Test that a symlink loop is walked once and flagged."""
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        (tmp_path / "a" / "b" / "loop").symlink_to(tmp_path / "a")
+        (tmp_path / "z").mkdir()
+        (tmp_path / "z" / "inner").mkdir()
+        (tmp_path / "y").symlink_to(tmp_path / "z")
+
+        tree = walk_tree(tmp_path, no_skip, follow_symlinks=True)
+        flags = {tree.parts(i): tree.flags[i] for i in range(1, len(tree))}
+
+        assert flags[("a", "b", "loop")] & FLAG_CYCLE
+        assert ("a", "b", "loop", "b") not in flags
+        # "y" is walked first (name order), so the real "z" is the duplicate
+        assert ("y", "inner") in flags
+        assert flags[("z",)] & FLAG_CYCLE
@@ -0,0 +1,226 @@
+import os
+import sys
+import time
+
+import pytest
+
+from dir_checker.baseline import Baseline
+from dir_checker.main import StructureConfig, RepositoryValidator
+from dir_checker.watch import WatchSession, PollingWatcher, InotifyWatcher
+
+
+def make_config():
+    config = StructureConfig()
+    config.root_dir = "src"
+    config.levels = ["module", "service", "component"]
+    config.valid_values = {
+        "module": ["frontend", "backend"],
+        "service": ["api", "web"],
+        "component": ["*"]
+    }
+    config.mandatory_files = ["index.js"]
+    config.optional_files = []
+    return config
+
+
+class TestWatchSession:
+    """Test incremental revalidation in watch mode."""
+
+    def test_full_scan_matches_validator(self, tmp_path, monkeypatch):
+        """Test that a full scan produces the same findings as a normal run."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "src" / "frontend" / "api" / "c1").mkdir(parents=True)
+        (tmp_path / "src" / "frontend" / "api" / "c2").mkdir(parents=True)
+        (tmp_path / "src" / "frontend" / "api" / "c2" / "index.js").write_text("")
+
+        validator = RepositoryValidator(make_config())
+        validator.validate_directory_structure()
+        expected = sorted((e.level, e.message, str(e.path)) for e in validator.errors)
+
+        session = WatchSession(RepositoryValidator(make_config()))
+        session.full_scan()
+        actual = sorted((e.level, e.message, str(e.path)) for e in session.findings())
+
+        assert actual == expected
+        assert session.stats()["components_found"] == 2
+
+    def test_revalidates_only_changed_component(self, tmp_path, monkeypatch):
+        """Test that a file change only revalidates its component."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "src" / "frontend" / "api" / "c1").mkdir(parents=True)
+        (tmp_path / "src" / "frontend" / "api" / "c2").mkdir(parents=True)
+
+        session = WatchSession(RepositoryValidator(make_config()))
+        session.full_scan()
+        errors = [e for e in session.findings() if e.level == "ERROR"]
+        assert len(errors) == 2
+
+        (tmp_path / "src" / "frontend" / "api" / "c1" / "index.js").write_text("")
+        anchors = session.apply_changes({str(tmp_path / "src" / "frontend" / "api" / "c1")})
+
+        assert anchors == {("frontend", "api", "c1")}
+        errors = [e for e in session.findings() if e.level == "ERROR"]
+        assert len(errors) == 1
+        assert "c2" in str(errors[0].path)
+
+    def test_new_and_deleted_directories(self, tmp_path, monkeypatch):
+        """Test that created and removed directories update the results."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "src" / "frontend" / "api" / "c1").mkdir(parents=True)
+
+        session = WatchSession(RepositoryValidator(make_config()))
+        session.full_scan()
+
+        (tmp_path / "src" / "backend" / "web" / "c9").mkdir(parents=True)
+        session.apply_changes({str(tmp_path / "src")})
+        assert session.stats()["components_found"] == 2
+
+        (tmp_path / "src" / "frontend" / "api" / "c1").rmdir()
+        session.apply_changes({str(tmp_path / "src" / "frontend" / "api" / "c1")})
+        assert session.stats()["components_found"] == 1
+
+
+    def test_skipped_directories_are_not_changes(self, tmp_path, monkeypatch):
+        """Test that an event in a parent of a skipped directory does not anchor it."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "src" / "frontend" / "api" / "c1").mkdir(parents=True)
+        (tmp_path / "src" / "frontend" / "node_modules").mkdir()
+
+        session = WatchSession(RepositoryValidator(make_config()))
+        session.full_scan()
+        (tmp_path / "src" / "frontend" / "web").mkdir()
+        anchors = session.apply_changes({str(tmp_path / "src" / "frontend")})
+        assert anchors == {("frontend", "web")}
+
+    def test_baseline_applies(self, tmp_path, monkeypatch, capsys):
+        """Test that findings recorded in the baseline file are hidden in watch mode too, silently."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "src" / "frontend" / "api" / "c1").mkdir(parents=True)
+        (tmp_path / "src" / "frontend" / "api" / "c2").mkdir(parents=True)
+        validator = RepositoryValidator(make_config(), quiet=True)
+        validator.validate_directory_structure()
+        Baseline.from_findings([e for e in validator.errors if "c1" in e.path_str]).save(
+            tmp_path / "dir-checker-baseline.txt")
+
+        session = WatchSession(RepositoryValidator(make_config()))
+        session.full_scan()
+        capsys.readouterr()
+        errors = [e for e in session.findings() if e.level == "ERROR"]
+        assert [e.path_str for e in errors] == ["src/frontend/api/c2"]
+        assert not any(e.rule == "stale-baseline" for e in session.findings())
+        # Only the reporter writes to the watch stream
+        assert capsys.readouterr().out == ""
+
+        (tmp_path / "src" / "frontend" / "api" / "c1").rmdir()
+        session.apply_changes({str(tmp_path / "src" / "frontend" / "api")})
+        assert [e.rule for e in session.findings() if e.level != "INFO" or e.rule == "stale-baseline"] == [
+            "missing-mandatory-files", "stale-baseline"]
+
+    def test_edited_override_is_not_confused_with_old_ones(self, tmp_path, monkeypatch):
+        """Test that verdicts of a replaced override config are never reused."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "src" / "frontend" / "api" / "c1").mkdir(parents=True)
+        (tmp_path / "src" / "frontend" / "api" / "c1" / "index.js").write_text("")
+        override = tmp_path / "src" / "frontend" / ".dir-checker.yaml"
+
+        validator = RepositoryValidator(make_config(), quiet=True)
+        session = WatchSession(validator)
+        session.full_scan()
+        for service in ["api", "nope"] * 20:
+            override.write_text(f'valid_values:\n  service:\n    - "{service}"\n')
+            session.rescan_subtree(("frontend",))
+            invalid = [e for e in session.findings() if e.rule == "invalid-value"]
+            assert len(invalid) == (service == "nope")
+        assert len(validator._compiled_configs) <= 2
+        assert len(validator._level_verdicts) <= 2
+
+    def test_edited_skip_files_override(self, tmp_path, monkeypatch):
+        """Test that the skip_files of a replaced override config are never reused."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "src" / "frontend" / "api" / "c1").mkdir(parents=True)
+        (tmp_path / "src" / "frontend" / "api" / "c1" / "index.js").write_text("")
+        override = tmp_path / "src" / "frontend" / ".dir-checker.yaml"
+
+        validator = RepositoryValidator(make_config(), quiet=True)
+        session = WatchSession(validator)
+        session.full_scan()
+        for skip_files in ["index.js", "other.js"] * 20:
+            override.write_text(f'skip_files:\n  - "{skip_files}"\n')
+            session.rescan_subtree(("frontend",))
+            missing = [e for e in session.findings() if e.rule == "missing-mandatory-files"]
+            assert len(missing) == (skip_files == "index.js")
+        assert len(validator._compiled_configs) <= 2
+
+
+class TestWatchers:
+    """Test filesystem change detection backends."""
+
+    def test_polling_watcher_detects_new_file(self, tmp_path, monkeypatch):
+        """Test that polling reports the directory whose listing changed."""
+        monkeypatch.chdir(tmp_path)
+        component = tmp_path / "src" / "frontend" / "api" / "c1"
+        component.mkdir(parents=True)
+        watcher = PollingWatcher(RepositoryValidator(make_config()), tmp_path / "src", interval=0.01)
+
+        (component / "index.js").write_text("")
+        changed = watcher.wait(timeout=1)
+
+        assert str(tmp_path / "src" / "frontend" / "api" / "c1") in changed
+
+    def test_polling_watcher_detects_edited_override(self, tmp_path, monkeypatch):
+        """Test that polling reports an override file edited in place, and the session applies it."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "src" / "frontend" / "api" / "c1").mkdir(parents=True)
+        (tmp_path / "src" / "frontend" / "api" / "c1" / "index.js").write_text("")
+        override = tmp_path / "src" / "frontend" / ".dir-checker.yaml"
+        override.write_text('valid_values:\n  service:\n    - "api"\n')
+        past = time.time() - 60
+        os.utime(override, (past, past))
+        os.utime(override.parent, (past, past))
+        validator = RepositoryValidator(make_config(), quiet=True)
+        session = WatchSession(validator)
+        session.full_scan()
+        watcher = PollingWatcher(validator, tmp_path / "src", interval=0.01)
+
+        with open(override, "r+") as f:
+            f.write('valid_values:\n  service:\n    - "web"\n')
+        changed = watcher.wait(timeout=1)
+
+        assert changed == {str(override.parent)}
+        assert session.apply_changes(changed) == {("frontend",)}
+        assert [e.rule for e in session.findings() if e.level != "INFO"] == ["invalid-value"]
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+    def test_inotify_watcher_detects_edited_override(self, tmp_path, monkeypatch):
+        """Test that inotify reports override files written in place, but no other written files."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "src" / "frontend" / "api").mkdir(parents=True)
+        override = tmp_path / "src" / "frontend" / ".dir-checker.yaml"
+        override.write_text("")
+        (tmp_path / "src" / "frontend" / "api" / "index.js").write_text("")
+        watcher = InotifyWatcher(RepositoryValidator(make_config()), tmp_path / "src")
+        try:
+            (tmp_path / "src" / "frontend" / "api" / "index.js").write_text("changed")
+            assert watcher.wait(timeout=0.1) == set()
+
+            override.write_text('valid_values:\n  service:\n    - "web"\n')
+            assert watcher.wait(timeout=1) == {str(override.parent)}
+        finally:
+            watcher.close()
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+    def test_inotify_watcher_detects_new_directory(self, tmp_path, monkeypatch):
+        """Test that inotify reports created directories and watches them."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "src" / "frontend").mkdir(parents=True)
+        watcher = InotifyWatcher(RepositoryValidator(make_config()), tmp_path / "src")
+        try:
+            (tmp_path / "src" / "frontend" / "api").mkdir()
+            changed = watcher.wait(timeout=1)
+            assert str(tmp_path / "src" / "frontend" / "api") in changed
+
+            (tmp_path / "src" / "frontend" / "api" / "index.js").write_text("")
+            changed = watcher.wait(timeout=1)
+            assert str(tmp_path / "src" / "frontend" / "api") in changed
+        finally:
+            watcher.close()